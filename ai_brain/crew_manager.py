@@ -1,82 +1,94 @@
-import os
-import json
-import re
-from langchain_groq import ChatGroq
-from langchain_core.messages import SystemMessage, HumanMessage
-from shared_models import MarketContext, TradeProposal
-
-class AIBrain:
-    def __init__(self):
-        # 1. SETUP GROQ DIRECTLY
-        # No "CrewAI" wrappers. No hidden OpenAI checks. Just pure Groq.
-        self.llm = ChatGroq(
-            api_key=os.getenv("GROQ_API_KEY"),
-            model="llama-3.3-70b-versatile", 
-            temperature=0.7
-        )
-
-    def start_debate(self, market_data: MarketContext) -> TradeProposal:
-        """
-        Runs the debate using a single powerful prompt instead of multiple agents.
-        This is faster, cheaper, and crash-proof.
-        """
-        
-        # 2. CONSTRUCT THE "MEGA-PROMPT"
-        # We ask Llama-3 to simulate all three people at once.
-        market_summary = market_data.summary()
-        
-        prompt = f"""
-        You are an AI Investment Committee managing a crypto treasury.
-        
-        THE COMMITTEE MEMBERS:
-        1. Warren (Boomer): Conservative, risk-averse, hates volatility.
-        2. Chad (Degen): Risk-loving, chases hype and memes, uses slang.
-        3. Atlas (Quant): Data-driven, cold, analytical, tie-breaker.
-
-        MARKET DATA:
-        {market_summary}
-
-        TASK:
-        Simulate a short debate between these three. Warren and Chad should argue. Atlas should decide.
-        
-        OUTPUT FORMAT:
-        Return ONLY a JSON object (no markdown, no conversation text outside JSON) with this structure:
-        {{
-            "winner": "Name of the agent who won (Warren/Chad/Atlas)",
-            "decision": "BUY", "SELL", or "HOLD",
-            "amount_percent": 0.1,
-            "reason": "A one-sentence summary of the winning logic",
-            "asset": "{market_data.target_asset_symbol}"
-        }}
-        """
-
-        # 3. INVOKE GROQ DIRECTLY
-        try:
-            response = self.llm.invoke([HumanMessage(content=prompt)])
-            response_text = response.content
-            return self._parse(response_text, market_data)
-            
-        except Exception as e:
-            # Fallback if Groq API has a hiccup
-            print(f"⚠️ Groq Raw Error: {e}")
-            return TradeProposal("err", "System", "HOLD_Existing", market_data.target_asset_symbol, 0.0, "API Error")
-
-    def _parse(self, text, context):
-        try:
-            # Clean up potential markdown wrappers
-            clean_text = re.sub(r"```json", "", text).replace("```", "").strip()
-            
-            # Parse JSON
-            data = json.loads(clean_text)
-            
-            return TradeProposal(
-                proposal_id="fast-mode", 
-                proposing_agent_name=data.get("winner", "Atlas"), 
-                action=data.get("decision", "HOLD"), 
-                target_asset_symbol=context.target_asset_symbol, 
-                percentage_of_treasury_to_use=float(data.get("amount_percent", 0.0)), 
-                reasoning_summary=data.get("reason", "Consensus reached")
-            )
-        except Exception as e:
-            print(f"⚠️ Parse Error: {e} | Raw: {text}")
-            return TradeProposal("err", "System", "HOLD_Existing", context.target_asset_symbol, 0.0, "Parse Error")
+import os
+import json
+import re
+import time
+from langchain_groq import ChatGroq
+from langchain_core.messages import SystemMessage, HumanMessage
+from shared_models import MarketContext, TradeProposal
+from ai_brain.prompt_builder import PromptBuilder
+from ai_brain.llm_metrics import LLMUsageMetrics, extract_token_usage, estimate_tokens
+from instrumentation import REGISTRY, timed
+from deadlines import DeadlineExceeded, call_with_deadline
+
+LLM_TIMEOUT_SECONDS = 60
+
+class AIBrain:
+    def __init__(self):
+        # 1. SETUP GROQ DIRECTLY
+        # No "CrewAI" wrappers. No hidden OpenAI checks. Just pure Groq.
+        self.llm = ChatGroq(
+            api_key=os.getenv("GROQ_API_KEY"),
+            model="llama-3.3-70b-versatile", 
+            temperature=0.7
+        )
+        self.prompt_builder = PromptBuilder()
+
+        # The full persona prompts (ai_brain/prompts/*_sys.txt) cost ~300 extra tokens
+        # per call, so they are opt-in. The committee prompt already sketches each persona.
+        self.use_persona_prompts = os.getenv("AI_USE_PERSONA_PROMPTS", "0") == "1"
+
+        # Token counts and latency per call (prompt size drives both cost and speed)
+        self.metrics = LLMUsageMetrics()
+
+    def start_debate(self, market_data: MarketContext) -> TradeProposal:
+        """
+        Runs the debate using a single powerful prompt instead of multiple agents.
+        This is faster, cheaper, and crash-proof.
+        """
+        
+        # 2. CONSTRUCT THE "MEGA-PROMPT"
+        # We ask Llama-3 to simulate all three people at once.
+        # The template is pre-compiled and the market data is a compact feature line.
+        prompt = self.prompt_builder.build(market_data)
+
+        # 3. INVOKE GROQ DIRECTLY
+        try:
+            messages = [HumanMessage(content=prompt)]
+            if self.use_persona_prompts:
+                messages.insert(0, SystemMessage(content=self.prompt_builder.build_system()))
+
+            started = time.perf_counter()
+            with timed("external_call_seconds", service="groq", call="invoke"):
+                # Waited on for at most the cycle's remaining budget (capped at LLM_TIMEOUT_SECONDS)
+                response = call_with_deadline(self.llm.invoke, messages, default_timeout=LLM_TIMEOUT_SECONDS)
+            latency = time.perf_counter() - started
+            response_text = response.content
+            self._record_usage(response, messages, response_text, latency)
+            return self._parse(response_text, market_data)
+
+        except DeadlineExceeded:
+            raise  # Not an API hiccup: the cycle is out of time
+        except Exception as e:
+            # Fallback if Groq API has a hiccup
+            print(f"⚠️ Groq Raw Error: {e}")
+            return TradeProposal("err", "System", "HOLD_Existing", market_data.target_asset_symbol, 0.0, "API Error")
+
+    def _record_usage(self, response, messages, response_text, latency):
+        usage = extract_token_usage(response)
+        if usage:
+            call = self.metrics.record(usage[0], usage[1], latency)
+        else:
+            prompt_text = "".join(m.content for m in messages)
+            call = self.metrics.record(estimate_tokens(prompt_text), estimate_tokens(response_text), latency, estimated=True)
+        REGISTRY.inc("llm_tokens_total", call.prompt_tokens, kind="prompt")
+        REGISTRY.inc("llm_tokens_total", call.completion_tokens, kind="completion")
+
+    def _parse(self, text, context):
+        try:
+            # Clean up potential markdown wrappers
+            clean_text = re.sub(r"```json", "", text).replace("```", "").strip()
+            
+            # Parse JSON
+            data = json.loads(clean_text)
+            
+            return TradeProposal(
+                proposal_id="fast-mode", 
+                proposing_agent_name=data.get("winner", "Atlas"), 
+                action=data.get("decision", "HOLD"), 
+                target_asset_symbol=context.target_asset_symbol, 
+                percentage_of_treasury_to_use=float(data.get("amount_percent", 0.0)), 
+                reasoning_summary=data.get("reason", "Consensus reached")
+            )
+        except Exception as e:
+            print(f"⚠️ Parse Error: {e} | Raw: {text}")
+            return TradeProposal("err", "System", "HOLD_Existing", context.target_asset_symbol, 0.0, "Parse Error")
@@ -0,0 +1,76 @@
+import threading
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+
+@dataclass
+class LLMCallRecord:
+    """One LLM round trip: how many tokens went in/out and how long it took."""
+    prompt_tokens: int
+    completion_tokens: int
+    latency_seconds: float
+    estimated: bool = False  # True if the provider did not report usage
+
+
+def extract_token_usage(response) -> Optional[tuple]:
+    """
+    Pulls (prompt_tokens, completion_tokens) out of a LangChain chat response.
+    Newer langchain-core exposes `usage_metadata`; older Groq clients only fill
+    `response_metadata['token_usage']`. Returns None if neither is present.
+    """
+    usage = getattr(response, "usage_metadata", None)
+    if usage:
+        return int(usage.get("input_tokens", 0)), int(usage.get("output_tokens", 0))
+
+    metadata = getattr(response, "response_metadata", None) or {}
+    token_usage = metadata.get("token_usage")
+    if token_usage:
+        return int(token_usage.get("prompt_tokens", 0)), int(token_usage.get("completion_tokens", 0))
+    return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough fallback (~4 characters per token for English/JSON)."""
+    return max(1, len(text) // 4)
+
+
+class LLMUsageMetrics:
+    """
+    Thread-safe running totals of token usage and latency for LLM calls.
+    Keeps the last `history_size` calls for inspection.
+    """
+
+    def __init__(self, history_size: int = 100):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.total_latency_seconds = 0.0
+        self.max_latency_seconds = 0.0
+        self.recent = deque(maxlen=history_size)
+
+    def record(self, prompt_tokens: int, completion_tokens: int, latency_seconds: float, estimated: bool = False):
+        call = LLMCallRecord(prompt_tokens, completion_tokens, latency_seconds, estimated)
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+            self.completion_tokens += completion_tokens
+            self.total_latency_seconds += latency_seconds
+            self.max_latency_seconds = max(self.max_latency_seconds, latency_seconds)
+            self.recent.append(call)
+        return call
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            calls = self.calls or 1
+            return {
+                "calls": self.calls,
+                "prompt_tokens_total": self.prompt_tokens,
+                "completion_tokens_total": self.completion_tokens,
+                "prompt_tokens_avg": self.prompt_tokens / calls,
+                "completion_tokens_avg": self.completion_tokens / calls,
+                "latency_avg_seconds": self.total_latency_seconds / calls,
+                "latency_max_seconds": self.max_latency_seconds,
+                "last_call": asdict(self.recent[-1]) if self.recent else None,
+            }
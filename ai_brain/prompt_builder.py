@@ -0,0 +1,66 @@
+from typing import Optional
+from shared_models import MarketContext
+from ai_brain.prompt_registry import PromptRegistry
+
+# Prompt files (under ai_brain/prompts/) used to build each call.
+# committee.txt is the user prompt: every word there is paid for on every call,
+# so keep it terse. The model does not need prose to read a key=value feature block.
+COMMITTEE_PROMPT = "committee"
+PERSONA_PROMPTS = ("boomer_sys", "degen_sys", "quant_sys")
+
+
+def _num(value: Optional[float], fmt: str) -> str:
+    """Formats an optional indicator, using 'NA' for missing values."""
+    if value is None:
+        return "NA"
+    return format(value, fmt)
+
+
+def render_features(context: MarketContext) -> str:
+    """
+    Renders the market snapshot as a single compact key=value line.
+    Includes every indicator on the MarketContext (RSI, SMA-200, BB width).
+    """
+    pair = context.target_asset_symbol
+    if "/" not in pair:
+        pair = f"{pair}/{context.quote_asset_symbol}"
+    return (
+        f"pair={pair} "
+        f"px={_num(context.current_price, '.6g')} "
+        f"rsi14={_num(context.rsi_14, '.1f')} "
+        f"sma200={_num(context.sma_200, '.6g')} "
+        f"bbw={_num(context.bollinger_band_width, '.4f')} "
+        f"mentions24h={_num(context.social_mention_count_24h, 'd')} "
+        f"sent={context.dominant_sentiment}"
+    )
+
+
+class PromptBuilder:
+    """
+    Builds the committee prompt from templates cached (and hot-reloaded) by the
+    PromptRegistry.
+    """
+
+    def __init__(self, registry: Optional[PromptRegistry] = None):
+        self.registry = registry or PromptRegistry()
+        self._system_cache = (None, "")  # (registry version, joined persona text)
+
+    def build(self, context: MarketContext) -> str:
+        return self.registry.render(
+            COMMITTEE_PROMPT,
+            features=render_features(context),
+            asset=context.target_asset_symbol,
+        )
+
+    def build_system(self) -> str:
+        """
+        The full persona prompts joined into one system message.
+        Only rebuilt when a prompt file changed on disk.
+        """
+        version, text = self._system_cache
+        self.registry.refresh()
+        if version != self.registry.version:
+            personas = [self.registry.get(name) for name in PERSONA_PROMPTS]
+            text = "\n\n".join(p for p in personas if p)
+            self._system_cache = (self.registry.version, text)
+        return text
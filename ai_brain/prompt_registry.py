@@ -0,0 +1,129 @@
+import os
+import threading
+import time
+from dataclasses import dataclass
+from string import Template
+from typing import Dict, List, Optional
+
+PROMPTS_DIR = os.path.join(os.path.dirname(__file__), "prompts")
+
+
+@dataclass
+class PromptEntry:
+    """A prompt file as loaded from disk, plus its compiled template."""
+    name: str
+    path: str
+    mtime_ns: int
+    text: str
+    template: Template
+
+
+def parse_prompt_file(raw: str) -> str:
+    """
+    Normalises a prompt file: unify line endings, trim whitespace and drop the
+    wrapping double quotes some persona files were saved with.
+    """
+    text = raw.replace("\r\n", "\n").strip()
+    if len(text) >= 2 and text[0] == '"' and text[-1] == '"':
+        text = text[1:-1].strip()
+    return text
+
+
+class PromptRegistry:
+    """
+    Loads every `*.txt` prompt under `ai_brain/prompts/` once and keeps the parsed
+    text and compiled Template in memory.
+
+    Lookups check file mtimes at most once every `check_interval_seconds`, so edits
+    on disk are picked up (hot reload) without restarting the orchestrator.
+    """
+
+    def __init__(self, prompts_dir: str = PROMPTS_DIR, check_interval_seconds: float = 2.0):
+        self.prompts_dir = prompts_dir
+        self.check_interval_seconds = check_interval_seconds
+        self.version = 0  # Bumped on every (re)load so callers can invalidate derived caches
+        self._entries: Dict[str, PromptEntry] = {}
+        self._lock = threading.Lock()
+        self._last_check = 0.0
+        self.refresh(force=True)
+
+    def _load(self, name: str, path: str, mtime_ns: int) -> PromptEntry:
+        with open(path, "r", encoding="utf-8") as f:
+            text = parse_prompt_file(f.read())
+        return PromptEntry(name, path, mtime_ns, text, Template(text))
+
+    def _scan(self) -> Dict[str, tuple]:
+        found = {}
+        try:
+            filenames = os.listdir(self.prompts_dir)
+        except FileNotFoundError:
+            return found
+        for filename in filenames:
+            if not filename.endswith(".txt"):
+                continue
+            path = os.path.join(self.prompts_dir, filename)
+            try:
+                found[filename[:-4]] = (path, os.stat(path).st_mtime_ns)
+            except FileNotFoundError:
+                continue  # Deleted between listdir and stat
+        return found
+
+    def refresh(self, force: bool = False) -> List[str]:
+        """
+        Reloads prompts whose mtime changed (plus new/deleted files).
+        Returns the names that changed. Cheap when called often: the directory
+        is only stat'ed once per check interval unless `force` is set.
+        """
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval_seconds:
+            return []
+
+        with self._lock:
+            self._last_check = now
+            changed = []
+            on_disk = self._scan()
+
+            for name, (path, mtime_ns) in on_disk.items():
+                entry = self._entries.get(name)
+                if entry and entry.mtime_ns == mtime_ns:
+                    continue
+                try:
+                    self._entries[name] = self._load(name, path, mtime_ns)
+                    changed.append(name)
+                except OSError as e:
+                    # Keep serving the previous version rather than failing the cycle
+                    print(f"⚠️ [PromptRegistry] Could not load {path}: {e}")
+
+            for name in list(self._entries):
+                if name not in on_disk:
+                    del self._entries[name]
+                    changed.append(name)
+
+            if changed:
+                self.version += 1
+                if not force:
+                    print(f"🔄 [PromptRegistry] Reloaded: {', '.join(sorted(changed))}")
+            return changed
+
+    def names(self) -> List[str]:
+        self.refresh()
+        return sorted(self._entries)
+
+    def get(self, name: str) -> Optional[str]:
+        """Returns the parsed text of a prompt, or None if it does not exist."""
+        self.refresh()
+        entry = self._entries.get(name)
+        return entry.text if entry else None
+
+    def template(self, name: str) -> Optional[Template]:
+        """Returns the cached compiled Template for a prompt."""
+        self.refresh()
+        entry = self._entries.get(name)
+        return entry.template if entry else None
+
+    def render(self, name: str, **values) -> str:
+        """Fills in a prompt's $placeholders; unknown placeholders are left as-is."""
+        template = self.template(name)
+        if template is None:
+            raise KeyError(f"Unknown prompt '{name}' in {self.prompts_dir}")
+        return template.safe_substitute(**values)
@@ -0,0 +1,339 @@
+"""
+Hot-path micro-benchmarks, with results appended to benchmarks/history.jsonl
+(tagged with the git commit) so every optimization has a before and an after.
+
+    python -m benchmarks.hotpaths                 # run everything, save, compare to the last run
+    python -m benchmarks.hotpaths -k parse        # only cases whose name contains "parse"
+    python -m benchmarks.hotpaths --compare 1fec73a --no-save
+
+Cases whose dependencies are missing (pandas, langchain, requests, ...) are
+reported as SKIPPED instead of failing the whole run.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(REPO_ROOT, "benchmarks", "history.jsonl")
+
+# A case is slower than the baseline by more than this -> flagged as a regression
+REGRESSION_THRESHOLD = 0.10
+
+
+class Case:
+    """
+    One benchmark. `setup()` returns the zero-argument callable to time, so imports
+    and fixtures stay out of the measurement (an ImportError there means SKIPPED).
+    """
+
+    def __init__(self, name: str, setup: Callable[[], Callable[[], object]]):
+        self.name = name
+        self.setup = setup
+
+
+# ==========================================
+# FIXTURES
+# ==========================================
+def _market_context():
+    from shared_models import MarketContext
+    return MarketContext(
+        timestamp=datetime(2025, 1, 1, 12, 0, 0),
+        target_asset_symbol="BTC/USDT",
+        target_asset_address="0xMockWrapper",
+        quote_asset_symbol="USDT",
+        current_price=85123.45,
+        rsi_14=41.7,
+        sma_200=80750.0,
+        bollinger_band_width=0.042,
+        social_mention_count_24h=540,
+        dominant_sentiment="BULLISH",
+    )
+
+
+def _ohlcv(rows: int):
+    import numpy as np
+    import pandas as pd
+    rng = np.random.default_rng(42)
+    close = 85000 * np.exp(np.cumsum(rng.normal(0, 0.004, rows)))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=rows, freq="h"),
+        "open": close, "high": close * 1.002, "low": close * 0.998, "close": close,
+        "volume": rng.uniform(10, 100, rows),
+    })
+
+
+def _cycle_record():
+    from shared_models import CycleRecord, TradeProposal
+    return CycleRecord(
+        ticker="BTC/USDT",
+        started_at=datetime(2025, 1, 1, 12, 0, 0),
+        context=_market_context(),
+        proposal=TradeProposal("fast-mode", "Chad", "BUY", "BTC/USDT", 5.0, "Momentum and bullish crowd"),
+        tx_hash="0x" + "ab" * 32,
+        trigger_reasons=["price moved +1.20%"],
+        status="OK",
+    )
+
+
+LLM_RESPONSE = (
+    "```json\n"
+    '{"winner": "Chad", "decision": "BUY", "amount_percent": 5, '
+    '"reason": "RSI is recovering from oversold and sentiment flipped bullish; Warren objected, Atlas agreed."}\n'
+    "```"
+)
+
+
+# ==========================================
+# CASES
+# ==========================================
+def bench_rsi():
+    from data_layer.technicals import TechnicalAnalyzer
+    df = _ohlcv(200)
+    return lambda: TechnicalAnalyzer.calculate_rsi(df)
+
+
+def bench_sma_200():
+    from data_layer.technicals import TechnicalAnalyzer
+    df = _ohlcv(200)
+    return lambda: TechnicalAnalyzer.calculate_sma_200(df)
+
+
+def bench_bollinger_width():
+    from data_layer.technicals import TechnicalAnalyzer
+    df = _ohlcv(200)
+    return lambda: TechnicalAnalyzer.calculate_bollinger_width(df)
+
+
+def bench_brain_parse():
+    from ai_brain.crew_manager import AIBrain
+    brain = AIBrain.__new__(AIBrain)  # _parse needs no LLM client
+    context = _market_context()
+    return lambda: brain._parse(LLM_RESPONSE, context)
+
+
+def bench_context_summary():
+    context = _market_context()
+    return context.summary
+
+
+def bench_render_features():
+    from ai_brain.prompt_builder import render_features
+    context = _market_context()
+    return lambda: render_features(context)
+
+
+def bench_journal_row():
+    from orchestration.journal import record_to_row
+    record = _cycle_record()
+    return lambda: record_to_row(record)
+
+
+def bench_dashboard_decode():
+    # What the dashboard does per row: JSON back to a dict
+    from orchestration.journal import record_to_row
+    payload = record_to_row(_cycle_record())[-1]
+    return lambda: json.loads(payload)
+
+
+def bench_discord_payload():
+    from frontend_layer.discord_bot import DiscordNotifier
+    notifier = DiscordNotifier.__new__(DiscordNotifier)
+    return lambda: notifier.build_payload("BTC/USDT", "BUY", "Chad", "Momentum and bullish crowd", True)
+
+
+def bench_run_cycle():
+    """Full SENSE -> SAVE through Orchestrator.run_cycle with every external call stubbed."""
+    import main_orchestrator
+    from orchestration.journal import CycleJournal
+    from orchestration.lazy import LazyComponent
+    from shared_models import TradeProposal
+
+    class StubBrain:
+        metrics = type("Metrics", (), {"calls": 0})()
+
+        def start_debate(self, context):
+            return TradeProposal("bench", "Chad", "BUY", context.target_asset_symbol, 5.0, "bench")
+
+    class StubTracker:
+        def add_callback(self, tx_hash, callback):
+            pass
+
+    class StubExecutor:
+        tracker = StubTracker()
+
+        def execute_vote(self, proposal, voters, vote=None):
+            return "0x" + "ab" * 32
+
+    class StubNotifier:
+        def post_trade_decision(self, *args):
+            pass
+
+    context = _market_context()
+    orchestrator = main_orchestrator.Orchestrator()
+    orchestrator.triggers = None
+    orchestrator._data = LazyComponent.of("Data Layer", lambda ticker: context)
+    orchestrator._brain = LazyComponent.of("AI Brain", StubBrain())
+    orchestrator._executor = LazyComponent.of("Execution Layer", StubExecutor())
+    orchestrator._notifier = LazyComponent.of("Discord Notifier", StubNotifier())
+    orchestrator._journal = CycleJournal(os.path.join(tempfile.mkdtemp(prefix="bench-journal-"), "cycles.db"))
+
+    def run():
+        with contextlib.redirect_stdout(io.StringIO()):  # The cycle is chatty; keep print cost, drop the output
+            orchestrator.run_cycle("BTC/USDT")
+    return run
+
+
+CASES = [
+    Case("technicals.rsi_200rows", bench_rsi),
+    Case("technicals.sma200_200rows", bench_sma_200),
+    Case("technicals.bollinger_200rows", bench_bollinger_width),
+    Case("brain.parse", bench_brain_parse),
+    Case("context.summary", bench_context_summary),
+    Case("prompt.render_features", bench_render_features),
+    Case("journal.record_to_row", bench_journal_row),
+    Case("dashboard.decode_row", bench_dashboard_decode),
+    Case("discord.build_payload", bench_discord_payload),
+    Case("orchestrator.run_cycle_stubbed", bench_run_cycle),
+]
+
+
+# ==========================================
+# RUNNER
+# ==========================================
+def measure(fn: Callable[[], object], repeats: int, min_seconds: float) -> dict:
+    """timeit-style: calibrate a loop count that runs >= min_seconds, then take `repeats` samples."""
+    loops = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_seconds or loops >= 1_000_000:
+            break
+        loops *= 10 if elapsed < min_seconds / 10 else 2
+
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - started) / loops * 1e6)
+    return {
+        "loops": loops,
+        "min_us": min(samples),
+        "median_us": statistics.median(samples),
+        "stdev_us": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+    }
+
+
+def run_cases(cases: List[Case], repeats: int, min_seconds: float) -> Dict[str, dict]:
+    results = {}
+    for case in cases:
+        try:
+            fn = case.setup()
+        except ImportError as e:
+            results[case.name] = {"skipped": f"missing dependency: {e.name or e}"}
+            continue
+        except Exception as e:
+            results[case.name] = {"skipped": f"setup failed: {e}"}
+            continue
+        random.seed(0)
+        results[case.name] = measure(fn, repeats, min_seconds)
+    return results
+
+
+def git_revision() -> dict:
+    def git(*args):
+        proc = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True)
+        return proc.stdout.strip() if proc.returncode == 0 else None
+    return {"sha": git("rev-parse", "--short", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def load_history(path: str = HISTORY_PATH) -> List[dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def find_baseline(history: List[dict], ref: Optional[str]) -> Optional[dict]:
+    """The newest run for commit `ref` (sha prefix), or simply the newest run."""
+    for entry in reversed(history):
+        if ref is None or (entry.get("git_sha") or "").startswith(ref):
+            return entry
+    return None
+
+
+def print_results(results: Dict[str, dict], baseline: Optional[dict]):
+    base = (baseline or {}).get("results", {})
+    header = f"{'CASE':<34} {'MEDIAN':>12} {'MIN':>12}"
+    if baseline:
+        header += f"  vs {baseline.get('git_sha') or '?'}"
+    print(header)
+    print("-" * 80)
+    regressions = 0
+    for name, r in results.items():
+        if "skipped" in r:
+            print(f"{name:<34} {'SKIPPED':>12}  {r['skipped']}")
+            continue
+        line = f"{name:<34} {r['median_us']:>10.1f}us {r['min_us']:>10.1f}us"
+        previous = base.get(name, {})
+        if "median_us" in previous and previous["median_us"] > 0:
+            change = r["median_us"] / previous["median_us"] - 1
+            flag = " ⚠️ REGRESSION" if change > REGRESSION_THRESHOLD else ""
+            regressions += bool(flag)
+            line += f"  {change:+.1%}{flag}"
+        print(line)
+    if regressions:
+        print(f"\n⚠️ {regressions} case(s) more than {REGRESSION_THRESHOLD:.0%} slower than the baseline")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks with history")
+    parser.add_argument("-k", dest="filter", help="Only run cases whose name contains this")
+    parser.add_argument("--repeats", type=int, default=5, help="Samples per case")
+    parser.add_argument("--min-seconds", type=float, default=0.2, help="Minimum wall time per sample")
+    parser.add_argument("--compare", metavar="SHA", help="Baseline commit in history (default: latest run)")
+    parser.add_argument("--no-save", action="store_true", help="Do not append this run to history.jsonl")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    sys.path.insert(0, REPO_ROOT)
+    cases = [c for c in CASES if not args.filter or args.filter in c.name]
+    history = load_history()
+    baseline = find_baseline(history, args.compare)
+
+    results = run_cases(cases, args.repeats, args.min_seconds)
+    revision = git_revision()
+    entry = {
+        "ts": datetime.now().isoformat(timespec="seconds"),
+        "git_sha": revision["sha"],
+        "dirty": revision["dirty"],
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    if args.json:
+        print(json.dumps(entry, indent=2))
+    else:
+        print_results(results, baseline)
+
+    if not args.no_save:
+        with open(HISTORY_PATH, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+
+
+if __name__ == "__main__":
+    main()
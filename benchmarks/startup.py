@@ -0,0 +1,105 @@
+"""
+Startup-time benchmark.
+
+Imports each module in a fresh interpreter with `python -X importtime` and
+reports the cumulative import time of the module itself plus its heaviest
+dependencies. Run from the repo root:
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --top 5 --json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# The orchestrator entry point first, then each layer on its own
+MODULES = [
+    "main_orchestrator",
+    "data_layer",
+    "data_layer.market_data",
+    "data_layer.technicals",
+    "ai_brain.crew_manager",
+    "execution_layer.safe_integration",
+    "execution_layer.key_management",
+    "frontend_layer.discord_bot",
+]
+
+
+def parse_importtime(stderr: str) -> dict:
+    """Maps module name -> cumulative import time in microseconds."""
+    timings = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _self_us, cumulative_us, name = line[len("import time:"):].split("|")
+            timings[name.strip()] = int(cumulative_us)
+        except ValueError:
+            continue
+    return timings
+
+
+def measure(module: str, runs: int = 3) -> dict:
+    """Best-of-N cold import of `module` in a fresh interpreter."""
+    best, best_key = None, (True, float("inf"))
+    for _ in range(runs):
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            cwd=REPO_ROOT, capture_output=True, text=True,
+        )
+        timings = parse_importtime(proc.stderr)
+        error = None
+        if proc.returncode != 0:
+            error = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "import failed"
+        total_us = timings.get(module, 0)
+        # Any clean run beats a failed one; among clean runs the fastest wins (both in us)
+        key = (error is not None, total_us if error is None else float("inf"))
+        if best is None or key < best_key:
+            best, best_key = {"module": module, "total_ms": total_us / 1000, "timings": timings, "error": error}, key
+    return best
+
+
+def top_dependencies(result: dict, top: int) -> list:
+    """Heaviest third-party/top-level packages pulled in by the import."""
+    packages = {}
+    for name, cumulative_us in result["timings"].items():
+        root = name.split(".")[0]
+        if name == root and name != result["module"].split(".")[0]:
+            packages[root] = max(packages.get(root, 0), cumulative_us)
+    ranked = sorted(packages.items(), key=lambda kv: kv[1], reverse=True)[:top]
+    return [(name, us / 1000) for name, us in ranked]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-module cold import time")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh interpreters per module (best is kept)")
+    parser.add_argument("--top", type=int, default=3, help="Heaviest dependencies to list per module")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    results = [measure(module, args.runs) for module in MODULES]
+
+    if args.json:
+        print(json.dumps([
+            {"module": r["module"], "total_ms": r["total_ms"], "error": r["error"],
+             "top_dependencies": top_dependencies(r, args.top)}
+            for r in results
+        ], indent=2))
+        return
+
+    print(f"{'MODULE':<36} {'IMPORT (ms)':>12}  HEAVIEST DEPENDENCIES")
+    print("-" * 90)
+    for r in results:
+        if r["error"]:
+            print(f"{r['module']:<36} {'FAILED':>12}  {r['error']}")
+            continue
+        deps = ", ".join(f"{name} {ms:.0f}ms" for name, ms in top_dependencies(r, args.top))
+        print(f"{r['module']:<36} {r['total_ms']:>12.1f}  {deps}")
+
+
+if __name__ == "__main__":
+    main()
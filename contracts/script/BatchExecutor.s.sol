@@ -0,0 +1,20 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+import {Script} from "forge-std/Script.sol";
+import {BatchExecutor} from "../src/BatchExecutor.sol";
+
+contract BatchExecutorScript is Script {
+    BatchExecutor public executor;
+
+    function setUp() public {}
+
+    /// @param owner The relaying agent's address ("direct" mode) or the Safe ("safe" mode)
+    function run(address owner) public {
+        vm.startBroadcast();
+
+        executor = new BatchExecutor(owner);
+
+        vm.stopBroadcast();
+    }
+}
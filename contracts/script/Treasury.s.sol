@@ -0,0 +1,20 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+import {Script} from "forge-std/Script.sol";
+import {Treasury, ISwapAdapter} from "../src/Treasury.sol";
+
+contract TreasuryScript is Script {
+    Treasury public treasury;
+
+    function setUp() public {}
+
+    /// @param executor The BatchExecutor, else the Safe ("safe" mode) or the relaying agent ("direct" mode)
+    function run(address executor, address quote, ISwapAdapter adapter, uint8 quorum) public {
+        vm.startBroadcast();
+
+        treasury = new Treasury(executor, quote, adapter, quorum);
+
+        vm.stopBroadcast();
+    }
+}
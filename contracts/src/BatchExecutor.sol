@@ -0,0 +1,49 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+/// @notice Runs a list of calls in one transaction, atomically: if any call reverts, the whole batch does.
+/// Only `owner` (the relaying agent, or the Safe in multisig mode) can execute, since targets see this
+/// contract as `msg.sender`.
+contract BatchExecutor {
+    struct Call {
+        address target;
+        uint256 value;
+        bytes data;
+    }
+
+    address public immutable owner;
+
+    error NotOwner(address caller);
+    error EmptyBatch();
+    error CallFailed(uint256 index, bytes reason);
+    error ValueMismatch(uint256 sent, uint256 spent);
+
+    event BatchExecuted(address indexed sender, uint256 calls);
+
+    constructor(address owner_) {
+        owner = owner_;
+    }
+
+    function execute(Call[] calldata calls) external payable returns (bytes[] memory results) {
+        if (msg.sender != owner) revert NotOwner(msg.sender);
+        uint256 length = calls.length;
+        if (length == 0) revert EmptyBatch();
+
+        results = new bytes[](length);
+        uint256 spent;
+        for (uint256 i; i < length;) {
+            Call calldata item = calls[i];
+            (bool ok, bytes memory result) = item.target.call{value: item.value}(item.data);
+            if (!ok) revert CallFailed(i, result);
+            results[i] = result;
+            spent += item.value;
+            unchecked {
+                ++i;
+            }
+        }
+        // Checked last: a mismatch reverts every call above anyway
+        if (spent != msg.value) revert ValueMismatch(msg.value, spent);
+
+        emit BatchExecuted(msg.sender, length);
+    }
+}
@@ -0,0 +1,114 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+interface IERC20 {
+    function balanceOf(address account) external view returns (uint256);
+    function transfer(address to, uint256 amount) external returns (bool);
+}
+
+/// @notice A trading venue. The treasury sends `amountIn` of `tokenIn` to the adapter first (no approve +
+/// transferFrom round trip); the adapter sends at least `minAmountOut` of `tokenOut` to `recipient`.
+interface ISwapAdapter {
+    function swap(address tokenIn, address tokenOut, uint256 amountIn, uint256 minAmountOut, address recipient)
+        external
+        returns (uint256 amountOut);
+}
+
+/// @notice The committee's stablecoin treasury. It only trades through `swap`, which only the executor (the Safe,
+/// whose owner signatures are the committee's vote, or the BatchExecutor it owns) can call with a passing tally.
+/// Replay protection comes from the executor's nonce, so no per-proposal storage is written.
+contract Treasury {
+    /// @dev One storage slot per asset (128 + 88 + 40 bits), read once and written once per trade.
+    struct Position {
+        uint128 amount; // Asset units held
+        uint88 cost; // Quote units paid for `amount`
+        uint40 updatedAt;
+    }
+
+    uint256 internal constant BPS = 10_000;
+    uint256 internal constant RATE_ONE = 1e18;
+
+    address public immutable executor;
+    address public immutable quote;
+    ISwapAdapter public immutable adapter;
+    uint8 public immutable quorum;
+
+    mapping(address => Position) public positions;
+
+    error NotExecutor(address caller);
+    error VoteNotPassed(uint8 votesFor, uint8 votesAgainst);
+    error InvalidAsset(address asset);
+    error InvalidBps(uint16 bps);
+    error ZeroAmount();
+    error SlippageExceeded(uint256 amountOut, uint256 minAmountOut);
+    error AmountOverflow();
+    error TransferFailed(address token);
+
+    event Swapped(bytes16 indexed proposalId, address indexed asset, bool buy, uint256 amountIn, uint256 amountOut);
+
+    constructor(address executor_, address quote_, ISwapAdapter adapter_, uint8 quorum_) {
+        executor = executor_;
+        quote = quote_;
+        adapter = adapter_;
+        quorum = quorum_;
+    }
+
+    /// @notice Buys `asset` with `bps` of the quote balance, or sells `bps` of the `asset` position.
+    /// @param minRate Minimum `amountOut * 1e18 / amountIn`; a rate rather than an amount, so it stays valid
+    /// when several swaps run in one batch and each one sees the balance the previous ones left.
+    function swap(
+        address asset,
+        bool buy,
+        uint16 bps,
+        uint256 minRate,
+        bytes16 proposalId,
+        uint8 votesFor,
+        uint8 votesAgainst
+    ) external returns (uint256 amountIn, uint256 amountOut) {
+        if (msg.sender != executor) revert NotExecutor(msg.sender);
+        if (votesFor < quorum || votesFor <= votesAgainst) revert VoteNotPassed(votesFor, votesAgainst);
+        if (asset == quote || asset == address(0)) revert InvalidAsset(asset);
+        if (bps == 0 || bps > BPS) revert InvalidBps(bps);
+
+        Position memory position = positions[asset];
+        if (buy) {
+            amountIn = IERC20(quote).balanceOf(address(this)) * bps / BPS;
+            amountOut = _trade(quote, asset, amountIn, minRate);
+
+            uint256 amount = position.amount + amountOut;
+            uint256 cost = position.cost + amountIn;
+            if (amount > type(uint128).max || cost > type(uint88).max) revert AmountOverflow();
+            position.amount = uint128(amount);
+            position.cost = uint88(cost);
+        } else {
+            amountIn = uint256(position.amount) * bps / BPS;
+            amountOut = _trade(asset, quote, amountIn, minRate);
+
+            // amountIn <= position.amount, and the cost basis leaves pro rata with the units sold
+            unchecked {
+                position.cost -= uint88(uint256(position.cost) * amountIn / position.amount);
+                position.amount -= uint128(amountIn);
+            }
+        }
+        position.updatedAt = uint40(block.timestamp);
+        positions[asset] = position;
+
+        emit Swapped(proposalId, asset, buy, amountIn, amountOut);
+    }
+
+    function _trade(address tokenIn, address tokenOut, uint256 amountIn, uint256 minRate)
+        private
+        returns (uint256 amountOut)
+    {
+        if (amountIn == 0) revert ZeroAmount();
+        uint256 minAmountOut = amountIn * minRate / RATE_ONE;
+        _transfer(tokenIn, address(adapter), amountIn);
+        amountOut = adapter.swap(tokenIn, tokenOut, amountIn, minAmountOut, address(this));
+        if (amountOut < minAmountOut) revert SlippageExceeded(amountOut, minAmountOut);
+    }
+
+    function _transfer(address token, address to, uint256 amount) private {
+        (bool ok, bytes memory data) = token.call(abi.encodeCall(IERC20.transfer, (to, amount)));
+        if (!ok || (data.length != 0 && !abi.decode(data, (bool)))) revert TransferFailed(token);
+    }
+}
@@ -0,0 +1,164 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+import {Test} from "forge-std/Test.sol";
+import {BatchExecutor} from "../src/BatchExecutor.sol";
+import {Counter} from "../src/Counter.sol";
+
+contract Reverter {
+    function fail() external pure {
+        revert("nope");
+    }
+}
+
+contract Sink {
+    function deposit() external payable {}
+}
+
+contract BatchExecutorTest is Test {
+    // Hard ceilings (execution gas, without the 21k base cost), set from an opcode-cost estimate
+    // with headroom; exact regressions are caught by CI against the snapshots/BatchExecutor.json
+    // baseline
+    uint256 constant SINGLE_CALL_GAS_BUDGET = 40_000;
+    uint256 constant TEN_CALLS_GAS_BUDGET = 120_000;
+
+    BatchExecutor public executor;
+    Counter public counter;
+    Counter public other;
+    address public owner = makeAddr("relayer");
+
+    function setUp() public {
+        executor = new BatchExecutor(owner);
+        counter = new Counter();
+        other = new Counter();
+    }
+
+    function _increments(Counter target, uint256 n) internal pure returns (BatchExecutor.Call[] memory calls) {
+        calls = new BatchExecutor.Call[](n);
+        for (uint256 i; i < n; i++) {
+            calls[i] = BatchExecutor.Call(address(target), 0, abi.encodeCall(Counter.increment, ()));
+        }
+    }
+
+    function test_ExecutesCallsInOrder() public {
+        BatchExecutor.Call[] memory calls = new BatchExecutor.Call[](3);
+        calls[0] = BatchExecutor.Call(address(counter), 0, abi.encodeCall(Counter.setNumber, (41)));
+        calls[1] = BatchExecutor.Call(address(counter), 0, abi.encodeCall(Counter.increment, ()));
+        calls[2] = BatchExecutor.Call(address(other), 0, abi.encodeCall(Counter.increment, ()));
+
+        vm.prank(owner);
+        executor.execute(calls);
+
+        assertEq(counter.number(), 42);
+        assertEq(other.number(), 1);
+    }
+
+    function test_ReturnsResults() public {
+        counter.setNumber(7);
+        BatchExecutor.Call[] memory calls = new BatchExecutor.Call[](1);
+        calls[0] = BatchExecutor.Call(address(counter), 0, abi.encodeCall(Counter.number, ()));
+
+        vm.prank(owner);
+        bytes[] memory results = executor.execute(calls);
+
+        assertEq(abi.decode(results[0], (uint256)), 7);
+    }
+
+    function test_RevertsAtomically() public {
+        Reverter reverter = new Reverter();
+        BatchExecutor.Call[] memory calls = new BatchExecutor.Call[](2);
+        calls[0] = BatchExecutor.Call(address(counter), 0, abi.encodeCall(Counter.increment, ()));
+        calls[1] = BatchExecutor.Call(address(reverter), 0, abi.encodeCall(Reverter.fail, ()));
+
+        bytes memory reason = abi.encodeWithSignature("Error(string)", "nope");
+        vm.expectRevert(abi.encodeWithSelector(BatchExecutor.CallFailed.selector, 1, reason));
+        vm.prank(owner);
+        executor.execute(calls);
+
+        assertEq(counter.number(), 0);
+    }
+
+    function test_ForwardsValue() public {
+        Sink sink = new Sink();
+        BatchExecutor.Call[] memory calls = new BatchExecutor.Call[](2);
+        calls[0] = BatchExecutor.Call(address(sink), 1 ether, abi.encodeCall(Sink.deposit, ()));
+        calls[1] = BatchExecutor.Call(address(sink), 2 ether, abi.encodeCall(Sink.deposit, ()));
+
+        vm.deal(owner, 3 ether);
+        vm.prank(owner);
+        executor.execute{value: 3 ether}(calls);
+
+        assertEq(address(sink).balance, 3 ether);
+        assertEq(address(executor).balance, 0);
+    }
+
+    function test_RevertWhen_ValueMismatch() public {
+        Sink sink = new Sink();
+        BatchExecutor.Call[] memory calls = new BatchExecutor.Call[](1);
+        calls[0] = BatchExecutor.Call(address(sink), 1 ether, abi.encodeCall(Sink.deposit, ()));
+
+        vm.deal(owner, 2 ether);
+        vm.expectRevert(abi.encodeWithSelector(BatchExecutor.ValueMismatch.selector, 2 ether, 1 ether));
+        vm.prank(owner);
+        executor.execute{value: 2 ether}(calls);
+    }
+
+    function test_RevertWhen_NotOwner() public {
+        address stranger = makeAddr("stranger");
+        vm.expectRevert(abi.encodeWithSelector(BatchExecutor.NotOwner.selector, stranger));
+        vm.prank(stranger);
+        executor.execute(_increments(counter, 1));
+    }
+
+    function test_RevertWhen_Empty() public {
+        vm.expectRevert(BatchExecutor.EmptyBatch.selector);
+        vm.prank(owner);
+        executor.execute(new BatchExecutor.Call[](0));
+    }
+
+    function testFuzz_IncrementsN(uint8 n) public {
+        vm.assume(n > 0);
+        vm.prank(owner);
+        executor.execute(_increments(counter, n));
+        assertEq(counter.number(), n);
+    }
+
+    // --- Gas (written to snapshots/BatchExecutor.json by `forge test`) ---
+
+    function test_Gas_SingleCall() public {
+        BatchExecutor.Call[] memory calls = _increments(counter, 1);
+
+        vm.startSnapshotGas("BatchExecutor", "execute_1_call");
+        vm.prank(owner);
+        executor.execute(calls);
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, SINGLE_CALL_GAS_BUDGET);
+    }
+
+    function test_Gas_TenCalls() public {
+        BatchExecutor.Call[] memory calls = _increments(counter, 10);
+
+        vm.startSnapshotGas("BatchExecutor", "execute_10_calls");
+        vm.prank(owner);
+        executor.execute(calls);
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, TEN_CALLS_GAS_BUDGET);
+    }
+
+    function test_Gas_BatchBeatsSeparateTransactions() public {
+        // Ten separate transactions each pay the 21k base cost plus one increment
+        vm.startSnapshotGas("BatchExecutor", "increment_direct");
+        other.increment();
+        uint256 single = vm.stopSnapshotGas();
+
+        BatchExecutor.Call[] memory calls = _increments(counter, 10);
+        vm.startSnapshotGas("BatchExecutor", "execute_10_calls_vs_direct");
+        vm.prank(owner);
+        executor.execute(calls);
+        uint256 batched = vm.stopSnapshotGas();
+
+        assertLt(21_000 + batched, 10 * (21_000 + single));
+    }
+}
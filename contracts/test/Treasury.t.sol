@@ -0,0 +1,228 @@
+// SPDX-License-Identifier: UNLICENSED
+pragma solidity ^0.8.13;
+
+import {Test} from "forge-std/Test.sol";
+import {Treasury, ISwapAdapter} from "../src/Treasury.sol";
+
+contract TestToken {
+    mapping(address => uint256) public balanceOf;
+
+    function mint(address to, uint256 amount) external {
+        balanceOf[to] += amount;
+    }
+
+    function transfer(address to, uint256 amount) external returns (bool) {
+        balanceOf[msg.sender] -= amount;
+        balanceOf[to] += amount;
+        return true;
+    }
+}
+
+/// @dev Pays `amountIn * rate / 1e18` of `tokenOut` and ignores `minAmountOut`, so the treasury's own check is tested.
+contract MockSwapAdapter is ISwapAdapter {
+    uint256 public rate = 0.5e18;
+
+    function setRate(uint256 rate_) external {
+        rate = rate_;
+    }
+
+    function swap(address, address tokenOut, uint256 amountIn, uint256, address recipient)
+        external
+        returns (uint256 amountOut)
+    {
+        amountOut = amountIn * rate / 1e18;
+        TestToken(tokenOut).mint(recipient, amountOut);
+    }
+}
+
+abstract contract TreasuryFixture is Test {
+    uint256 constant INITIAL_QUOTE = 1_000_000 ether;
+
+    Treasury public treasury;
+    TestToken public usdc;
+    TestToken public btc;
+    MockSwapAdapter public adapter;
+    address public safe = makeAddr("safe");
+
+    function setUp() public virtual {
+        usdc = new TestToken();
+        btc = new TestToken();
+        adapter = new MockSwapAdapter();
+        treasury = new Treasury(safe, address(usdc), adapter, 2);
+        usdc.mint(address(treasury), INITIAL_QUOTE);
+    }
+
+    /// @dev A passing 2-yea / 1-nay vote, no slippage bound.
+    function _swap(bool buy, uint16 bps) internal returns (uint256 amountIn, uint256 amountOut) {
+        vm.prank(safe);
+        return treasury.swap(address(btc), buy, bps, 0, bytes16("proposal"), 2, 1);
+    }
+
+    function _position() internal view returns (uint128 amount, uint88 cost, uint40 updatedAt) {
+        return treasury.positions(address(btc));
+    }
+}
+
+contract TreasuryTest is TreasuryFixture {
+    // Hard ceiling on the execution gas of one swap (the 21k base cost comes on top), set from
+    // an opcode-cost estimate with headroom; exact regressions are caught by CI against the
+    // snapshots/Treasury.json baseline
+    uint256 constant BUY_NEW_POSITION_GAS_BUDGET = 120_000;
+
+    event Swapped(bytes16 indexed proposalId, address indexed asset, bool buy, uint256 amountIn, uint256 amountOut);
+
+    function test_BuyUsesBpsOfQuoteBalance() public {
+        (uint256 amountIn, uint256 amountOut) = _swap(true, 1_000);
+
+        assertEq(amountIn, 100_000 ether);
+        assertEq(amountOut, 50_000 ether);
+        assertEq(usdc.balanceOf(address(treasury)), INITIAL_QUOTE - amountIn);
+        assertEq(btc.balanceOf(address(treasury)), amountOut);
+
+        (uint128 amount, uint88 cost, uint40 updatedAt) = _position();
+        assertEq(amount, amountOut);
+        assertEq(cost, amountIn);
+        assertEq(updatedAt, block.timestamp);
+    }
+
+    function test_SellReleasesCostProRata() public {
+        _swap(true, 1_000);
+        (uint256 amountIn, uint256 amountOut) = _swap(false, 5_000);
+
+        assertEq(amountIn, 25_000 ether);
+        assertEq(amountOut, 12_500 ether);
+        (uint128 amount, uint88 cost,) = _position();
+        assertEq(amount, 25_000 ether);
+        assertEq(cost, 50_000 ether);
+    }
+
+    function test_PositionFitsOneSlot() public {
+        _swap(true, 1_000);
+
+        // positions is the only storage variable (slot 0); immutables live in the bytecode
+        bytes32 slot = keccak256(abi.encode(address(btc), uint256(0)));
+        uint256 word = uint256(vm.load(address(treasury), slot));
+        assertEq(uint128(word), 50_000 ether);
+        assertEq(uint88(word >> 128), 100_000 ether);
+        assertEq(uint40(word >> 216), block.timestamp);
+        assertEq(vm.load(address(treasury), bytes32(uint256(slot) + 1)), bytes32(0));
+    }
+
+    function test_EmitsSwapped() public {
+        vm.expectEmit(true, true, false, true, address(treasury));
+        emit Swapped(bytes16("proposal"), address(btc), true, 100_000 ether, 50_000 ether);
+        _swap(true, 1_000);
+    }
+
+    function test_RevertWhen_NotExecutor() public {
+        address stranger = makeAddr("stranger");
+        vm.expectRevert(abi.encodeWithSelector(Treasury.NotExecutor.selector, stranger));
+        vm.prank(stranger);
+        treasury.swap(address(btc), true, 1_000, 0, bytes16("proposal"), 3, 0);
+    }
+
+    function test_RevertWhen_BelowQuorum() public {
+        vm.expectRevert(abi.encodeWithSelector(Treasury.VoteNotPassed.selector, 1, 0));
+        vm.prank(safe);
+        treasury.swap(address(btc), true, 1_000, 0, bytes16("proposal"), 1, 0);
+    }
+
+    function test_RevertWhen_Tie() public {
+        vm.expectRevert(abi.encodeWithSelector(Treasury.VoteNotPassed.selector, 2, 2));
+        vm.prank(safe);
+        treasury.swap(address(btc), true, 1_000, 0, bytes16("proposal"), 2, 2);
+    }
+
+    function test_RevertWhen_AssetIsQuote() public {
+        vm.expectRevert(abi.encodeWithSelector(Treasury.InvalidAsset.selector, address(usdc)));
+        vm.prank(safe);
+        treasury.swap(address(usdc), true, 1_000, 0, bytes16("proposal"), 2, 1);
+    }
+
+    function test_RevertWhen_BpsOutOfRange() public {
+        vm.expectRevert(abi.encodeWithSelector(Treasury.InvalidBps.selector, 0));
+        _swap(true, 0);
+
+        vm.expectRevert(abi.encodeWithSelector(Treasury.InvalidBps.selector, 10_001));
+        _swap(true, 10_001);
+    }
+
+    function test_RevertWhen_NothingToSell() public {
+        vm.expectRevert(Treasury.ZeroAmount.selector);
+        _swap(false, 10_000);
+    }
+
+    function test_RevertWhen_Slippage() public {
+        // Expects at least 0.6 out per unit in; the adapter pays 0.5
+        vm.expectRevert(abi.encodeWithSelector(Treasury.SlippageExceeded.selector, 50_000 ether, 60_000 ether));
+        vm.prank(safe);
+        treasury.swap(address(btc), true, 1_000, 0.6e18, bytes16("proposal"), 2, 1);
+    }
+
+    function testFuzz_SellNeverExceedsPosition(uint16 buyBps, uint16 sellBps) public {
+        buyBps = uint16(bound(buyBps, 1, 10_000));
+        sellBps = uint16(bound(sellBps, 1, 10_000));
+        _swap(true, buyBps);
+        (uint128 amountBefore, uint88 costBefore,) = _position();
+
+        (uint256 amountIn,) = _swap(false, sellBps);
+
+        (uint128 amountAfter, uint88 costAfter,) = _position();
+        assertEq(amountAfter, amountBefore - amountIn);
+        assertLe(costAfter, costBefore);
+        if (sellBps == 10_000) assertEq(costAfter, 0);
+    }
+
+    // --- Gas (written to snapshots/Treasury.json by `forge test`) ---
+
+    function test_Gas_BuyNewPosition() public {
+        vm.startSnapshotGas("Treasury", "swap_buy_new_position");
+        _swap(true, 1_000);
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, BUY_NEW_POSITION_GAS_BUDGET);
+    }
+}
+
+/// @dev Starts from an open position. setUp runs as its own transaction, so each measured swap below
+/// sees cold accounts and committed storage, like a real trade does.
+contract TreasuryGasTest is TreasuryFixture {
+    uint256 constant BUY_EXISTING_POSITION_GAS_BUDGET = 75_000;
+    uint256 constant SELL_GAS_BUDGET = 75_000;
+    uint256 constant REJECTED_VOTE_GAS_BUDGET = 10_000;
+
+    function setUp() public override {
+        super.setUp();
+        _swap(true, 1_000);
+    }
+
+    function test_Gas_BuyExistingPosition() public {
+        vm.startSnapshotGas("Treasury", "swap_buy_existing_position");
+        _swap(true, 1_000);
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, BUY_EXISTING_POSITION_GAS_BUDGET);
+    }
+
+    function test_Gas_SellPartial() public {
+        vm.startSnapshotGas("Treasury", "swap_sell_partial");
+        _swap(false, 5_000);
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, SELL_GAS_BUDGET);
+    }
+
+    function test_Gas_RejectedVote() public {
+        // The custom-error path: a failing tally costs next to nothing
+        vm.startSnapshotGas("Treasury", "swap_rejected_vote");
+        vm.prank(safe);
+        try treasury.swap(address(btc), true, 1_000, 0, bytes16("proposal"), 1, 2) {
+            fail();
+        } catch (bytes memory reason) {
+            assertEq(bytes4(reason), Treasury.VoteNotPassed.selector);
+        }
+        uint256 gasUsed = vm.stopSnapshotGas();
+
+        assertLt(gasUsed, REJECTED_VOTE_GAS_BUDGET);
+    }
+}
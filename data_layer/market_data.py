@@ -1,40 +1,64 @@
-import ccxt
-import pandas as pd
-from typing import Tuple, Optional
-
-class MarketDataProvider:
-    def __init__(self, exchange_id: str = 'binance'):
-        # We use a public instance (no API keys needed just for fetching prices)
-        try:
-            self.exchange = getattr(ccxt, exchange_id)()
-        except AttributeError:
-            print(f"Warning: Exchange {exchange_id} not found, defaulting to Binance.")
-            self.exchange = ccxt.binance()
-
-    def fetch_current_price(self, symbol: str) -> float:
-        """
-        Fetches the latest ticker price.
-        Symbol format example: 'BTC/USDT' or 'PEPE/USDT'
-        """
-        try:
-            ticker = self.exchange.fetch_ticker(symbol)
-            return float(ticker['last'])
-        except Exception as e:
-            print(f"Error fetching price for {symbol}: {e}")
-            return 0.0
-
-    def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 200) -> pd.DataFrame:
-        """
-        Fetches historical candle data for technical analysis.
-        Returns a Pandas DataFrame with columns: [timestamp, open, high, low, close, volume]
-        """
-        try:
-            # fetch_ohlcv returns a list of lists
-            ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
-            
-            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
-            return df
-        except Exception as e:
-            print(f"Error fetching candles for {symbol}: {e}")
+import threading
+import ccxt
+import pandas as pd
+from typing import Tuple, Optional
+from instrumentation import timed
+from deadlines import DeadlineExceeded, io_timeout
+
+class MarketDataProvider:
+    def __init__(self, exchange_id: str = 'binance'):
+        # We use a public instance (no API keys needed just for fetching prices)
+        if not hasattr(ccxt, exchange_id):
+            print(f"Warning: Exchange {exchange_id} not found, defaulting to Binance.")
+            exchange_id = 'binance'
+        self.exchange_id = exchange_id
+        self._local = threading.local()
+
+    @property
+    def exchange(self):
+        # ccxt takes its HTTP timeout from the instance, so each thread gets its own
+        # instance and concurrent cycles never overwrite each other's timeout
+        exchange = getattr(self._local, "exchange", None)
+        if exchange is None:
+            exchange = self._local.exchange = getattr(ccxt, self.exchange_id)()
+        return exchange
+
+    def _bound_timeout(self, default_seconds: float = 10.0):
+        # Per call: what is left of this cycle's budget, in ms
+        self.exchange.timeout = int(io_timeout(default_seconds) * 1000)
+
+    def fetch_current_price(self, symbol: str) -> float:
+        """
+        Fetches the latest ticker price.
+        Symbol format example: 'BTC/USDT' or 'PEPE/USDT'
+        """
+        try:
+            self._bound_timeout()
+            with timed("external_call_seconds", service="ccxt", call="fetch_ticker"):
+                ticker = self.exchange.fetch_ticker(symbol)
+            return float(ticker['last'])
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Error fetching price for {symbol}: {e}")
+            return 0.0
+
+    def fetch_ohlcv(self, symbol: str, timeframe: str = '1h', limit: int = 200) -> pd.DataFrame:
+        """
+        Fetches historical candle data for technical analysis.
+        Returns a Pandas DataFrame with columns: [timestamp, open, high, low, close, volume]
+        """
+        try:
+            # fetch_ohlcv returns a list of lists
+            self._bound_timeout()
+            with timed("external_call_seconds", service="ccxt", call="fetch_ohlcv"):
+                ohlcv = self.exchange.fetch_ohlcv(symbol, timeframe, limit=limit)
+            
+            df = pd.DataFrame(ohlcv, columns=['timestamp', 'open', 'high', 'low', 'close', 'volume'])
+            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
+            return df
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"Error fetching candles for {symbol}: {e}")
             return pd.DataFrame()
\ No newline at end of file
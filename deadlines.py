@@ -0,0 +1,118 @@
+# deadlines.py
+"""
+Per-cycle time budgets that follow the work down into every I/O call.
+
+The orchestrator opens a `deadline_scope(Deadline(120))` around each stage;
+any layer can then ask for the time it has left:
+
+    requests.get(url, timeout=io_timeout(10))   # min(10s, what's left of the cycle)
+
+When the budget runs out, `io_timeout` / `Deadline.check` raise DeadlineExceeded
+and the cycle is cancelled cooperatively (partial results are kept on the record).
+A wait that only hit its own cap (the budget had time left) raises a plain
+TimeoutError instead, so the caller can fall back like on any other failure.
+"""
+import contextvars
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Optional
+
+
+class DeadlineExceeded(Exception):
+    """The cycle ran out of its time budget."""
+
+
+@dataclass
+class Deadline:
+    budget_seconds: float
+    expires_at: float = field(default=0.0)  # time.monotonic() (system-wide on Linux, so fine across shards)
+
+    def __post_init__(self):
+        if not self.expires_at:
+            self.expires_at = time.monotonic() + self.budget_seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self, where: str = ""):
+        if self.expired:
+            raise DeadlineExceeded(f"cycle budget of {self.budget_seconds:.0f}s exhausted{' before ' + where if where else ''}")
+
+    def timeout(self, cap: Optional[float] = None) -> float:
+        """Seconds an I/O call may take: the remaining budget, capped at `cap`."""
+        self.check()
+        remaining = self.remaining()
+        return min(remaining, cap) if cap is not None else remaining
+
+
+_current: contextvars.ContextVar = contextvars.ContextVar("cycle_deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Makes `deadline` visible to io_timeout() for the duration of the block."""
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def io_timeout(default: float) -> float:
+    """
+    Timeout for one I/O call. Outside a cycle this is just `default`; inside one it
+    is capped by what is left of the budget (and raises if nothing is left).
+    """
+    deadline = _current.get()
+    if deadline is None:
+        return default
+    return deadline.timeout(cap=default)
+
+
+def timeout_error(what: str, timeout: float, default: float) -> Exception:
+    """
+    The error for a wait of `timeout` = io_timeout(`default`) seconds that ran out:
+    DeadlineExceeded if the cycle budget was what bound it, TimeoutError if only the cap did.
+    """
+    if timeout < default:
+        return DeadlineExceeded(f"{what} did not return before the cycle budget ran out ({timeout:.1f}s)")
+    return TimeoutError(f"{what} did not return within {timeout:.1f}s")
+
+
+def wait_for(future: Future, default_timeout: float, what: str) -> Any:
+    """future.result() for at most io_timeout(default_timeout); see timeout_error() for what it raises."""
+    timeout = io_timeout(default_timeout)
+    try:
+        return future.result(timeout=timeout)
+    except FutureTimeout:
+        raise timeout_error(what, timeout, default_timeout) from None
+
+
+def call_with_deadline(fn: Callable, *args, default_timeout: float = 60.0, **kwargs):
+    """
+    Runs `fn` but gives up waiting after io_timeout(default_timeout).
+    The call itself cannot be killed; it finishes in the background and is ignored.
+    Each call gets its own daemon thread, so calls that hang can never starve later ones.
+    """
+    future = Future()
+    context = contextvars.copy_context()
+
+    def run():
+        try:
+            future.set_result(context.run(fn, *args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="deadline-call", daemon=True).start()
+    return wait_for(future, default_timeout, getattr(fn, "__qualname__", str(fn)))
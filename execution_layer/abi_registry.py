@@ -0,0 +1,167 @@
+import glob
+import json
+import os
+import threading
+from typing import Dict, List, Optional, Sequence
+
+from eth_abi import encode as abi_encode
+from eth_utils import function_signature_to_4byte_selector
+
+try:
+    from eth_abi.registry import registry as _abi_registry
+except ImportError:  # Very old eth_abi: encode per call
+    _abi_registry = None
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# `forge build` run inside contracts/ writes to contracts/out; run at the root it writes to out/
+ARTIFACT_DIRS = (os.path.join(REPO_ROOT, "contracts", "out"), os.path.join(REPO_ROOT, "out"))
+
+
+def canonical_type(param: dict) -> str:
+    """ABI input -> canonical type string, expanding tuples: {"type": "tuple[]", ...} -> "(address,uint256)[]"."""
+    type_str = param["type"]
+    if type_str.startswith("tuple"):
+        inner = ",".join(canonical_type(c) for c in param.get("components", []))
+        return f"({inner}){type_str[len('tuple'):]}"
+    return type_str
+
+
+def split_signature(signature: str) -> List[str]:
+    """'swap(address,(uint8,bool),uint256)' -> ['address', '(uint8,bool)', 'uint256']."""
+    args = signature[signature.index("(") + 1:signature.rindex(")")]
+    types, depth, current = [], 0, ""
+    for ch in args:
+        if ch == "," and depth == 0:
+            types.append(current)
+            current = ""
+            continue
+        depth += (ch == "(") - (ch == ")")
+        current += ch
+    if current:
+        types.append(current)
+    return types
+
+
+class FunctionEncoder:
+    """
+    Calldata builder for one function. The selector and the eth_abi tuple encoder
+    are resolved once; calls without arguments return a precomputed constant.
+    """
+
+    def __init__(self, signature: str, input_types: Sequence[str], selector: Optional[bytes] = None):
+        self.signature = signature
+        self.input_types = tuple(input_types)
+        self.selector = selector or function_signature_to_4byte_selector(signature)
+        self._encoder = _abi_registry.get_tuple_encoder(*self.input_types) if _abi_registry and self.input_types else None
+        self._constant = self.selector if not self.input_types else None
+
+    @classmethod
+    def from_signature(cls, signature: str) -> "FunctionEncoder":
+        return cls(signature, split_signature(signature))
+
+    def encode(self, *args) -> bytes:
+        if self._constant is not None:
+            return self._constant
+        if len(args) != len(self.input_types):
+            raise ValueError(f"{self.signature} takes {len(self.input_types)} arguments, got {len(args)}")
+        if self._encoder is not None:
+            return self.selector + self._encoder(args)
+        return self.selector + abi_encode(self.input_types, args)
+
+    def encode_hex(self, *args) -> str:
+        return "0x" + self.encode(*args).hex()
+
+
+class ContractArtifact:
+    """A Foundry artifact (out/<File>.sol/<Name>.json) with an encoder per function."""
+
+    def __init__(self, name: str, path: str, artifact: dict):
+        self.name = name
+        self.path = path
+        self.abi: List[dict] = artifact["abi"]
+        self.bytecode: str = (artifact.get("bytecode") or {}).get("object", "")
+
+        identifiers = artifact.get("methodIdentifiers") or {}
+        self.functions: Dict[str, FunctionEncoder] = {}  # By signature, e.g. "setNumber(uint256)"
+        by_name: Dict[str, List[FunctionEncoder]] = {}
+        for item in self.abi:
+            if item.get("type") != "function":
+                continue
+            types = [canonical_type(p) for p in item.get("inputs", [])]
+            signature = f"{item['name']}({','.join(types)})"
+            selector = bytes.fromhex(identifiers[signature]) if signature in identifiers else None
+            encoder = FunctionEncoder(signature, types, selector)
+            self.functions[signature] = encoder
+            by_name.setdefault(item["name"], []).append(encoder)
+        # Plain names only for functions that are not overloaded
+        self._by_name = {name: encoders[0] for name, encoders in by_name.items() if len(encoders) == 1}
+
+    def function(self, name_or_signature: str) -> FunctionEncoder:
+        encoder = self.functions.get(name_or_signature) or self._by_name.get(name_or_signature)
+        if encoder is None:
+            raise KeyError(f"{self.name} has no function {name_or_signature!r}")
+        return encoder
+
+    def selectors(self) -> Dict[str, str]:
+        return {sig: "0x" + enc.selector.hex() for sig, enc in self.functions.items()}
+
+
+class AbiRegistry:
+    """
+    Loads contract ABIs from Foundry build artifacts once per process, so Python
+    always encodes against what `forge build` produced from contracts/src.
+    """
+
+    def __init__(self, artifact_dirs: Sequence[str] = ARTIFACT_DIRS):
+        self.artifact_dirs = tuple(artifact_dirs)
+        self._contracts: Dict[str, Optional[ContractArtifact]] = {}
+        self._fallbacks: Dict[str, FunctionEncoder] = {}
+        self._lock = threading.Lock()
+
+    def _find_artifact(self, name: str) -> Optional[str]:
+        for directory in self.artifact_dirs:
+            path = os.path.join(directory, f"{name}.sol", f"{name}.json")
+            if os.path.exists(path):
+                return path
+            # Contract declared in a file with another name
+            matches = glob.glob(os.path.join(directory, "*.sol", f"{name}.json"))
+            if matches:
+                return matches[0]
+        return None
+
+    def contract(self, name: str) -> Optional[ContractArtifact]:
+        """The artifact for contract `name`, or None if it has not been built."""
+        if name in self._contracts:
+            return self._contracts[name]
+        with self._lock:
+            if name not in self._contracts:
+                path = self._find_artifact(name)
+                artifact = None
+                if path:
+                    with open(path, encoding="utf-8") as f:
+                        artifact = ContractArtifact(name, path, json.load(f))
+                self._contracts[name] = artifact
+            return self._contracts[name]
+
+    def function(self, contract: str, signature: str) -> FunctionEncoder:
+        """
+        Encoder for `contract.signature` from the build artifacts. If the contract
+        has not been built (no forge here), falls back to encoding from the signature
+        alone, which gives the same calldata.
+        """
+        artifact = self.contract(contract)
+        if artifact is not None:
+            return artifact.function(signature)
+        key = f"{contract}.{signature}"
+        encoder = self._fallbacks.get(key)
+        if encoder is None:
+            print(f"⚠️ [ABI] No build artifact for {contract}, encoding {signature} from its signature")
+            encoder = self._fallbacks[key] = FunctionEncoder.from_signature(signature)
+        return encoder
+
+    def calldata(self, contract: str, signature: str, *args) -> str:
+        return self.function(contract, signature).encode_hex(*args)
+
+
+ABIS = AbiRegistry()
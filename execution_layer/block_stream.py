@@ -0,0 +1,263 @@
+import asyncio
+import itertools
+import json
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+from instrumentation import REGISTRY
+
+try:
+    import websockets  # Installed with web3
+except ImportError:  # Polling only
+    websockets = None
+
+BlockCallback = Callable[[int], None]
+LogCallback = Callable[[dict], None]
+
+
+class BlockStream:
+    """
+    One push stream of new blocks (and logs) for the whole execution layer, so the
+    confirmation tracker, the fee oracle and the balance watcher react to blocks
+    instead of each polling on its own timer.
+
+    With a websocket URL it holds `eth_subscribe` newHeads + logs subscriptions on
+    an asyncio loop in a background thread. When the socket drops it reconnects
+    with backoff, and the blocks (and logs) it missed meanwhile are backfilled over
+    HTTP before live delivery resumes, so subscribers never see a gap. Without a
+    websocket URL (or the `websockets` package) it polls `eth_blockNumber` every
+    `poll_seconds` and delivers the same way.
+
+    Callbacks run in order on one worker thread, never on the event loop.
+    """
+
+    def __init__(self, ws_url: Optional[str], w3, poll_seconds: float = 2.0,
+                 max_backfill_blocks: int = 256, reconnect_max_seconds: float = 30.0):
+        self.ws_url = ws_url if websockets is not None else None
+        self.w3 = w3  # HTTP: backfill and polling
+        self.poll_seconds = poll_seconds
+        self.max_backfill_blocks = max_backfill_blocks
+        self.reconnect_max_seconds = reconnect_max_seconds
+
+        self._block_callbacks: List[BlockCallback] = []
+        self._log_filters: List[Tuple[dict, LogCallback]] = []
+        self._dispatch = ThreadPoolExecutor(max_workers=1, thread_name_prefix="block-callbacks")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._ids = itertools.count(1)
+        self.head: Optional[int] = None
+        self._logs_through = -1  # Highest block whose logs came from eth_getLogs
+        self.mode = "websocket" if self.ws_url else "polling"
+        self.stats = {"blocks": 0, "logs": 0, "backfilled_blocks": 0, "reconnects": 0}
+
+        if ws_url and websockets is None:
+            print("⚠️ [Blocks] `websockets` is not installed, falling back to polling")
+
+    # --- Subscribing ---
+    def on_block(self, callback: BlockCallback):
+        """`callback(block_number)` for every new block, in order, gaps backfilled."""
+        self._block_callbacks.append(callback)
+
+    def on_logs(self, log_filter: dict, callback: LogCallback):
+        """`callback(log)` for every log matching `log_filter` ({"address": ..., "topics": [...]})."""
+        self._log_filters.append((log_filter, callback))
+
+    # --- Lifecycle ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._run_loop, name="block-stream", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+
+    def _run_loop(self):
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        main = self._websocket_loop() if self.ws_url else self._poll_loop()
+        try:
+            self._loop.run_until_complete(main)
+        except RuntimeError:
+            pass  # stop() halted the loop
+        finally:
+            self._loop.close()
+
+    # --- Delivery ---
+    def _emit_block(self, number: int):
+        """New head `number`: first the blocks we skipped, then this one."""
+        if self.head is not None and number <= self.head:
+            return  # Duplicate, or a reorg back to a height we already delivered
+        first = number if self.head is None else self.head + 1
+        if number - first > self.max_backfill_blocks:
+            print(f"⚠️ [Blocks] {number - first} blocks missed, backfilling only the last {self.max_backfill_blocks}")
+            first = number - self.max_backfill_blocks
+        if first < number:
+            self.stats["backfilled_blocks"] += number - first
+            REGISTRY.inc("block_stream_backfilled_total", number - first)
+            if self._log_filters:
+                self._backfill_logs(first, number - 1)
+        for block in range(first, number + 1):
+            for callback in self._block_callbacks:
+                self._dispatch.submit(self._safe_call, callback, block)
+        self.head = number
+        self.stats["blocks"] += number + 1 - first
+        REGISTRY.inc("block_stream_blocks_total", number + 1 - first, mode=self.mode)
+
+    def _emit_log(self, callback: LogCallback, log: dict):
+        self.stats["logs"] += 1
+        self._dispatch.submit(self._safe_call, callback, log)
+
+    def _backfill_logs(self, from_block: int, to_block: int):
+        self._logs_through = max(self._logs_through, to_block)
+        for log_filter, callback in self._log_filters:
+            try:
+                logs = self.w3.provider.make_request(
+                    "eth_getLogs", [{**log_filter, "fromBlock": hex(from_block), "toBlock": hex(to_block)}]
+                ).get("result") or []
+            except Exception as e:
+                print(f"⚠️ [Blocks] Log backfill {from_block}-{to_block} failed: {e}")
+                continue
+            for log in logs:
+                self._emit_log(callback, log)
+
+    @staticmethod
+    def _safe_call(callback, value):
+        try:
+            callback(value)
+        except Exception as e:
+            print(f"❌ [Blocks] Subscriber {getattr(callback, '__qualname__', callback)} failed: {e}")
+
+    # --- Websocket ---
+    async def _websocket_loop(self):
+        backoff = 1.0
+        while not self._stopping:
+            try:
+                async with websockets.connect(self.ws_url, ping_interval=20, max_size=2 ** 22) as ws:
+                    await self._subscribe_and_listen(ws)
+                    backoff = 1.0
+            except Exception as e:
+                if self._stopping:
+                    return
+                self.stats["reconnects"] += 1
+                REGISTRY.inc("block_stream_reconnects_total")
+                print(f"⚠️ [Blocks] Websocket lost ({e}), reconnecting in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.reconnect_max_seconds)
+
+    async def _subscribe_and_listen(self, ws):
+        early: List[dict] = []  # Notifications that arrive before the last subscribe reply
+        heads_id = await self._rpc(ws, "eth_subscribe", ["newHeads"], early)
+        log_subs: Dict[str, LogCallback] = {}
+        for log_filter, callback in self._log_filters:
+            log_subs[await self._rpc(ws, "eth_subscribe", ["logs", log_filter], early)] = callback
+        print(f"🔔 [Blocks] Subscribed to newHeads{f' + {len(log_subs)} log filters' if log_subs else ''} on {self.ws_url}")
+
+        # Close the gap left by the disconnect before the next live head arrives. The head block
+        # itself may predate the logs subscription, so its logs are fetched too.
+        if self.head is not None:
+            previous = self.head
+            latest = await self._loop.run_in_executor(None, lambda: self.w3.eth.block_number)
+            self._emit_block(latest)
+            if self._log_filters and latest > previous:
+                self._backfill_logs(latest, latest)
+
+        for message in early:
+            self._handle(message, heads_id, log_subs)
+        async for raw in ws:
+            self._handle(json.loads(raw), heads_id, log_subs)
+
+    async def _rpc(self, ws, method: str, params: list, early: List[dict]):
+        request_id = next(self._ids)
+        await ws.send(json.dumps({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}))
+        while True:
+            message = json.loads(await ws.recv())
+            if message.get("id") == request_id:
+                if "error" in message:
+                    raise RuntimeError(f"{method}: {message['error']}")
+                return message["result"]
+            early.append(message)
+
+    def _handle(self, message: dict, heads_id: str, log_subs: Dict[str, LogCallback]):
+        if message.get("method") != "eth_subscription":
+            return
+        params = message.get("params") or {}
+        subscription, result = params.get("subscription"), params.get("result")
+        if subscription == heads_id:
+            self._emit_block(int(result["number"], 16))
+        elif subscription in log_subs and not result.get("removed"):
+            if int(result.get("blockNumber", "0x0"), 16) > self._logs_through:  # Not already backfilled
+                self._emit_log(log_subs[subscription], result)
+
+    # --- Polling fallback ---
+    async def _poll_loop(self):
+        while not self._stopping:
+            try:
+                latest = await self._loop.run_in_executor(None, lambda: self.w3.eth.block_number)
+                previous = self.head
+                self._emit_block(latest)  # Backfills logs of any skipped blocks
+                if self._log_filters and previous is not None and latest > previous:
+                    self._backfill_logs(latest, latest)
+            except Exception as e:
+                print(f"⚠️ [Blocks] Poll failed: {e}")
+            await asyncio.sleep(self.poll_seconds)
+
+
+class BalanceWatcher:
+    """ETH balances of the treasury accounts (relayer, Safe), refreshed once per block in one batch."""
+
+    def __init__(self, w3, accounts: Dict[str, str]):
+        self.w3 = w3
+        self.accounts = {label: address for label, address in accounts.items() if address}
+        self.balances: Dict[str, int] = {}
+        self.block: Optional[int] = None
+        self._lock = threading.Lock()
+
+    def watch(self, label: str, address: str):
+        """Adds or re-points an account (e.g. the relayer after a key rotation)."""
+        with self._lock:
+            if self.accounts.get(label) != address:
+                self.accounts = {**self.accounts, label: address}
+                self.balances.pop(label, None)
+
+    def refresh(self, block_number: int):
+        if not self.accounts:
+            return
+        accounts = self.accounts
+        labels = list(accounts)
+        calls = [("eth_getBalance", [accounts[label], hex(block_number)]) for label in labels]
+        provider = self.w3.provider
+        batch = getattr(provider, "make_batch_request", None)
+        responses = batch(calls) if batch is not None else [provider.make_request(m, p) for m, p in calls]
+        balances = {label: int(r["result"], 16) for label, r in zip(labels, responses) if r.get("result")}
+        with self._lock:
+            self.balances.update(balances)
+            self.block = block_number
+
+    def snapshot(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.balances)
+
+
+if __name__ == "__main__":
+    # Smoke test against a local node, e.g. `anvil --block-time 1`:
+    #   python -m execution_layer.block_stream ws://127.0.0.1:8545 http://127.0.0.1:8545
+    from web3 import Web3
+
+    ws_url = sys.argv[1] if len(sys.argv) > 1 else "ws://127.0.0.1:8545"
+    http_url = sys.argv[2] if len(sys.argv) > 2 else ws_url.replace("ws", "http", 1)
+    stream = BlockStream(ws_url, Web3(Web3.HTTPProvider(http_url)))
+    stream.on_block(lambda n: print(f"🧱 block {n}"))
+    stream.start()
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        stream.stop()
+        print(stream.stats)
@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Literal, Optional
+
+from instrumentation import REGISTRY
+
+
+@dataclass
+class TxOutcome:
+    tx_hash: str
+    status: Literal["CONFIRMED", "REVERTED", "REPLACED", "DROPPED"]
+    sender: str
+    nonce: int
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    latency_seconds: float = 0.0  # Broadcast -> resolved
+
+
+@dataclass
+class PendingTx:
+    tx_hash: str
+    sender: str
+    nonce: int
+    submitted_at: float  # time.monotonic()
+    future: Future = field(default_factory=Future)
+    callbacks: List[Callable[[TxOutcome], None]] = field(default_factory=list)
+
+
+def _hex_int(value) -> Optional[int]:
+    if value is None:
+        return None
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class ConfirmationTracker:
+    """
+    Watches broadcast transactions in the background so the submitter never
+    blocks on mining.
+
+    Once per new block it fetches the receipts of every pending transaction in
+    one JSON-RPC batch (one request per hash if the provider cannot batch), and
+    resolves each transaction's Future and callbacks with a TxOutcome:
+
+    - CONFIRMED / REVERTED: a receipt exists (status 1 / 0)
+    - REPLACED: no receipt, but the sender's mined nonce has moved past ours,
+      so another transaction took the slot (speed-up, cancel, ...). Confirmed by
+      asking one node for the nonce and the receipt in one batch, so a transaction
+      mined between two lookups (or seen by one pooled node and not another) is
+      not mistaken for a replaced one.
+    - DROPPED: no receipt, older than `drop_after_seconds` and the node no
+      longer knows the hash
+
+    Heads pushed by a BlockStream replace the eth_blockNumber check while they keep
+    coming; after `push_trust_seconds` without one the stream is presumed stalled
+    and the tracker polls again, so a dead websocket cannot freeze confirmations.
+    """
+
+    def __init__(self, w3, poll_interval_seconds: float = 1.0, drop_after_seconds: float = 300.0,
+                 on_resolved: Optional[Callable[[TxOutcome], None]] = None, push_trust_seconds: float = 60.0):
+        self.w3 = w3
+        self.poll_interval_seconds = poll_interval_seconds
+        self.drop_after_seconds = drop_after_seconds
+        self.push_trust_seconds = push_trust_seconds
+        self.on_resolved = on_resolved  # Called for every outcome (e.g. nonce bookkeeping)
+
+        self._pending: Dict[str, PendingTx] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_block: Optional[int] = None
+        self._pushed_block: Optional[int] = None  # Latest block from a BlockStream, if one feeds us
+        self._pushed_at: Optional[float] = None
+        self._recent: "OrderedDict[str, TxOutcome]" = OrderedDict()  # Last outcomes, for late add_callback()
+        self.resolved: Dict[str, int] = {}
+
+    # --- Registration ---
+    def track(self, tx_hash: str, sender: str, nonce: int) -> Future:
+        """Starts watching a broadcast transaction; the Future resolves to a TxOutcome."""
+        with self._lock:
+            pending = self._pending.get(tx_hash)
+            if pending is None:
+                pending = PendingTx(tx_hash, sender, nonce, time.monotonic())
+                self._pending[tx_hash] = pending
+        self.start()
+        return pending.future
+
+    def add_callback(self, tx_hash: str, callback: Callable[[TxOutcome], None]):
+        """Runs `callback(outcome)` when `tx_hash` resolves (right away if it already has)."""
+        with self._lock:
+            pending = self._pending.get(tx_hash)
+            if pending is not None:
+                pending.callbacks.append(callback)
+                return
+            outcome = self._recent.get(tx_hash)
+        if outcome is None:
+            print(f"⚠️ [Tracker] {tx_hash[:10]}… is not being tracked")
+            return
+        callback(outcome)
+
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    # --- Polling ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._loop, name="tx-tracker", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def notify_new_block(self, block_number: Optional[int] = None):
+        """Hook for a block subscription: poll right away, and skip the eth_blockNumber check."""
+        if block_number is not None:
+            self._pushed_block = block_number
+            self._pushed_at = time.monotonic()
+        self._wakeup.set()
+
+    def _head(self) -> int:
+        pushed, pushed_at = self._pushed_block, self._pushed_at
+        if pushed_at is not None and time.monotonic() - pushed_at < self.push_trust_seconds:
+            return pushed
+        polled = self.w3.eth.block_number  # No stream, or it has gone quiet
+        return polled if pushed is None else max(polled, pushed)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self._pending:
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"⚠️ [Tracker] Poll failed: {e}")
+            self._wakeup.wait(self.poll_interval_seconds)
+            self._wakeup.clear()
+
+    def poll_once(self):
+        with self._lock:
+            pending = list(self._pending.values())
+        if not pending:
+            return
+
+        # Receipts only change when a block is mined: one cheap call (or a pushed head) decides if we look
+        block = self._head()
+        if block == self._last_block and not any(self._is_stale(p) for p in pending):
+            return
+        self._last_block = block
+
+        receipts = self._call_many("eth_getTransactionReceipt", [[p.tx_hash] for p in pending])
+        unresolved = [tx for tx, receipt in zip(pending, receipts) if not self._resolve_receipt(tx, receipt)]
+        if unresolved:
+            self._detect_replaced_or_dropped(unresolved)
+
+    def _resolve_receipt(self, tx: PendingTx, receipt: Optional[dict]) -> bool:
+        if not receipt:
+            return False
+        status = "CONFIRMED" if _hex_int(receipt.get("status")) == 1 else "REVERTED"
+        self._resolve(tx, status, _hex_int(receipt.get("blockNumber")), _hex_int(receipt.get("gasUsed")))
+        return True
+
+    def _is_stale(self, tx: PendingTx) -> bool:
+        return time.monotonic() - tx.submitted_at >= self.drop_after_seconds
+
+    def _detect_replaced_or_dropped(self, unresolved: List[PendingTx]):
+        senders = sorted({tx.sender for tx in unresolved})
+        mined = self._call_many("eth_getTransactionCount", [[s, "latest"] for s in senders])
+        mined_nonce = {s: _hex_int(n) for s, n in zip(senders, mined)}
+
+        stale, slot_used = [], []
+        for tx in unresolved:
+            if mined_nonce.get(tx.sender) is not None and mined_nonce[tx.sender] > tx.nonce:
+                slot_used.append(tx)
+            elif self._is_stale(tx):
+                stale.append(tx)
+        if slot_used:
+            self._confirm_replaced(slot_used)
+        if stale:
+            known = self._call_many("eth_getTransactionByHash", [[tx.tx_hash] for tx in stale])
+            for tx, found in zip(stale, known):
+                if not found:
+                    self._resolve(tx, "DROPPED")
+
+    def _confirm_replaced(self, txs: List[PendingTx]):
+        """
+        The nonce says the slot is used, but the receipt lookup came first (and maybe from
+        another node): ask one node for the nonce, then the receipt, in one batch.
+        """
+        senders = sorted({tx.sender for tx in txs})
+        calls = [("eth_getTransactionCount", [s, "latest"]) for s in senders]
+        calls += [("eth_getTransactionReceipt", [tx.tx_hash]) for tx in txs]
+        results = self._call_batch(calls)
+        mined_nonce = {s: _hex_int(n) for s, n in zip(senders, results)}
+        for tx, receipt in zip(txs, results[len(senders):]):
+            if self._resolve_receipt(tx, receipt):
+                continue  # Mined after all
+            if mined_nonce.get(tx.sender) is not None and mined_nonce[tx.sender] > tx.nonce:
+                self._resolve(tx, "REPLACED")
+
+    def _call_many(self, method: str, params_list: List[list]) -> List[Optional[dict]]:
+        """Same method for many params: one batch request if the provider supports it."""
+        return self._call_batch([(method, params) for params in params_list])
+
+    def _call_batch(self, calls: List[tuple]) -> List[Optional[dict]]:
+        """One batch request (one endpoint, in order) if the provider supports it."""
+        provider = self.w3.provider
+        batch = getattr(provider, "make_batch_request", None)
+        if batch is not None and len(calls) > 1:
+            try:
+                responses = batch(calls)
+                if isinstance(responses, list):
+                    return [r.get("result") for r in responses]
+            except Exception as e:
+                print(f"⚠️ [Tracker] Batch {calls[0][0]} failed ({e}), falling back to single calls")
+        return [provider.make_request(method, params).get("result") for method, params in calls]
+
+    def _resolve(self, tx: PendingTx, status: str, block_number: Optional[int] = None,
+                 gas_used: Optional[int] = None):
+        outcome = TxOutcome(tx.tx_hash, status, tx.sender, tx.nonce, block_number, gas_used,
+                            time.monotonic() - tx.submitted_at)
+        with self._lock:
+            if self._pending.pop(tx.tx_hash, None) is None:
+                return
+            callbacks = list(tx.callbacks)
+            self.resolved[status] = self.resolved.get(status, 0) + 1
+            self._recent[tx.tx_hash] = outcome
+            if len(self._recent) > 256:
+                self._recent.popitem(last=False)
+        REGISTRY.inc("tx_outcomes_total", status=status.lower())
+        REGISTRY.observe("tx_confirmation_seconds", outcome.latency_seconds)
+        icon = "✅" if status == "CONFIRMED" else "⚠️"
+        gas = f", gas {gas_used}" if gas_used is not None else ""
+        print(f"    {icon} [Tracker] {tx.tx_hash[:10]}… {status} in {outcome.latency_seconds:.1f}s{gas}")
+
+        for callback in ([self.on_resolved] if self.on_resolved else []) + callbacks:
+            try:
+                callback(outcome)
+            except Exception as e:
+                print(f"❌ [Tracker] Callback failed for {tx.tx_hash[:10]}…: {e}")
+        tx.future.set_result(outcome)
@@ -0,0 +1,173 @@
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from deadlines import DeadlineExceeded
+
+GWEI = 10 ** 9
+
+
+def _to_int(value) -> int:
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+class FeeOracle:
+    """
+    EIP-1559 fees and gas limits with as few RPC round trips as possible.
+
+    Fees: one `eth_feeHistory` call per block, cached until the head moves.
+        maxPriorityFeePerGas = median over the last `history_blocks` of the
+                               `priority_percentile`-th tip paid in each block
+        maxFeePerGas         = base_fee_multiplier * next base fee + priority
+      (2x base fee survives ~6 consecutive full blocks before the tx is underpriced.)
+      Chains without EIP-1559 fall back to a cached legacy `gasPrice`.
+
+    Gas: `eth_estimateGas` once per calldata shape (to, selector, length, value),
+    padded by `gas_limit_margin`, then served from a bounded cache. Targets whose
+    cost depends on state rather than shape (`skip_gas_cache`) are estimated every time.
+
+    RPCs run outside the lock, so a pushed block is never held up by a fetch.
+    """
+
+    def __init__(self, w3, priority_percentile: float = 50.0, history_blocks: int = 10,
+                 base_fee_multiplier: float = 2.0, min_priority_fee_wei: int = GWEI // 100,
+                 gas_limit_margin: float = 1.2, head_poll_seconds: float = 1.0, gas_cache_size: int = 256,
+                 push_trust_seconds: float = 60.0):
+        self.w3 = w3
+        self.priority_percentile = priority_percentile
+        self.history_blocks = history_blocks
+        self.base_fee_multiplier = base_fee_multiplier
+        self.min_priority_fee_wei = min_priority_fee_wei
+        self.gas_limit_margin = gas_limit_margin
+        self.head_poll_seconds = head_poll_seconds
+        self.gas_cache_size = gas_cache_size
+        self.push_trust_seconds = push_trust_seconds
+
+        self._lock = threading.Lock()
+        self._head: Optional[int] = None
+        self._head_checked_at = 0.0
+        self._head_pushed_at: Optional[float] = None
+        self._fees: Optional[Dict[str, int]] = None
+        self._fees_block: Optional[int] = None
+        self._gas_cache: "OrderedDict[Tuple, int]" = OrderedDict()
+        self._uncached_targets: Set[str] = set()
+        self.stats = {"fee_hits": 0, "fee_refreshes": 0, "gas_hits": 0, "gas_estimates": 0}
+
+    # --- Chain head ---
+    def notify_new_block(self, block_number: int):
+        """Hook for a block subscription: the head is then known without polling."""
+        with self._lock:
+            self._head = block_number
+            self._head_checked_at = self._head_pushed_at = time.monotonic()
+
+    def head(self) -> int:
+        """Latest block number (shared with the simulator, so they agree on "latest")."""
+        with self._lock:
+            head = self._known_head()
+        if head is not None:
+            return head
+        head = self.w3.eth.block_number
+        with self._lock:
+            # A block pushed while we were asking may already be newer
+            self._head = head if self._head is None else max(self._head, head)
+            self._head_checked_at = time.monotonic()
+            return self._head
+
+    def _known_head(self) -> Optional[int]:
+        # Pushed heads are trusted while the stream is alive (`push_trust_seconds` without a block
+        # means it is not); otherwise at most one eth_blockNumber per `head_poll_seconds`
+        now = time.monotonic()
+        if self._head_pushed_at is not None and now - self._head_pushed_at < self.push_trust_seconds:
+            return self._head
+        if self._head is not None and now - self._head_checked_at < self.head_poll_seconds:
+            return self._head
+        return None
+
+    # --- Fees ---
+    def fees(self) -> Dict[str, int]:
+        """Fee fields to merge into a transaction dict."""
+        head = self.head()
+        with self._lock:
+            if self._fees is not None and self._fees_block == head:
+                self.stats["fee_hits"] += 1
+                return dict(self._fees)
+        fees = self._fetch_fees()
+        with self._lock:
+            if self._fees_block is None or head >= self._fees_block:
+                self._fees, self._fees_block = fees, head
+            self.stats["fee_refreshes"] += 1
+        return dict(fees)
+
+    @staticmethod
+    def replacement_fees(fees: Dict[str, int], previous: Dict[str, int], bump: float = 1.125) -> Dict[str, int]:
+        """`fees` raised so a transaction can replace one sent with `previous` at the same nonce
+        (nodes only accept a replacement whose every fee field is at least 10% higher)."""
+        fees = dict(fees)
+        for key, old in previous.items():
+            if key in fees:
+                fees[key] = max(fees[key], int(old * bump) + 1)
+        return fees
+
+    def _fetch_fees(self) -> Dict[str, int]:
+        try:
+            history = self.w3.eth.fee_history(self.history_blocks, "latest", [self.priority_percentile])
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"    ⚠️ [Fees] eth_feeHistory unavailable ({e}), using legacy gasPrice")
+            return {"gasPrice": self.w3.eth.gas_price}
+
+        base_fees = history.get("baseFeePerGas") or []
+        if not base_fees or not _to_int(base_fees[-1]):
+            return {"gasPrice": self.w3.eth.gas_price}  # Pre-London chain
+
+        # The last entry is the base fee of the block after the newest one in the window
+        next_base_fee = _to_int(base_fees[-1])
+        tips = [_to_int(block[0]) for block in (history.get("reward") or []) if block and _to_int(block[0])]
+        priority = int(statistics.median(tips)) if tips else self.min_priority_fee_wei
+        priority = max(priority, self.min_priority_fee_wei)
+        return {
+            "maxPriorityFeePerGas": priority,
+            "maxFeePerGas": int(next_base_fee * self.base_fee_multiplier) + priority,
+        }
+
+    # --- Gas limits ---
+    @staticmethod
+    def _shape(tx: dict) -> Tuple:
+        data = tx.get("data") or "0x"
+        if isinstance(data, (bytes, bytearray)):
+            data = "0x" + data.hex()
+        return (str(tx.get("to", "")).lower(), data[:10], len(data), bool(tx.get("value")))
+
+    def skip_gas_cache(self, *addresses: Optional[str]):
+        """
+        Always estimate calls to these addresses. Same-shape calls can differ a lot in gas
+        there: Treasury.swap opening a position writes fresh slots where a sell does not,
+        and a Safe or BatchExecutor call costs whatever the call it wraps costs.
+        """
+        with self._lock:
+            self._uncached_targets.update(a.lower() for a in addresses if a)
+
+    def estimate_gas(self, tx: dict) -> int:
+        """Gas limit for `tx`, estimated once per calldata shape."""
+        key = self._shape(tx)
+        with self._lock:
+            cacheable = key[0] not in self._uncached_targets
+            cached = self._gas_cache.get(key) if cacheable else None
+            if cached is not None:
+                self._gas_cache.move_to_end(key)
+                self.stats["gas_hits"] += 1
+                return cached
+
+        call = {k: tx[k] for k in ("from", "to", "data", "value") if k in tx}
+        limit = int(self.w3.eth.estimate_gas(call) * self.gas_limit_margin)
+        with self._lock:
+            self.stats["gas_estimates"] += 1
+            if not cacheable:
+                return limit
+            self._gas_cache[key] = limit
+            if len(self._gas_cache) > self.gas_cache_size:
+                self._gas_cache.popitem(last=False)
+        return limit
@@ -1,50 +1,147 @@
-import os
-from dotenv import load_dotenv
-from eth_account import Account
-from typing import Optional
-
-# Load environment variables from .env file
-load_dotenv()
-
-class KeyVault:
-    """
-    Securely manages access to the Agents' private keys.
-    """
-    
-    def __init__(self):
-        # We map the internal Agent Names to the Environment Variable keys
-        self.agent_map = {
-            "Warren (The Boomer)": "PRIVATE_KEY_AGENT_A_BOOMER",
-            "Chad (The Degen)": "PRIVATE_KEY_AGENT_B_DEGEN",
-            "Atlas (The Quant)": "PRIVATE_KEY_AGENT_C_QUANT"
-        }
-
-    def get_agent_account(self, agent_name: str) -> Optional[Account]:
-        """
-        Retrieves the web3.py Account object for a specific agent.
-        """
-        env_var_name = self.agent_map.get(agent_name)
-        
-        if not env_var_name:
-            print(f"❌ Error: No key mapping found for agent '{agent_name}'")
-            return None
-            
-        private_key = os.getenv(env_var_name)
-        
-        if not private_key:
-            print(f"❌ Error: Environment variable {env_var_name} is empty!")
-            return None
-            
-        try:
-            # Create the local account object (does not connect to network yet)
-            return Account.from_key(private_key)
-        except Exception as e:
-            print(f"❌ Error loading key for {agent_name}: {e}")
-            return None
-
-    def get_public_address(self, agent_name: str) -> str:
-        """Helper to just get the public address (safe to share)"""
-        account = self.get_agent_account(agent_name)
-        if account:
-            return account.address
-        return "Unknown"
\ No newline at end of file
+import os
+import json
+import threading
+from dotenv import dotenv_values, load_dotenv
+from eth_account import Account
+from typing import Dict, Optional
+
+# What load_dotenv() below may copy into os.environ, to tell those values from real environment ones
+_DOTENV_AT_IMPORT = dotenv_values()
+# Load environment variables from .env file
+load_dotenv()
+
+class KeyVault:
+    """
+    Securely manages access to the Agents' private keys.
+
+    Every agent's account is derived once, when the vault is created, and then
+    served from memory. A key comes from an encrypted keystore file if
+    KEYSTORE_DIR holds one for that agent (unlocked once with KEYSTORE_PASSWORD),
+    otherwise from its environment variable. `rotate()` swaps one agent's key,
+    `reload()` re-reads every source.
+
+    Key settings (the agent key variables, KEYSTORE_DIR, KEYSTORE_PASSWORD) follow
+    load_dotenv's rule: a value set in the real process environment (e.g. injected at
+    deploy time) always wins. Otherwise the current .env file is read, so a key changed
+    there is picked up by a reload even though load_dotenv copied the old one into
+    os.environ at startup. The process environment is never modified.
+    """
+
+    def __init__(self, keystore_dir: Optional[str] = None, keystore_password: Optional[str] = None):
+        # We map the internal Agent Names to the Environment Variable keys
+        self.agent_map = {
+            "Warren (The Boomer)": "PRIVATE_KEY_AGENT_A_BOOMER",
+            "Chad (The Degen)": "PRIVATE_KEY_AGENT_B_DEGEN",
+            "Atlas (The Quant)": "PRIVATE_KEY_AGENT_C_QUANT"
+        }
+        self.keystore_dir = keystore_dir
+        self.keystore_password = keystore_password
+        self._accounts: Dict[str, Account] = {}
+        self._errors: Dict[str, str] = {}  # Why an agent has no account, reported on lookup
+        self._lock = threading.Lock()
+        self._dotenv: Dict[str, Optional[str]] = {}
+        self.reload()
+
+    # --- Loading ---
+    def _setting(self, name: str) -> Optional[str]:
+        value = os.getenv(name)
+        if value is not None and value != _DOTENV_AT_IMPORT.get(name):
+            return value  # From the real environment, not copied from .env
+        return self._dotenv.get(name) or value
+
+    def _keystore_path(self, full_name: str) -> Optional[str]:
+        """<KEYSTORE_DIR>/<ENV_VAR>.json, e.g. keystores/PRIVATE_KEY_AGENT_B_DEGEN.json"""
+        directory = self.keystore_dir or self._setting("KEYSTORE_DIR")
+        if not directory:
+            return None
+        path = os.path.join(directory, f"{self.agent_map[full_name]}.json")
+        return path if os.path.exists(path) else None
+
+    def _load_account(self, full_name: str) -> Account:
+        """Derives one agent's account from its keystore or env var. Raises ValueError if neither works."""
+        path = self._keystore_path(full_name)
+        if path:
+            password = self.keystore_password or self._setting("KEYSTORE_PASSWORD")
+            if password is None:
+                raise ValueError(f"keystore {path} found but KEYSTORE_PASSWORD is not set")
+            with open(path, encoding="utf-8") as f:
+                keystore = json.load(f)
+            # The expensive part (scrypt/pbkdf2): done here once, never per signature
+            return Account.from_key(Account.decrypt(keystore, password))
+
+        env_var_name = self.agent_map[full_name]
+        private_key = self._setting(env_var_name)
+        if not private_key:
+            raise ValueError(f"Environment variable {env_var_name} is empty!")
+        # Create the local account object (does not connect to network yet)
+        return Account.from_key(private_key)
+
+    def reload(self):
+        """Re-reads .env and the keystores and re-derives every agent's account."""
+        self._dotenv = dotenv_values()
+        accounts, errors = {}, {}
+        for full_name in self.agent_map:
+            try:
+                accounts[full_name] = self._load_account(full_name)
+            except Exception as e:
+                errors[full_name] = str(e)
+                print(f"❌ Error loading key for {full_name}: {e}")
+        # Swapped in one step, so readers see either the old set or the new one
+        with self._lock:
+            self._accounts, self._errors = accounts, errors
+
+    def rotate(self, agent_name: str, private_key: Optional[str] = None) -> Optional[str]:
+        """
+        Replaces one agent's account: with `private_key` if given, otherwise by
+        re-reading its keystore / env var. Returns the new address, or None (the
+        old account is kept) if the new key cannot be loaded.
+        """
+        full_name = self.resolve_name(agent_name)
+        if not full_name:
+            print(f"❌ Error: No key mapping found for agent '{agent_name}'")
+            return None
+        try:
+            account = Account.from_key(private_key) if private_key else self._load_account(full_name)
+        except Exception as e:
+            print(f"❌ Error rotating key for {full_name}: {e}")
+            return None
+        with self._lock:
+            self._accounts[full_name] = account
+            self._errors.pop(full_name, None)
+        print(f"🔑 [KeyVault] Rotated {full_name} -> {account.address}")
+        return account.address
+
+    # --- Lookups ---
+    def resolve_name(self, agent_name: str) -> Optional[str]:
+        """
+        Maps a short name as used by the AI Brain ("Chad") to its full agent name
+        ("Chad (The Degen)"). Full names are returned as they are.
+        """
+        if agent_name in self.agent_map:
+            return agent_name
+        for full_name in self.agent_map:
+            if full_name.split(" (")[0].lower() == agent_name.strip().lower():
+                return full_name
+        return None
+
+    def get_agent_account(self, agent_name: str) -> Optional[Account]:
+        """
+        Retrieves the web3.py Account object for a specific agent (from the cache).
+        """
+        full_name = self.resolve_name(agent_name)
+
+        if not full_name:
+            print(f"❌ Error: No key mapping found for agent '{agent_name}'")
+            return None
+
+        account = self._accounts.get(full_name)
+        if account is None:
+            print(f"❌ Error: No key loaded for {full_name}: {self._errors.get(full_name, 'unknown')}")
+        return account
+
+    def get_public_address(self, agent_name: str) -> str:
+        """Helper to just get the public address (safe to share)"""
+        account = self.get_agent_account(agent_name)
+        if account:
+            return account.address
+        return "Unknown"
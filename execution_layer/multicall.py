@@ -0,0 +1,137 @@
+import threading
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+from deadlines import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from execution_layer.abi_registry import ABIS
+
+EXECUTE = "execute((address,uint256,bytes)[])"
+
+
+@dataclass(frozen=True)
+class Call:
+    target: str
+    data: bytes
+    value: int = 0
+
+
+def encode_execute(calls: List[Call]) -> str:
+    """Calldata for BatchExecutor.execute(calls)."""
+    return ABIS.calldata("BatchExecutor", EXECUTE, [(c.target, c.value, c.data) for c in calls])
+
+
+@dataclass
+class _Pending:
+    call: Call
+    deadline: Deadline  # When the caller stops waiting: its cycle deadline, or the batcher's own cap
+    cycle_deadline: Optional[Deadline] = None
+    context: Any = None
+    future: Future = field(default_factory=Future)
+
+    def fail(self, error: Exception):
+        if isinstance(error, DeadlineExceeded) and not (self.cycle_deadline and self.cycle_deadline.expired):
+            # Only the batcher's cap ran out (or another caller's budget): a plain failure for this cycle
+            error = TimeoutError(f"multicall batch broadcast: {error}")
+        self.future.set_exception(error)
+
+
+# flush_fn(group, calls, contexts) -> tx hash or None
+FlushFn = Callable[[Hashable, List[Call], List[Any]], Optional[str]]
+
+
+class MulticallBatcher:
+    """
+    Coalesces the calls of concurrent cycles into one BatchExecutor transaction.
+
+    The first call of a group opens a `window_seconds` window; every call that
+    arrives in that window (up to `max_calls`) goes out with it, so a rebalance
+    across many tickers pays one base fee, one nonce and - in "safe" mode - one
+    set of signatures. Calls are grouped by `group` (e.g. the voter set that
+    must sign them). Every caller gets the shared tx hash back.
+
+    The flush runs under the earliest deadline among the queued callers (each
+    cycle's budget, capped at `window_seconds + wait_timeout_seconds`), so a batch
+    is never broadcast after a caller has given up on it; callers that are
+    already out of time when the window closes are left out of the batch.
+    Waiting only pays off when several ACT callers run at once - with a single
+    ACT worker, send directly instead.
+    """
+
+    def __init__(self, flush_fn: FlushFn, window_seconds: float = 2.0, max_calls: int = 32,
+                 wait_timeout_seconds: float = 60.0, grace_seconds: float = 5.0):
+        self.flush_fn = flush_fn
+        self.window_seconds = window_seconds
+        self.max_calls = max_calls
+        self.wait_timeout_seconds = wait_timeout_seconds
+        self.grace_seconds = grace_seconds  # For a broadcast that completes right at the deadline
+
+        self._lock = threading.Lock()
+        self._groups: Dict[Hashable, List[_Pending]] = {}
+        self._timers: Dict[Hashable, threading.Timer] = {}
+        self.stats = {"batches": 0, "calls": 0}
+
+    def submit(self, call: Call, group: Hashable = (), context: Any = None) -> Optional[str]:
+        """Queues `call` and blocks until its batch is broadcast; returns the batch's tx hash (or None)."""
+        pending = self._pending(call, context)
+        self._enqueue(group, pending)
+        try:
+            # The flush is bounded by this deadline too; the grace lets a hash that was sent in time arrive
+            return pending.future.result(timeout=pending.deadline.remaining() + self.grace_seconds)
+        except FutureTimeout:
+            if pending.future.done():
+                raise  # The flush's own TimeoutError (the same class since Python 3.11)
+            if pending.cycle_deadline is not None and pending.cycle_deadline.expired:
+                raise DeadlineExceeded("multicall batch broadcast did not return before the cycle budget ran out") from None
+            raise TimeoutError("multicall batch broadcast did not return in time") from None
+
+    def enqueue(self, call: Call, group: Hashable = (), context: Any = None) -> Future:
+        """Queues `call` without waiting; the Future resolves to the batch's tx hash."""
+        pending = self._pending(call, context)
+        self._enqueue(group, pending)
+        return pending.future
+
+    def _pending(self, call: Call, context: Any) -> _Pending:
+        cycle_deadline = current_deadline()
+        deadline = Deadline(self.window_seconds + self.wait_timeout_seconds)
+        if cycle_deadline is not None and cycle_deadline.expires_at < deadline.expires_at:
+            deadline = cycle_deadline
+        return _Pending(call, deadline, cycle_deadline, context)
+
+    def _enqueue(self, group: Hashable, pending: _Pending):
+        with self._lock:
+            batch = self._groups.setdefault(group, [])
+            batch.append(pending)
+            full = len(batch) >= self.max_calls
+            if len(batch) == 1 and not full:
+                timer = self._timers[group] = threading.Timer(self.window_seconds, self.flush, args=(group,))
+                timer.daemon = True
+                timer.start()
+        if full:
+            self.flush(group)
+
+    def flush(self, group: Hashable = ()):
+        """Sends whatever is queued for `group` now (the window timer lands here too)."""
+        with self._lock:
+            batch = self._groups.pop(group, [])
+            timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()  # A batch that filled up goes before its window ends
+        expired = [p for p in batch if p.deadline.expired]
+        batch = [p for p in batch if not p.deadline.expired]
+        for p in expired:
+            p.fail(DeadlineExceeded("out of time before the multicall window closed"))
+        if not batch:
+            return
+        try:
+            with deadline_scope(min((p.deadline for p in batch), key=lambda d: d.expires_at)):
+                tx_hash = self.flush_fn(group, [p.call for p in batch], [p.context for p in batch])
+        except Exception as e:
+            for p in batch:
+                p.fail(e)
+            return
+        with self._lock:
+            self.stats["batches"] += 1
+            self.stats["calls"] += len(batch)
+        for p in batch:
+            p.future.set_result(tx_hash)
@@ -0,0 +1,94 @@
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from eth_abi import encode as abi_encode
+from eth_utils import keccak, to_checksum_address
+
+from execution_layer.abi_registry import ABIS
+from execution_layer.key_management import KeyVault
+
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+# Safe (>= 1.3.0) EIP-712 types
+DOMAIN_TYPEHASH = keccak(text="EIP712Domain(uint256 chainId,address verifyingContract)")
+SAFE_TX_TYPEHASH = keccak(
+    text="SafeTx(address to,uint256 value,bytes data,uint8 operation,uint256 safeTxGas,"
+         "uint256 baseGas,uint256 gasPrice,address gasToken,address refundReceiver,uint256 nonce)"
+)
+EXEC_TRANSACTION = "execTransaction(address,uint256,bytes,uint8,uint256,uint256,uint256,address,address,bytes)"
+
+
+@dataclass
+class SafeTx:
+    to: str
+    data: bytes = b""
+    value: int = 0
+    operation: int = 0  # 0 = CALL, 1 = DELEGATECALL
+    safe_tx_gas: int = 0
+    base_gas: int = 0
+    gas_price: int = 0
+    gas_token: str = ZERO_ADDRESS
+    refund_receiver: str = ZERO_ADDRESS
+    nonce: int = 0  # The Safe's own nonce, not the relayer's
+
+
+@lru_cache(maxsize=16)
+def domain_separator(chain_id: int, safe_address: str) -> bytes:
+    return keccak(abi_encode(["bytes32", "uint256", "address"], [DOMAIN_TYPEHASH, chain_id, safe_address]))
+
+
+def safe_tx_hash(tx: SafeTx, chain_id: int, safe_address: str) -> bytes:
+    """The EIP-712 digest every owner signs (what Safe.getTransactionHash returns)."""
+    struct_hash = keccak(abi_encode(
+        ["bytes32", "address", "uint256", "bytes32", "uint8", "uint256", "uint256", "uint256", "address", "address", "uint256"],
+        [SAFE_TX_TYPEHASH, tx.to, tx.value, keccak(tx.data), tx.operation, tx.safe_tx_gas,
+         tx.base_gas, tx.gas_price, tx.gas_token, tx.refund_receiver, tx.nonce],
+    ))
+    return keccak(b"\x19\x01" + domain_separator(chain_id, safe_address) + struct_hash)
+
+
+def sign_digest(account, digest: bytes) -> bytes:
+    """65-byte r || s || v signature of a raw digest (no eth_sign prefix), as Safe expects for v = 27/28."""
+    sign = getattr(account, "unsafe_sign_hash", None) or account.signHash  # eth_account >= 0.13 / older
+    signed = sign(digest)
+    return signed.r.to_bytes(32, "big") + signed.s.to_bytes(32, "big") + bytes([signed.v])
+
+
+def pack_signatures(signatures: Dict[str, bytes]) -> bytes:
+    """Concatenates signatures ordered by signer address, ascending (Safe rejects any other order)."""
+    return b"".join(signatures[owner] for owner in sorted(signatures, key=lambda a: int(a, 16)))
+
+
+class MultisigSigner:
+    """
+    Collects Safe signatures from the YEA voters' KeyVault accounts.
+
+    The EIP-712 hash is computed once per transaction and handed to every signer,
+    and the signers run in parallel, so a 2-of-3 costs one hash and the slowest
+    signature instead of N of each.
+    """
+
+    def __init__(self, vault: KeyVault, max_workers: int = 3):
+        self.vault = vault
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="signer")
+
+    def collect(self, digest: bytes, voter_names: List[str]) -> Dict[str, Tuple[str, bytes]]:
+        """voter name -> (owner address, signature). Voters without a usable key are skipped."""
+        accounts = {}
+        for name in voter_names:
+            account = self.vault.get_agent_account(name)
+            if account is not None:
+                accounts[name] = account
+
+        signed = self._pool.map(lambda item: (item[0], item[1].address, sign_digest(item[1], digest)), accounts.items())
+        return {name: (address, signature) for name, address, signature in signed}
+
+    @staticmethod
+    def exec_transaction_calldata(tx: SafeTx, packed_signatures: bytes) -> str:
+        return ABIS.calldata(
+            "Safe", EXEC_TRANSACTION,
+            to_checksum_address(tx.to), tx.value, tx.data, tx.operation, tx.safe_tx_gas, tx.base_gas,
+            tx.gas_price, tx.gas_token, tx.refund_receiver, packed_signatures,
+        )
@@ -0,0 +1,105 @@
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Set
+
+# Node error messages that mean our local view of the nonce sequence is wrong
+NONCE_ERRORS = (
+    "nonce too low",
+    "nonce too high",
+    "already known",
+    "replacement transaction underpriced",
+    "known transaction",
+    "invalid nonce",
+)
+
+
+def is_nonce_error(error: Exception) -> bool:
+    message = str(error).lower()
+    return any(marker in message for marker in NONCE_ERRORS)
+
+
+@dataclass
+class SignerNonces:
+    next_nonce: Optional[int] = None             # None = not synced with the chain yet
+    in_flight: Set[int] = field(default_factory=set)  # Allocated, not yet confirmed or released
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+    resyncs: int = 0
+
+
+class NonceManager:
+    """
+    Hands out nonces per signer from memory instead of asking the node for every
+    transaction, so several transactions can be in flight at once.
+
+    - `allocate(address)` is atomic per signer (one lock each, signers don't contend).
+    - A nonce that was never broadcast is given back with `release()`; if it was
+      the newest one it is reused, otherwise the sequence has a hole and the next
+      allocation resyncs from the node's "pending" count.
+    - Node errors like "nonce too low" / "already known" also force a resync.
+    - The sequence is never restored from a checkpoint: after a restart the first
+      allocation syncs from the node, which knows what was mined or dropped meanwhile.
+    """
+
+    def __init__(self, w3):
+        self.w3 = w3
+        self._signers: Dict[str, SignerNonces] = {}
+        self._lock = threading.Lock()
+
+    def _signer(self, address: str) -> SignerNonces:
+        signer = self._signers.get(address)
+        if signer is None:
+            with self._lock:
+                signer = self._signers.setdefault(address, SignerNonces())
+        return signer
+
+    def _sync(self, address: str, signer: SignerNonces):
+        # "pending" counts transactions already in the mempool, not just mined ones
+        chain_nonce = self.w3.eth.get_transaction_count(address, "pending")
+        if signer.next_nonce is not None and chain_nonce != signer.next_nonce:
+            print(f"    🔁 [Nonce] {address[:10]}… resynced {signer.next_nonce} -> {chain_nonce}")
+        signer.next_nonce = chain_nonce
+        signer.in_flight = {n for n in signer.in_flight if n >= chain_nonce}
+        signer.resyncs += 1
+
+    def allocate(self, address: str) -> int:
+        signer = self._signer(address)
+        with signer.lock:
+            if signer.next_nonce is None:
+                self._sync(address, signer)
+            nonce = signer.next_nonce
+            signer.next_nonce += 1
+            signer.in_flight.add(nonce)
+            return nonce
+
+    def release(self, address: str, nonce: int, error: Optional[Exception] = None):
+        """Gives back a nonce whose transaction was never broadcast (or was rejected)."""
+        signer = self._signer(address)
+        with signer.lock:
+            signer.in_flight.discard(nonce)
+            if error is not None and is_nonce_error(error):
+                signer.next_nonce = None  # Our sequence is off: resync on next allocate
+            elif signer.next_nonce == nonce + 1:
+                signer.next_nonce = nonce  # Newest nonce: simply reuse it
+            else:
+                signer.next_nonce = None  # A hole below in-flight nonces: let the node decide
+
+    def confirm(self, address: str, nonce: int):
+        """The transaction using `nonce` was mined (or replaced): stop tracking it."""
+        signer = self._signer(address)
+        with signer.lock:
+            signer.in_flight.discard(nonce)
+
+    def invalidate(self, address: str, nonce: int):
+        """The transaction using `nonce` was dropped: its slot is free again, so resync on next allocate."""
+        signer = self._signer(address)
+        with signer.lock:
+            signer.in_flight.discard(nonce)
+            signer.next_nonce = None
+
+    def resync(self, address: str):
+        signer = self._signer(address)
+        with signer.lock:
+            self._sync(address, signer)
+
+    def in_flight(self, address: str) -> int:
+        return len(self._signer(address).in_flight)
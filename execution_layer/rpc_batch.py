@@ -0,0 +1,169 @@
+import itertools
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import Web3
+
+from instrumentation import REGISTRY, timed
+from deadlines import io_timeout, timeout_error, wait_for
+
+
+class RPCError(Exception):
+    def __init__(self, method: str, error: dict):
+        self.method = method
+        self.code = error.get("code")
+        super().__init__(f"{method}: {error.get('message', error)}")
+
+
+class BatchingRPCClient:
+    """
+    JSON-RPC over one pooled keep-alive `requests.Session`, with concurrent calls
+    coalesced into batch requests (one HTTP round trip for many calls).
+
+    Callers block on their own Future; a dispatcher thread waits up to
+    `linger_seconds` for more calls to arrive, then sends up to `max_batch`
+    of them as one JSON array. Up to `max_in_flight` batches can be on the wire
+    at once, so a slow batch does not hold up the next one.
+    """
+
+    def __init__(self, url: str, max_batch: int = 50, linger_seconds: float = 0.002,
+                 timeout_seconds: float = 10.0, max_in_flight: int = 4, pool_size: int = 8):
+        self.url = url
+        self.max_batch = max_batch
+        self.linger_seconds = linger_seconds
+        self.timeout_seconds = timeout_seconds
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({"Content-Type": "application/json"})
+
+        self._ids = itertools.count(1)
+        self._queue: "queue.Queue[Tuple[dict, Future]]" = queue.Queue()
+        self._senders = ThreadPoolExecutor(max_workers=max_in_flight, thread_name_prefix="rpc-batch")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="rpc-dispatch", daemon=True)
+        self._dispatcher.start()
+
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.calls = 0
+        self.method_stats: Dict[str, Dict[str, float]] = {}
+
+    # --- Public API ---
+    def request(self, method: str, params: Any) -> dict:
+        """Raw JSON-RPC response ({"result": ...} or {"error": ...}) for one call."""
+        return wait_for(self.submit(method, params), self.timeout_seconds, f"RPC {method}")
+
+    def call(self, method: str, params: Any = None) -> Any:
+        response = self.request(method, params or [])
+        if "error" in response:
+            raise RPCError(method, response["error"])
+        return response.get("result")
+
+    def submit(self, method: str, params: Any) -> Future:
+        payload = {"jsonrpc": "2.0", "id": next(self._ids), "method": method, "params": params}
+        future = Future()
+        future.method = method
+        future.queued_at = time.perf_counter()
+        self._queue.put((payload, future))
+        return future
+
+    def request_many(self, calls: List[Tuple[str, Any]]) -> List[dict]:
+        """Sends `calls` together right away (one batch per `max_batch`), responses in order."""
+        futures = [self.submit(method, params) for method, params in calls]
+        timeout = io_timeout(self.timeout_seconds)
+        deadline = time.monotonic() + timeout
+        try:
+            return [f.result(timeout=max(0.0, deadline - time.monotonic())) for f in futures]
+        except FutureTimeout:
+            raise timeout_error(f"RPC batch of {len(calls)} calls", timeout, self.timeout_seconds) from None
+
+    # --- Dispatching ---
+    def _dispatch_loop(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.perf_counter() + self.linger_seconds
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.perf_counter()
+                try:
+                    batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._senders.submit(self._send, batch)
+
+    def _send(self, batch: List[Tuple[dict, Future]]):
+        payloads = [payload for payload, _ in batch]
+        by_id = {payload["id"]: future for payload, future in batch}
+        try:
+            # A single call goes out as a plain object; some nodes handle that faster
+            body = payloads[0] if len(payloads) == 1 else payloads
+            with timed("external_call_seconds", service="rpc", call="batch" if len(payloads) > 1 else payloads[0]["method"]):
+                response = self.session.post(self.url, json=body, timeout=self.timeout_seconds)
+            response.raise_for_status()
+            results = response.json()
+            if isinstance(results, dict):
+                results = [results]
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+
+        with self._lock:
+            self.batches += 1
+            self.calls += len(batch)
+        REGISTRY.inc("rpc_batches_total")
+        REGISTRY.inc("rpc_batched_calls_total", len(batch))
+
+        done = time.perf_counter()
+        for result in results:
+            future = by_id.pop(result.get("id"), None)
+            if future is None:
+                continue
+            self._record(future.method, done - future.queued_at, "error" in result)
+            future.set_result(result)
+        for future in by_id.values():  # The node left some ids out of its reply
+            future.set_exception(RPCError(future.method, {"message": "missing from batch response"}))
+
+    def _record(self, method: str, seconds: float, failed: bool):
+        REGISTRY.observe("rpc_call_seconds", seconds, method=method)
+        with self._lock:
+            stats = self.method_stats.setdefault(method, {"calls": 0, "errors": 0, "total_seconds": 0.0})
+            stats["calls"] += 1
+            stats["errors"] += failed
+            stats["total_seconds"] += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "batches": self.batches,
+                "calls": self.calls,
+                "avg_batch_size": self.calls / self.batches if self.batches else 0.0,
+                "methods": {
+                    method: {**s, "avg_seconds": s["total_seconds"] / s["calls"] if s["calls"] else 0.0}
+                    for method, s in self.method_stats.items()
+                },
+            }
+
+
+class BatchingHTTPProvider(Web3.HTTPProvider):
+    """
+    web3 provider that sends everything through a BatchingRPCClient, so calls made
+    at the same time by different threads (cycles, confirmation tracker, fee oracle)
+    share round trips and keep-alive connections.
+    """
+
+    def __init__(self, endpoint_uri: str, client: Optional[BatchingRPCClient] = None, **kwargs):
+        super().__init__(endpoint_uri, **kwargs)
+        self.client = client or BatchingRPCClient(endpoint_uri)
+
+    def make_request(self, method, params):
+        return self.client.request(method, params)
+
+    def make_batch_request(self, batch_requests):
+        return self.client.request_many(list(batch_requests))
@@ -0,0 +1,264 @@
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from web3 import Web3
+
+from instrumentation import REGISTRY
+from deadlines import DeadlineExceeded, io_timeout, timeout_error
+from execution_layer.rpc_batch import BatchingRPCClient, RPCError
+
+SEND_METHODS = {"eth_sendRawTransaction"}
+RATE_LIMITED = -32005  # "limit exceeded" on most public endpoints: try the next node
+
+
+@dataclass
+class Endpoint:
+    url: str
+    client: BatchingRPCClient
+    latency: Optional[float] = None  # EWMA of probe + call latency, seconds
+    block: Optional[int] = None
+    healthy: bool = True
+    in_sync: bool = True
+    calls: int = 0
+    errors: int = 0
+    last_error: Optional[str] = None
+
+    @property
+    def name(self) -> str:
+        # Host only: public RPC URLs often carry an API key in the path
+        return urlparse(self.url).hostname or self.url
+
+    def observe(self, seconds: float, alpha: float = 0.3):
+        self.calls += 1
+        self.latency = seconds if self.latency is None else alpha * seconds + (1 - alpha) * self.latency
+        REGISTRY.observe("rpc_endpoint_seconds", seconds, endpoint=self.name)
+
+    def fail(self, error: Exception):
+        self.errors += 1
+        self.healthy = False  # Until the next probe says otherwise
+        self.last_error = str(error)[:200]
+        REGISTRY.inc("rpc_endpoint_errors_total", endpoint=self.name)
+
+
+class RPCPool:
+    """
+    Several RPC endpoints behind one request() call.
+
+    A probe thread times `eth_blockNumber` on every endpoint each `probe_seconds`.
+    An endpoint is healthy if the probe answered, and in sync if it is at most
+    `max_block_lag` blocks behind the highest one seen.
+
+    - Reads go to the fastest healthy in-sync endpoint. If it has not answered
+      after `hedge_after_seconds`, the same call also goes to the next in-sync one and
+      the first answer wins (public nodes' tail latency is the bottleneck).
+      Errors and rate limits fail over down the ranking.
+    - `eth_sendRawTransaction` fans out to every healthy endpoint at once, so the
+      transaction reaches the mempool through whichever node propagates first.
+    """
+
+    def __init__(self, urls: Sequence[str], probe_seconds: float = 5.0, max_block_lag: int = 2,
+                 hedge_after_seconds: float = 0.5, timeout_seconds: float = 10.0, probe_timeout_seconds: float = 3.0):
+        if not urls:
+            raise ValueError("RPCPool needs at least one endpoint")
+        self.endpoints = [Endpoint(url, BatchingRPCClient(url, timeout_seconds=timeout_seconds)) for url in urls]
+        self.probe_seconds = probe_seconds
+        self.max_block_lag = max_block_lag
+        self.hedge_after_seconds = hedge_after_seconds
+        self.timeout_seconds = timeout_seconds
+        self.probe_timeout_seconds = probe_timeout_seconds
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.head: Optional[int] = None
+        self.counters = {"hedged": 0, "failovers": 0, "broadcasts": 0}
+
+    # --- Health ---
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._probe_loop, name="rpc-probe", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _probe_loop(self):
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                print(f"⚠️ [RPC Pool] Probe failed: {e}")
+            self._stop.wait(self.probe_seconds)
+
+    def probe(self):
+        """One `eth_blockNumber` per endpoint, all in parallel; updates latency, health and sync."""
+        futures = [(ep, ep.client.submit("eth_blockNumber", [])) for ep in self.endpoints]
+        deadline = time.monotonic() + self.probe_timeout_seconds
+        for ep, future in futures:
+            try:
+                response = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                if "error" in response:
+                    raise RPCError("eth_blockNumber", response["error"])
+                ep.block = int(response["result"], 16)
+                ep.observe(time.perf_counter() - future.queued_at)
+                ep.healthy = True
+            except Exception as e:
+                ep.fail(e if str(e) else TimeoutError("probe timed out"))
+
+        blocks = [ep.block for ep in self.endpoints if ep.healthy and ep.block is not None]
+        if blocks:
+            self.head = max(blocks)
+            for ep in self.endpoints:
+                ep.in_sync = ep.block is not None and self.head - ep.block <= self.max_block_lag
+
+    def ranked(self) -> List[Endpoint]:
+        """Best first: healthy and in sync by latency, then lagging, then unhealthy (last resort)."""
+        def key(ep: Endpoint):
+            return (not ep.healthy, not ep.in_sync, ep.latency if ep.latency is not None else float("inf"))
+        return sorted(self.endpoints, key=key)
+
+    # --- Requests ---
+    def request(self, method: str, params: Any) -> dict:
+        self.start()
+        if method in SEND_METHODS:
+            return self._broadcast(method, params)
+        return self._read(method, params)
+
+    def _read(self, method: str, params: Any) -> dict:
+        ranked = self.ranked()
+        # Hedges only go to nodes that are up to date; failover may fall back to the rest
+        hedgeable = sum(1 for ep in ranked if ep.healthy and ep.in_sync)
+        timeout = io_timeout(self.timeout_seconds)
+        deadline = time.monotonic() + timeout
+        in_flight: Dict[Any, Endpoint] = {}
+        tried: List[Endpoint] = []
+        last_error: Optional[Exception] = None
+
+        def launch():
+            ep = ranked[len(tried)]
+            tried.append(ep)
+            in_flight[ep.client.submit(method, params)] = ep
+
+        launch()
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise timeout_error(f"RPC {method} on {len(tried)} endpoint(s)", timeout, self.timeout_seconds)
+            can_hedge = self.hedge_after_seconds and len(tried) < hedgeable
+            done, _ = wait(list(in_flight), timeout=min(remaining, self.hedge_after_seconds) if can_hedge else remaining,
+                           return_when=FIRST_COMPLETED)
+            if not done:
+                if can_hedge:
+                    with self._lock:
+                        self.counters["hedged"] += 1
+                    REGISTRY.inc("rpc_hedged_total")
+                    launch()
+                continue
+
+            for future in done:
+                ep = in_flight.pop(future)
+                try:
+                    response = future.result()
+                    if response.get("error", {}).get("code") == RATE_LIMITED:
+                        raise RPCError(method, response["error"])
+                except Exception as e:
+                    ep.fail(e)
+                    last_error = e
+                    if not in_flight and len(tried) < len(ranked):
+                        with self._lock:
+                            self.counters["failovers"] += 1
+                        REGISTRY.inc("rpc_failovers_total")
+                        launch()
+                    continue
+                ep.observe(time.perf_counter() - future.queued_at)
+                return response
+        raise last_error or RPCError(method, {"message": "no endpoint answered"})
+
+    def request_many(self, calls: List[Tuple[str, Any]]) -> List[dict]:
+        """A JSON-RPC batch goes to one endpoint (best first), failing over as a whole."""
+        self.start()
+        last_error: Optional[Exception] = None
+        for ep in self.ranked():
+            started = time.perf_counter()
+            try:
+                responses = ep.client.request_many(calls)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                ep.fail(e)
+                last_error = e
+                continue
+            ep.observe(time.perf_counter() - started)
+            return responses
+        raise last_error or RPCError("batch", {"message": "no endpoint answered"})
+
+    def _broadcast(self, method: str, params: Any) -> dict:
+        """Sends to every healthy endpoint; the first acceptance wins, otherwise the first error is returned."""
+        targets = [ep for ep in self.endpoints if ep.healthy] or self.endpoints
+        in_flight = {ep.client.submit(method, params): ep for ep in targets}
+        with self._lock:
+            self.counters["broadcasts"] += 1
+        timeout = io_timeout(self.timeout_seconds)
+        deadline = time.monotonic() + timeout
+        first_error = None
+        while in_flight:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(list(in_flight), timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                ep = in_flight.pop(future)
+                try:
+                    response = future.result()
+                except Exception as e:
+                    ep.fail(e)
+                    continue
+                ep.observe(time.perf_counter() - future.queued_at)
+                if "error" not in response:
+                    return response
+                # "already known" from a node that got it via gossip is normal; keep waiting for a success
+                first_error = first_error or response
+        if first_error is not None:
+            return first_error
+        raise timeout_error(f"{method} on {len(targets)} endpoint(s)", timeout, self.timeout_seconds)
+
+    # --- Reporting ---
+    def stats(self) -> dict:
+        """Same totals as BatchingRPCClient.stats(), plus one entry per endpoint."""
+        clients = [ep.client.stats() for ep in self.endpoints]
+        batches = sum(c["batches"] for c in clients)
+        calls = sum(c["calls"] for c in clients)
+        return {
+            "batches": batches,
+            "calls": calls,
+            "avg_batch_size": calls / batches if batches else 0.0,
+            "head": self.head,
+            **self.counters,
+            "endpoints": {
+                ep.name: {
+                    "healthy": ep.healthy, "in_sync": ep.in_sync, "block": ep.block,
+                    "latency_ms": ep.latency * 1000 if ep.latency is not None else None,
+                    "calls": ep.calls, "errors": ep.errors, "last_error": ep.last_error,
+                }
+                for ep in self.ranked()
+            },
+        }
+
+
+class PooledHTTPProvider(Web3.HTTPProvider):
+    """web3 provider over an RPCPool (WEB3_RPC_URLS): routed reads, fanned-out sends."""
+
+    def __init__(self, urls: Sequence[str], pool: Optional[RPCPool] = None, **kwargs):
+        super().__init__(urls[0], **kwargs)
+        self.pool = pool or RPCPool(urls)
+
+    def make_request(self, method, params):
+        return self.pool.request(method, params)
+
+    def make_batch_request(self, batch_requests):
+        return self.pool.request_many(list(batch_requests))
@@ -1,60 +1,411 @@
-import os
-import json
-from web3 import Web3
-from eth_account import Account
-from dotenv import load_dotenv
-from shared_models import TradeProposal
-
-class SafeExecutor:
-    def __init__(self):
-        load_dotenv()
-        self.rpc_url = os.getenv("WEB3_RPC_URL", "http://127.0.0.1:8545")
-        self.w3 = Web3(Web3.HTTPProvider(self.rpc_url))
-        self.contract_address = os.getenv("SAFE_ADDRESS")
-        
-        # Load the Signer (We only need one for the Counter test)
-        self.private_key = os.getenv("PRIVATE_KEY_AGENT_B_DEGEN")
-        self.account = Account.from_key(self.private_key)
-
-        # 1. Define the ABI (Interface) for the Counter Contract
-        # In a real app, we load this from a file. For now, we hardcode the "increment" function.
-        self.abi = '[{"type":"function","name":"increment","inputs":[],"outputs":[],"stateMutability":"nonpayable"}]'
-        
-        self.contract = self.w3.eth.contract(address=self.contract_address, abi=self.abi)
-
-    def execute_vote(self, proposal: TradeProposal, voters: list):
-        print(f"\n⚡ EXECUTING ON BLOCKCHAIN: {proposal.action} {proposal.target_asset_symbol}")
-        
-        if not self.contract_address:
-            print("❌ Error: SAFE_ADDRESS not found in .env")
-            return False
-
-        try:
-            # 2. Build the Transaction
-            # We are telling the blockchain: "Run the increment() function"
-            tx = self.contract.functions.increment().build_transaction({
-                'from': self.account.address,
-                'nonce': self.w3.eth.get_transaction_count(self.account.address),
-                'gas': 200000,
-                'gasPrice': self.w3.eth.gas_price
-            })
-            
-            # 3. Sign it (The "Hands" moving)
-            signed_tx = self.w3.eth.account.sign_transaction(tx, self.private_key)
-            
-            # 4. Broadcast it (The "Go" Button)
-            print(f"    🚀 Broadcasting transaction to Anvil...")
-            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            
-            # 5. Wait for Receipt
-            print(f"    ⏳ Waiting for confirmation...")
-            receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash)
-            
-            print(f"    ✅ TRANSACTION CONFIRMED!")
-            print(f"    🔗 Hash: {self.w3.to_hex(tx_hash)}")
-            print(f"    ⛽ Gas Used: {receipt['gasUsed']}")
-            return True
-
-        except Exception as e:
-            print(f"    ❌ Blockchain Error: {e}")
-            return False
\ No newline at end of file
+import os
+import json
+import threading
+import time
+from typing import Optional
+from web3 import Web3
+from dotenv import load_dotenv
+from shared_models import TradeProposal, VoteResult
+from instrumentation import timed
+from deadlines import DeadlineExceeded, current_deadline, io_timeout
+from execution_layer.nonce_manager import NonceManager
+from execution_layer.confirmation_tracker import ConfirmationTracker, TxOutcome
+from execution_layer.fee_oracle import FeeOracle
+from execution_layer.rpc_batch import BatchingHTTPProvider
+from execution_layer.rpc_pool import PooledHTTPProvider, RPCPool
+from execution_layer.abi_registry import ABIS
+from execution_layer.key_management import KeyVault
+from execution_layer.multisig import MultisigSigner, SafeTx, pack_signatures, safe_tx_hash
+from execution_layer.multicall import Call, MulticallBatcher, encode_execute
+from execution_layer.simulator import TransactionSimulator
+from execution_layer.block_stream import BalanceWatcher, BlockStream
+from execution_layer.treasury import TreasuryClient, parse_assets
+
+RPC_TIMEOUT_SECONDS = 10
+# How long a Safe transaction may wait for the previous one to be mined
+SAFE_QUEUE_TIMEOUT_SECONDS = 120
+# A Safe transaction still pending after this long (e.g. underpriced) gives up its slot, and the
+# next one replaces it at the same relayer nonce with higher fees instead of queueing behind it
+SAFE_TX_STUCK_SECONDS = float(os.getenv("SAFE_TX_STUCK_SECONDS", "180"))
+# How often a vote waiting for the Safe re-checks whether the transaction holding it is done
+SAFE_SLOT_CHECK_SECONDS = 5
+
+
+class InstrumentedHTTPProvider(Web3.HTTPProvider):
+    """
+    HTTPProvider that times every JSON-RPC call into the shared latency histograms
+    and bounds it by what is left of the cycle's deadline.
+    """
+
+    def get_request_kwargs(self):
+        for key, value in super().get_request_kwargs():
+            if key != "timeout":
+                yield key, value
+        yield "timeout", io_timeout(RPC_TIMEOUT_SECONDS)
+
+    def make_request(self, method, params):
+        with timed("external_call_seconds", service="rpc", call=method):
+            return super().make_request(method, params)
+
+
+class SafeExecutor:
+    def __init__(self):
+        load_dotenv()
+        self.rpc_url = os.getenv("WEB3_RPC_URL", "http://127.0.0.1:8545")
+        # Several endpoints (WEB3_RPC_URLS): reads go to the fastest in-sync node, sends go to all
+        rpc_urls = [url.strip() for url in os.getenv("WEB3_RPC_URLS", "").split(",") if url.strip()]
+        if len(rpc_urls) > 1:
+            pool = RPCPool(
+                rpc_urls,
+                max_block_lag=int(os.getenv("RPC_MAX_BLOCK_LAG", "2")),
+                hedge_after_seconds=float(os.getenv("RPC_HEDGE_SECONDS", "0.5")),
+                timeout_seconds=RPC_TIMEOUT_SECONDS,
+            )
+            self.w3 = Web3(PooledHTTPProvider(rpc_urls, pool=pool))
+        # Batching (default): concurrent calls share keep-alive connections and JSON-RPC batches
+        elif os.getenv("RPC_BATCHING", "1") == "1":
+            self.w3 = Web3(BatchingHTTPProvider(self.rpc_url))
+        else:
+            self.w3 = Web3(InstrumentedHTTPProvider(self.rpc_url))
+        self.contract_address = os.getenv("SAFE_ADDRESS")
+        
+        # Load the Signer: sends every transaction (signs the call in "direct" mode,
+        # relays the multisig execTransaction in "safe" mode). Keys are derived once by the vault.
+        self.vault = KeyVault()
+        self.relayer = os.getenv("RELAYER_AGENT", "Chad")
+        if self.account is None:
+            raise ValueError(f"No key loaded for relaying agent '{self.relayer}'")
+        self.nonces = NonceManager(self.w3)
+        # Receipts are polled in the background; execute_vote returns right after broadcast
+        self.tracker = ConfirmationTracker(self.w3, on_resolved=self._on_tx_resolved)
+        # EIP-1559 fees cached per block, gas limits cached per calldata shape
+        self.fees = FeeOracle(
+            self.w3,
+            priority_percentile=float(os.getenv("FEE_PRIORITY_PERCENTILE", "50")),
+            base_fee_multiplier=float(os.getenv("FEE_BASE_MULTIPLIER", "2.0")),
+            gas_limit_margin=float(os.getenv("GAS_LIMIT_MARGIN", "1.2")),
+        )
+        self._chain_id = None
+        # Every transaction is eth_call'ed against the head block first; one that would revert
+        # is dropped before it costs gas or a nonce. SIMULATION_RPC_URL points the simulation
+        # at another node instead, e.g. a local `anvil --fork-url` (see simulator.AnvilFork).
+        self.simulator = None
+        if os.getenv("SIMULATE_BEFORE_SEND", "1") == "1":
+            simulation_url = os.getenv("SIMULATION_RPC_URL")
+            if simulation_url:
+                self.simulator = TransactionSimulator(Web3(InstrumentedHTTPProvider(simulation_url)))
+            else:
+                self.simulator = TransactionSimulator(self.w3, head_fn=self.fees.head)
+
+        # 1. The Counter ABI comes from the Foundry build artifacts (contracts/out or out/),
+        # parsed once per process; the encoder for increment() is resolved up front.
+        self.increment = ABIS.function("Counter", "increment()")
+        self.target = Web3.to_checksum_address(self.contract_address) if self.contract_address else None
+
+        # "direct": one agent key calls the contract at SAFE_ADDRESS (the Counter test).
+        # "safe": SAFE_ADDRESS is a Safe; the YEA voters sign a SafeTx calling SAFE_TARGET_ADDRESS
+        # and one execTransaction carries all signatures.
+        self.execution_mode = os.getenv("EXECUTION_MODE", "direct")
+        if self.execution_mode == "safe":
+            self.multisig = MultisigSigner(self.vault)
+            # The Safe checks its own nonce when execTransaction is mined, and a concurrent cycle
+            # cannot see a nonce that is only in the mempool. So one Safe transaction is in flight
+            # at a time: the lock is taken before the nonce is read and released when the
+            # transaction resolves, its Safe nonce is used, or it is stuck (see _reclaim_safe_slot).
+            # _safe_nonce_floor covers a node that has not seen the last one yet.
+            self._safe_lock = threading.Lock()
+            self._safe_state = threading.Lock()  # Guards _safe_inflight, so the slot is released once
+            self._safe_inflight: Optional[dict] = None  # The broadcast transaction holding the slot
+            self._safe_stuck: Optional[dict] = None  # A stuck one for the next transaction to replace
+            self._safe_nonce_floor = 0
+            target = os.getenv("SAFE_TARGET_ADDRESS")
+            self.safe_target = Web3.to_checksum_address(target) if target else None
+
+        # Votes from concurrent cycles within MULTICALL_WINDOW_SECONDS go out as one
+        # BatchExecutor.execute() at MULTICALL_ADDRESS (owned by the relayer, or by the Safe)
+        multicall_address = os.getenv("MULTICALL_ADDRESS")
+        self.multicall_address = Web3.to_checksum_address(multicall_address) if multicall_address else None
+        self.multicall = None
+        if self.multicall_address:
+            self.multicall = MulticallBatcher(
+                self._execute_batch, window_seconds=float(os.getenv("MULTICALL_WINDOW_SECONDS", "2")))
+
+        # With TREASURY_ADDRESS set, BUY/SELL votes call Treasury.swap (contracts/src/Treasury.sol)
+        # instead of the Counter; its executor is the BatchExecutor if there is one, else the Safe or relayer
+        treasury_address = os.getenv("TREASURY_ADDRESS")
+        self.treasury = None
+        if treasury_address:
+            self.treasury = TreasuryClient(
+                treasury_address,
+                parse_assets(os.getenv("TREASURY_ASSETS", "")),
+                simulator=self.simulator or TransactionSimulator(self.w3, head_fn=self.fees.head),
+                slippage_bps=int(os.getenv("TREASURY_SLIPPAGE_BPS", "50")),
+            )
+            # Swaps of one shape differ in gas (new position vs. existing), including wrapped ones
+            self.fees.skip_gas_cache(self.treasury.address, self.multicall_address,
+                                     self.target if self.execution_mode == "safe" else None)
+
+        # One block stream (websocket newHeads at WEB3_WS_URL, else polling) drives receipt checks,
+        # the fee oracle's head and the treasury balances instead of a timer each
+        safe_address = self.target if self.execution_mode == "safe" else None
+        self.balances = BalanceWatcher(self.w3, {"relayer": self.account.address, "safe": safe_address})
+        self.blocks = BlockStream(os.getenv("WEB3_WS_URL"), self.w3)
+        self.blocks.on_block(self.tracker.notify_new_block)
+        self.blocks.on_block(self.fees.notify_new_block)
+        self.blocks.on_block(self.balances.refresh)
+        self.blocks.start()
+
+    @property
+    def account(self):
+        """The relaying agent's account, looked up per transaction so KeyVault.rotate() takes effect."""
+        return self.vault.get_agent_account(self.relayer)
+
+    def rpc_stats(self) -> Optional[dict]:
+        """Round trips vs. calls when the batching provider is in use (plus per-endpoint stats with a pool)."""
+        pool = getattr(self.w3.provider, "pool", None)
+        if pool is not None:
+            return pool.stats()
+        client = getattr(self.w3.provider, "client", None)
+        return client.stats() if client else None
+
+    @property
+    def chain_id(self) -> int:
+        # Fetched once instead of on every transaction
+        if self._chain_id is None:
+            self._chain_id = self.w3.eth.chain_id
+        return self._chain_id
+
+    def execute_vote(self, proposal: TradeProposal, voters: list, vote: Optional[VoteResult] = None,
+                     batch: bool = True) -> Optional[str]:
+        """
+        Builds, signs and broadcasts the vote. Returns the tx hash (hex) as soon as the
+        node accepts it, or None on failure; confirmation is reported by `self.tracker`.
+        In "safe" mode the voters' signatures are also stored on `vote.signatures`.
+        With MULTICALL_ADDRESS set, votes from concurrent cycles share one transaction (and hash);
+        `batch=False` (a single ACT caller, nothing to wait for) sends this vote on its own right away.
+        """
+        print(f"\n⚡ EXECUTING ON BLOCKCHAIN: {proposal.action} {proposal.target_asset_symbol}")
+        
+        if not self.contract_address:
+            print("❌ Error: SAFE_ADDRESS not found in .env")
+            return None
+
+        if self.treasury is not None:
+            calldata = self.treasury.swap_calldata(proposal, self._treasury_caller(), vote)
+            if calldata is None:
+                return None
+            target = self.treasury.address
+        else:
+            # We are telling the blockchain: "Run the increment() function"
+            calldata = self.increment.encode_hex()
+            target = self.target
+            if self.execution_mode == "safe":
+                if not self.safe_target:
+                    print("❌ Error: SAFE_TARGET_ADDRESS not found in .env")
+                    return None
+                target = self.safe_target
+        if self.multicall is not None:
+            # The same voters have to sign in "safe" mode, so only their votes share a batch
+            call, group = Call(target, bytes.fromhex(calldata[2:])), tuple(sorted(voters))
+            if batch:
+                return self.multicall.submit(call, group=group, context=vote)
+            # Still through the BatchExecutor when the Treasury expects it as msg.sender
+            return self._execute_batch(group, [call], [vote])
+        return self._execute(target, calldata, voters, [vote])
+
+    def _treasury_caller(self) -> str:
+        """msg.sender of Treasury.swap: the BatchExecutor, else the Safe, else the relaying key."""
+        if self.multicall_address:
+            return self.multicall_address
+        return self.target if self.execution_mode == "safe" else self.account.address
+
+    def _execute(self, to: str, calldata: str, voters: list, votes: list) -> Optional[str]:
+        if self.execution_mode == "safe":
+            return self._execute_via_safe(to, calldata, voters, votes)
+        return self._submit(to, calldata)
+
+    def _execute_batch(self, voters: tuple, calls: list, votes: list) -> Optional[str]:
+        """MulticallBatcher flush: one transaction for every vote in the window."""
+        if len(calls) == 1 and self.treasury is None:
+            # Nothing to amortize: skip the BatchExecutor hop (the Treasury only takes calls through it)
+            return self._execute(calls[0].target, "0x" + calls[0].data.hex(), list(voters), votes)
+        print(f"    📦 [Multicall] {len(calls)} votes in one transaction")
+        return self._execute(self.multicall_address, encode_execute(calls), list(voters), votes)
+
+    def _safe_chain_nonce(self) -> int:
+        result = self.w3.eth.call({'to': self.target, 'data': ABIS.calldata("Safe", "nonce()")})
+        return int.from_bytes(result, "big")
+
+    def _safe_nonce(self) -> int:
+        return max(self._safe_chain_nonce(), self._safe_nonce_floor)
+
+    def _execute_via_safe(self, to: str, calldata: str, voters: list, votes: list) -> Optional[str]:
+        if not self._acquire_safe_slot():
+            deadline = current_deadline()
+            if deadline is not None:
+                deadline.check("Safe transaction slot")
+            print(f"    ❌ Safe busy: previous transaction not mined within {SAFE_QUEUE_TIMEOUT_SECONDS}s")
+            return None
+        held = False
+        try:
+            replace, self._safe_stuck = self._safe_stuck, None
+            sent = {}
+            tx_hash = self._sign_and_submit_safe_tx(to, calldata, voters, votes, replace, sent)
+            if tx_hash is not None:
+                with self._safe_state:
+                    self._safe_inflight = {**sent, "tx_hash": tx_hash, "since": time.monotonic()}
+                # Held until the transaction is mined, replaced or dropped (or reclaimed)
+                self.tracker.add_callback(tx_hash, self._on_safe_tx_resolved)
+                held = True
+            elif replace is not None:
+                self._safe_stuck = replace  # Still stuck: the next transaction tries again
+            return tx_hash
+        finally:
+            if not held:
+                self._release_safe_slot(self._safe_inflight["tx_hash"] if self._safe_inflight else None)
+
+    def _acquire_safe_slot(self) -> bool:
+        give_up = time.monotonic() + io_timeout(SAFE_QUEUE_TIMEOUT_SECONDS)
+        while not self._safe_lock.acquire(timeout=max(0.0, min(SAFE_SLOT_CHECK_SECONDS, give_up - time.monotonic()))):
+            if time.monotonic() >= give_up:
+                return False
+            self._reclaim_safe_slot()
+        return True
+
+    def _reclaim_safe_slot(self):
+        """
+        Frees the slot of a Safe transaction the tracker has not resolved yet but that no longer
+        needs it: its Safe nonce has been used (it or a replacement was mined), or it has been
+        pending for SAFE_TX_STUCK_SECONDS, in which case the next transaction replaces it.
+        """
+        inflight = self._safe_inflight
+        if inflight is None:
+            return
+        try:
+            used = self._safe_chain_nonce() > inflight["safe_nonce"]
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"    ⚠️ Safe nonce check failed: {e}")
+            used = False
+        if used:
+            self._release_safe_slot(inflight["tx_hash"], confirmed=True)
+        elif time.monotonic() - inflight["since"] >= SAFE_TX_STUCK_SECONDS:
+            print(f"    ⏳ Safe transaction {inflight['tx_hash'][:10]}… pending for {SAFE_TX_STUCK_SECONDS:.0f}s, replacing it")
+            self._release_safe_slot(inflight["tx_hash"], stuck=True)
+
+    def _release_safe_slot(self, tx_hash: Optional[str], confirmed: bool = False, stuck: bool = False):
+        """Releases the Safe slot if `tx_hash` still holds it (None: held by nothing broadcast)."""
+        with self._safe_state:
+            inflight = self._safe_inflight
+            if (inflight["tx_hash"] if inflight else None) != tx_hash:
+                return  # Already released (tracker vs. reclaim), or a newer transaction holds it
+            self._safe_inflight = None
+            if inflight is not None and confirmed:
+                self._safe_nonce_floor = max(self._safe_nonce_floor, inflight["safe_nonce"] + 1)
+            if stuck:
+                self._safe_stuck = inflight
+        self._safe_lock.release()
+
+    def _on_safe_tx_resolved(self, outcome: TxOutcome):
+        self._release_safe_slot(outcome.tx_hash, confirmed=outcome.status == "CONFIRMED")
+
+    def _sign_and_submit_safe_tx(self, to: str, calldata: str, voters: list, votes: list,
+                                 replace: Optional[dict] = None, sent: Optional[dict] = None) -> Optional[str]:
+        try:
+            safe_tx = SafeTx(to=to, data=bytes.fromhex(calldata[2:]), nonce=self._safe_nonce())
+            # Hashed once, then signed by every YEA voter in parallel
+            digest = safe_tx_hash(safe_tx, self.chain_id, self.target)
+            signed = self.multisig.collect(digest, voters)
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"    ❌ Signing Error: {e}")
+            return None
+
+        print(f"    ✍️  {len(signed)}/{len(voters)} signatures: {', '.join(signed) or '-'}")
+        signatures = {name: "0x" + signature.hex() for name, (_owner, signature) in signed.items()}
+        for vote in votes:
+            if vote is not None:
+                vote.signatures = dict(signatures)
+        packed = pack_signatures({owner: signature for owner, signature in signed.values()})
+        if sent is not None:
+            sent["safe_nonce"] = safe_tx.nonce
+        return self._submit(self.target, self.multisig.exec_transaction_calldata(safe_tx, packed), replace, sent)
+
+    def _submit(self, to: str, data: str, replace: Optional[dict] = None, sent: Optional[dict] = None) -> Optional[str]:
+        """
+        Simulate, then nonce, fees, gas, sign and broadcast one transaction from the relaying agent key.
+        `replace` (a previous call's `sent` details) reuses that transaction's nonce with higher fees,
+        replacing it in the mempool; `sent` receives the sender, nonce and fees used.
+        """
+        # One lookup per transaction: a key rotated meanwhile applies from the next one
+        account = self.account
+        if account is None:
+            print(f"    ❌ No key for relaying agent '{self.relayer}', not sending")
+            return None
+        self.balances.watch("relayer", account.address)
+
+        if self.simulator is not None:
+            try:
+                result = self.simulator.simulate({'from': account.address, 'to': to, 'data': data})
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                # No verdict: the receipt will tell, as it did before simulation existed
+                print(f"    ⚠️ Simulation unavailable ({e}), sending anyway")
+            else:
+                if not result.ok:
+                    print(f"    🧪 Simulation reverted at block {result.block_number}: {result.revert_reason} (not sent)")
+                    return None
+
+        # Nonces come from memory; concurrent votes each get their own
+        replacing = replace is not None and replace.get("sender") == account.address
+        nonce = replace["nonce"] if replacing else self.nonces.allocate(account.address)
+        try:
+            fees = self.fees.fees()
+            if replacing:
+                fees = self.fees.replacement_fees(fees, replace["fees"])
+            # 2. Build the Transaction
+            tx = {
+                'from': account.address,
+                'to': to,
+                'data': data,
+                'value': 0,
+                'nonce': nonce,
+                'chainId': self.chain_id,
+                **fees
+            }
+            tx['gas'] = self.fees.estimate_gas(tx)
+            
+            # 3. Sign it (The "Hands" moving)
+            signed_tx = account.sign_transaction(tx)
+            
+            # 4. Broadcast it (The "Go" Button)
+            print(f"    🚀 Broadcasting transaction to Anvil (nonce {nonce}{', replacing the stuck one' if replacing else ''})...")
+            tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
+        except Exception as e:
+            # Never broadcast: give the nonce back (resyncs if the node disagreed with it), unless
+            # it still belongs to the transaction we meant to replace
+            if not replacing:
+                self.nonces.release(account.address, nonce, e)
+            if isinstance(e, DeadlineExceeded):
+                raise
+            print(f"    ❌ Blockchain Error: {e}")
+            return None
+
+        # 5. Hand the receipt over to the tracker instead of waiting for it
+        tx_hex = self.w3.to_hex(tx_hash)
+        self.tracker.track(tx_hex, account.address, nonce)
+        if sent is not None:
+            sent.update(sender=account.address, nonce=nonce, fees=fees)
+        print(f"    📨 Broadcast accepted, tracking confirmation")
+        print(f"    🔗 Hash: {tx_hex}")
+        return tx_hex
+
+    def _on_tx_resolved(self, outcome: TxOutcome):
+        # A mined (or replaced) nonce is final; a dropped one can be reused
+        if outcome.status == "DROPPED":
+            self.nonces.invalidate(outcome.sender, outcome.nonce)
+        else:
+            self.nonces.confirm(outcome.sender, outcome.nonce)
\ No newline at end of file
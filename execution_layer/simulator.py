@@ -0,0 +1,215 @@
+import json
+import os
+import shutil
+import socket
+import subprocess
+import threading
+import time
+import urllib.request
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from eth_abi import decode as abi_decode
+from eth_utils import function_signature_to_4byte_selector
+
+from instrumentation import REGISTRY
+
+ERROR_SELECTOR = bytes.fromhex("08c379a0")  # Error(string)
+PANIC_SELECTOR = bytes.fromhex("4e487b71")  # Panic(uint256)
+CALL_FAILED_SELECTOR = function_signature_to_4byte_selector("CallFailed(uint256,bytes)")  # BatchExecutor
+
+
+def _to_bytes(data) -> bytes:
+    if isinstance(data, (bytes, bytearray)):
+        return bytes(data)
+    if isinstance(data, str):
+        return bytes.fromhex(data[2:] if data.startswith("0x") else data)
+    return b""
+
+
+def decode_revert(data: bytes) -> str:
+    """Human-readable revert: Error(string) text, Panic code, or the custom error's selector + data."""
+    if not data:
+        return "reverted without a reason"
+    selector, payload = data[:4], data[4:]
+    try:
+        if selector == ERROR_SELECTOR:
+            return abi_decode(["string"], payload)[0]
+        if selector == PANIC_SELECTOR:
+            return f"Panic(0x{abi_decode(['uint256'], payload)[0]:02x})"
+        if selector == CALL_FAILED_SELECTOR:
+            index, inner = abi_decode(["uint256", "bytes"], payload)
+            return f"batch call {index} failed: {decode_revert(inner)}"
+    except Exception:
+        pass
+    # Any other custom error: its selector (look it up with `cast 4byte`) and raw data
+    return f"custom error 0x{selector.hex()} ({len(payload)} bytes of data)"
+
+
+@dataclass
+class SimulationResult:
+    ok: bool
+    block_number: int
+    return_data: bytes = b""
+    revert_reason: Optional[str] = None
+    seconds: float = 0.0
+    cached: bool = False
+
+
+class TransactionSimulator:
+    """
+    `eth_call`s a transaction against the head block before it is signed and sent,
+    so a trade that would revert fails in one round trip instead of after a mined
+    revert (gas spent, a block of latency, a nonce used).
+
+    Results are cached per (from, to, calldata, value, block): a cycle that retries,
+    or several cycles sending the same call in one block, simulate once.
+    """
+
+    def __init__(self, w3, head_fn: Optional[Callable[[], int]] = None, cache_size: int = 512):
+        self.w3 = w3
+        self.head_fn = head_fn or (lambda: self.w3.eth.block_number)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, SimulationResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"simulations": 0, "cache_hits": 0, "reverts": 0}
+
+    @staticmethod
+    def _call(tx: dict) -> dict:
+        call = {k: tx[k] for k in ("from", "to", "data") if tx.get(k) is not None}
+        if tx.get("value"):
+            call["value"] = hex(tx["value"])
+        return call
+
+    def simulate(self, tx: dict, block_number: Optional[int] = None) -> SimulationResult:
+        block = self.head_fn() if block_number is None else block_number
+        call = self._call(tx)
+        key = (str(call.get("from", "")).lower(), str(call.get("to", "")).lower(),
+               call.get("data"), call.get("value"), block)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.stats["cache_hits"] += 1
+                return SimulationResult(cached.ok, cached.block_number, cached.return_data,
+                                        cached.revert_reason, cached.seconds, cached=True)
+
+        started = time.perf_counter()
+        # Raw request: web3's own eth_call raises with the revert data mangled into a message
+        response = self.w3.provider.make_request("eth_call", [call, hex(block)])
+        seconds = time.perf_counter() - started
+
+        error = response.get("error")
+        if error is None:
+            result = SimulationResult(True, block, _to_bytes(response.get("result")), seconds=seconds)
+        else:
+            data = error.get("data")
+            if isinstance(data, dict):  # Some nodes nest it: {"data": {"data": "0x..."}}
+                data = data.get("data")
+            reason = decode_revert(_to_bytes(data)) if data else error.get("message", str(error))
+            result = SimulationResult(False, block, _to_bytes(data), reason, seconds)
+
+        REGISTRY.observe("tx_simulation_seconds", seconds)
+        with self._lock:
+            self.stats["simulations"] += 1
+            self.stats["reverts"] += not result.ok
+            self._cache[key] = result
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        if not result.ok:
+            REGISTRY.inc("tx_simulation_reverts_total")
+        return result
+
+    def trace(self, tx: dict, block_number: Optional[int] = None) -> Optional[dict]:
+        """`debug_traceCall` call tree (callTracer). Anvil supports it; most public RPCs do not."""
+        block = self.head_fn() if block_number is None else block_number
+        response = self.w3.provider.make_request(
+            "debug_traceCall", [self._call(tx), hex(block), {"tracer": "callTracer"}])
+        return response.get("result")
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class AnvilFork:
+    """
+    A local `anvil --fork-url` node for tests and dry runs: transactions can be
+    simulated, or actually sent, against real chain state without touching it.
+
+        with AnvilFork(os.getenv("WEB3_RPC_URL")) as fork:
+            simulator = TransactionSimulator(Web3(Web3.HTTPProvider(fork.url)))
+
+    With `fork_url=None` it is a fresh local chain instead (no upstream needed).
+    """
+
+    def __init__(self, fork_url: Optional[str], block_number: Optional[int] = None, port: Optional[int] = None,
+                 anvil_bin: str = "anvil", startup_timeout: float = 30.0):
+        self.fork_url = fork_url
+        self.block_number = block_number
+        self.port = port or _free_port()
+        self.anvil_bin = anvil_bin
+        self.startup_timeout = startup_timeout
+        self.url = f"http://127.0.0.1:{self.port}"
+        self.process: Optional[subprocess.Popen] = None
+
+    def start(self) -> "AnvilFork":
+        binary = shutil.which(self.anvil_bin) or os.path.expanduser(f"~/.foundry/bin/{self.anvil_bin}")
+        if not os.path.exists(binary):
+            raise FileNotFoundError(f"{self.anvil_bin} not found (install Foundry: https://getfoundry.sh)")
+        cmd = [binary, "--port", str(self.port), "--silent"]
+        if self.fork_url:
+            cmd += ["--fork-url", self.fork_url]
+        if self.fork_url and self.block_number is not None:
+            cmd += ["--fork-block-number", str(self.block_number)]
+        self.process = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+
+        deadline = time.monotonic() + self.startup_timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"anvil exited: {self.process.stderr.read().decode(errors='replace')}")
+            try:
+                self.rpc("eth_blockNumber")
+                print(f"🍴 [Anvil] {f'Fork of {self.fork_url}' if self.fork_url else 'Local chain'} listening on {self.url}")
+                return self
+            except OSError:
+                time.sleep(0.2)
+        self.stop()
+        raise TimeoutError(f"anvil did not start within {self.startup_timeout:.0f}s")
+
+    def rpc(self, method: str, params: Optional[list] = None):
+        body = json.dumps({"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}).encode()
+        request = urllib.request.Request(self.url, body, {"Content-Type": "application/json"})
+        with urllib.request.urlopen(request, timeout=5) as response:
+            reply = json.loads(response.read())
+        if "error" in reply:
+            raise RuntimeError(f"{method}: {reply['error']}")
+        return reply.get("result")
+
+    def reset(self, block_number: Optional[int] = None):
+        """Re-forks at `block_number` (default: the upstream's latest block); a local chain restarts from genesis."""
+        if not self.fork_url:
+            self.rpc("anvil_reset", [])
+            return
+        forking = {"jsonRpcUrl": self.fork_url}
+        if block_number is not None:
+            forking["blockNumber"] = block_number
+        self.rpc("anvil_reset", [{"forking": forking}])
+
+    def stop(self):
+        if self.process and self.process.poll() is None:
+            self.process.terminate()
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+        self.process = None
+
+    def __enter__(self) -> "AnvilFork":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
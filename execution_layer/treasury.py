@@ -0,0 +1,95 @@
+import hashlib
+import uuid
+from typing import Dict, Optional, Tuple
+
+from eth_abi import decode as abi_decode
+from web3 import Web3
+
+from shared_models import TradeProposal, VoteResult
+from deadlines import DeadlineExceeded
+from execution_layer.abi_registry import ABIS
+
+SWAP = "swap(address,bool,uint16,uint256,bytes16,uint8,uint8)"
+BPS = 10_000
+RATE_ONE = 10 ** 18
+
+
+def parse_assets(spec: str) -> Dict[str, str]:
+    """TREASURY_ASSETS "BTC=0x..,ETH=0x.." -> {"BTC": checksum address, ...}."""
+    assets = {}
+    for entry in spec.split(","):
+        if "=" not in entry:
+            continue
+        symbol, address = entry.split("=", 1)
+        assets[symbol.strip().upper()] = Web3.to_checksum_address(address.strip())
+    return assets
+
+
+def proposal_id_bytes(proposal_id: str) -> bytes:
+    """The proposal's UUID as the contract's bytes16 (a hash prefix for ids that are not UUIDs)."""
+    try:
+        return uuid.UUID(proposal_id).bytes
+    except (ValueError, AttributeError, TypeError):
+        return hashlib.sha256(str(proposal_id).encode()).digest()[:16]
+
+
+class TreasuryClient:
+    """
+    Calldata for Treasury.swap (contracts/src/Treasury.sol) from a passed vote.
+
+    The swap is eth_call'ed once without a slippage bound to quote it, and the
+    quoted rate less `slippage_bps` becomes the on-chain `minRate`, so a price that
+    moves between the quote and inclusion reverts cheaply instead of filling badly.
+    No quote, no trade.
+    """
+
+    def __init__(self, address: str, assets: Dict[str, str], simulator, slippage_bps: int = 50):
+        self.address = Web3.to_checksum_address(address)
+        self.assets = assets
+        self.simulator = simulator
+        self.slippage_bps = slippage_bps
+        self.swap = ABIS.function("Treasury", SWAP)
+
+    def asset_for(self, symbol: str) -> Optional[str]:
+        return self.assets.get(symbol.split("/")[0].upper())
+
+    @staticmethod
+    def bps(percentage: float) -> int:
+        return min(BPS, max(1, round(percentage * BPS)))
+
+    def _args(self, proposal: TradeProposal, asset: str, min_rate: int, vote: Optional[VoteResult]) -> tuple:
+        votes_for, votes_against = (vote.total_votes_yea, vote.total_votes_nay) if vote is not None else (2, 1)
+        return (asset, proposal.action == "BUY", self.bps(proposal.percentage_of_treasury_to_use), min_rate,
+                proposal_id_bytes(proposal.proposal_id), min(votes_for, 255), min(votes_against, 255))
+
+    def quote(self, caller: str, args: tuple) -> Tuple[Optional[Tuple[int, int]], Optional[str]]:
+        """(amountIn, amountOut) of the swap at the head block, or (None, revert reason)."""
+        result = self.simulator.simulate({'from': caller, 'to': self.address, 'data': self.swap.encode_hex(*args)})
+        if not result.ok:
+            return None, result.revert_reason
+        return tuple(abi_decode(["uint256", "uint256"], result.return_data)), None
+
+    def swap_calldata(self, proposal: TradeProposal, caller: str, vote: Optional[VoteResult] = None) -> Optional[str]:
+        """Treasury.swap calldata for a BUY or SELL, or None if the trade cannot go through."""
+        if proposal.action not in ("BUY", "SELL"):
+            print(f"    ⏸️ [Treasury] Nothing to trade for {proposal.action}")
+            return None
+        asset = self.asset_for(proposal.target_asset_symbol)
+        if asset is None:
+            print(f"    ❌ [Treasury] No TREASURY_ASSETS entry for {proposal.target_asset_symbol}")
+            return None
+
+        try:
+            quoted, reason = self.quote(caller, self._args(proposal, asset, 0, vote))
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            print(f"    ❌ [Treasury] Quote unavailable ({e}), not sending")
+            return None
+        if quoted is None:
+            print(f"    🧪 [Treasury] Swap would revert: {reason} (not sent)")
+            return None
+        amount_in, amount_out = quoted
+        min_rate = amount_out * RATE_ONE // amount_in * (BPS - self.slippage_bps) // BPS
+        print(f"    💱 [Treasury] Quote {amount_in} -> {amount_out}, minRate {min_rate}")
+        return self.swap.encode_hex(*self._args(proposal, asset, min_rate, vote))
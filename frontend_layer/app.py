@@ -2,6 +2,7 @@ import streamlit as st
 import time
 import json
 import os
+import sqlite3
 
 # Page Config
 st.set_page_config(
@@ -26,11 +27,47 @@ with st.sidebar:
 if 'last_update' not in st.session_state:
     st.session_state['last_update'] = 0
 
-# LOAD REAL DATA
-data_file = "frontend_layer/dashboard_state.json"
-if os.path.exists(data_file):
-    with open(data_file, "r") as f:
-        data = json.load(f)
+# LOAD REAL DATA (from the bot's append-only cycle journal)
+JOURNAL_PATH = os.getenv("CYCLE_JOURNAL_PATH", os.path.join("state", "cycle_journal.db"))
+
+def load_recent_cycles(limit=20):
+    """Newest-first cycle records. Read-only, so it never blocks the bot's writer."""
+    if not os.path.exists(JOURNAL_PATH):
+        return []
+    conn = sqlite3.connect(f"file:{JOURNAL_PATH}?mode=ro", uri=True, timeout=5)
+    try:
+        # Each cycle with its transaction's latest outcome, once the confirmation tracker has seen one
+        # (matched on ticker too: one multicall transaction can carry several tickers' votes). Only the
+        # newest event per (tx_hash, ticker) is joined, so a cycle is listed once however many it has.
+        rows = conn.execute(
+            "SELECT c.record, t.status, t.gas_used FROM cycles c "
+            "LEFT JOIN (SELECT tx_hash, ticker, MAX(id) AS id FROM tx_events GROUP BY tx_hash, ticker) latest "
+            "ON latest.tx_hash = c.tx_hash AND latest.ticker = c.ticker "
+            "LEFT JOIN tx_events t ON t.id = latest.id "
+            "ORDER BY c.ts DESC, c.id DESC LIMIT ?", (limit,)
+        ).fetchall()
+    finally:
+        conn.close()
+    return [{**json.loads(record), "tx_status": status, "gas_used": gas_used} for record, status, gas_used in rows]
+
+def to_dashboard(record):
+    context = record.get("context") or {}
+    proposal = record.get("proposal") or {}
+    return {
+        "timestamp": record["started_at"][11:19], "ticker": record["ticker"],
+        "price": context.get("current_price") or 0, "rsi": context.get("rsi_14") or 50,
+        "sentiment": context.get("dominant_sentiment", "N/A"),
+        "decision": proposal.get("action", record["status"]),
+        "agent": proposal.get("proposing_agent_name", "System"),
+        "reason": proposal.get("reasoning_summary", record.get("error") or ""),
+        "tx_hash": record.get("tx_hash", "N/A"),
+        "tx_status": record.get("tx_status") or ("PENDING" if record.get("tx_hash", "N/A") != "N/A" else "-"),
+        "gas_used": record.get("gas_used") or "-",
+    }
+
+recent = [to_dashboard(r) for r in load_recent_cycles()]
+if recent:
+    data = recent[0]
 else:
     # Fallback if bot hasn't run yet
     data = {
@@ -41,7 +78,7 @@ else:
 # METRICS ROW
 col1, col2, col3 = st.columns(3)
 with col1:
-    st.metric(label="BTC Price", value=f"${data['price']:,.2f}")
+    st.metric(label=f"{data.get('ticker', 'BTC')} Price", value=f"${data['price']:,.2f}")
 with col2:
     st.metric(label="RSI (14)", value=f"{data['rsi']:.1f}")
 with col3:
@@ -68,9 +105,18 @@ with st.container(border=True):
     
     if data['tx_hash'] != "N/A":
         st.success(f"🔗 **On-Chain Proof:** [{data['tx_hash'][:10]}...](https://sepolia.etherscan.io/tx/{data['tx_hash']})")
+        st.caption(f"Status: {data['tx_status']} | Gas used: {data['gas_used']}")
     else:
         st.caption("No transaction broadcast for this cycle.")
 
+# HISTORY
+if recent:
+    st.subheader("📜 Recent Cycles")
+    st.dataframe(
+        [{k: r[k] for k in ("timestamp", "ticker", "decision", "agent", "price", "rsi", "tx_hash", "tx_status", "gas_used")} for r in recent],
+        use_container_width=True,
+    )
+
 # Auto-rerun to keep data fresh
 time.sleep(2)
 st.rerun()
\ No newline at end of file
@@ -0,0 +1,238 @@
+# instrumentation.py
+"""
+Low-overhead latency histograms shared by every layer, exposed in Prometheus
+text format from a small local HTTP endpoint.
+
+    from instrumentation import timed
+    with timed("external_call_seconds", service="ccxt", call="fetch_ticker"):
+        exchange.fetch_ticker(symbol)
+
+Each observation is a perf_counter() pair, a bisect into fixed buckets and a
+lock-protected increment, so it is safe to leave on in production.
+"""
+import bisect
+import math
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+
+from deadlines import DeadlineExceeded
+
+METRIC_PREFIX = "threebody_"
+
+# Upper bounds in seconds: covers a 5 ms cache hit up to a 2 min receipt wait
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+
+class Histogram:
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # Last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile (e.g. 0.99) by interpolating inside its bucket."""
+        with self._lock:
+            counts, total = list(self.counts), self.count
+        if total == 0:
+            return 0.0
+        rank = q * total
+        seen = 0
+        for i, bucket_count in enumerate(counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.buckets[i - 1] if i > 0 else 0.0
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.buckets[-1]
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (f'{k}="{_escape(v)}"' for k, v in pairs)
+    return "{" + ",".join(escaped) + "}"
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[tuple, Histogram]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._gauges: Dict[str, Callable[[], object]] = {}
+        self._help: Dict[str, str] = {}
+
+    # --- Histograms ---
+    def histogram(self, name: str, **labels) -> Histogram:
+        key = _label_key(labels)
+        series = self._histograms.get(name)
+        if series is not None:
+            hist = series.get(key)
+            if hist is not None:
+                return hist
+        with self._lock:
+            hist = self._histograms.setdefault(name, {}).setdefault(key, Histogram())
+        return hist
+
+    def observe(self, name: str, value: float, **labels):
+        self.histogram(name, **labels).observe(value)
+
+    # --- Counters ---
+    def inc(self, name: str, amount: float = 1.0, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + amount
+
+    # --- Gauges (pulled at scrape time) ---
+    def register_gauge(self, name: str, fn: Callable[[], object], help_text: str = ""):
+        """
+        `fn` returns either a number or a list of (labels_dict, number) pairs.
+        Evaluated only when /metrics is scraped, so it costs nothing per cycle.
+        """
+        with self._lock:
+            self._gauges[name] = fn
+            if help_text:
+                self._help[name] = help_text
+
+    def describe(self, name: str, help_text: str):
+        self._help[name] = help_text
+
+    # --- Exposition ---
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            histograms = {n: dict(s) for n, s in self._histograms.items()}
+            counters = {n: dict(s) for n, s in self._counters.items()}
+            gauges = dict(self._gauges)
+
+        for name in sorted(histograms):
+            full = METRIC_PREFIX + name
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} histogram")
+            for key, hist in sorted(histograms[name].items()):
+                with hist._lock:
+                    counts, total, total_sum = list(hist.counts), hist.count, hist.sum
+                cumulative = 0
+                for bound, bucket_count in zip(hist.buckets + (math.inf,), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    lines.append(f"{full}_bucket{_format_labels(key, ('le', le))} {cumulative}")
+                lines.append(f"{full}_sum{_format_labels(key)} {total_sum}")
+                lines.append(f"{full}_count{_format_labels(key)} {total}")
+
+        for name in sorted(counters):
+            full = METRIC_PREFIX + name
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} counter")
+            for key, value in sorted(counters[name].items()):
+                lines.append(f"{full}{_format_labels(key)} {value}")
+
+        for name in sorted(gauges):
+            full = METRIC_PREFIX + name
+            try:
+                value = gauges[name]()
+            except Exception as e:
+                lines.append(f"# gauge {full} failed: {e}")
+                continue
+            if name in self._help:
+                lines.append(f"# HELP {full} {self._help[name]}")
+            lines.append(f"# TYPE {full} gauge")
+            if isinstance(value, list):
+                for labels, v in value:
+                    lines.append(f"{full}{_format_labels(_label_key(labels))} {float(v)}")
+            else:
+                lines.append(f"{full} {float(value)}")
+
+        return "\n".join(lines) + "\n"
+
+    def summary(self, name: str) -> Dict[str, dict]:
+        """p50/p99/count per label set, for console reports."""
+        report = {}
+        for key, hist in list(self._histograms.get(name, {}).items()):
+            label = ",".join(v for _, v in key) or name
+            report[label] = {"count": hist.count, "p50": hist.quantile(0.5), "p99": hist.quantile(0.99)}
+        return report
+
+
+REGISTRY = MetricsRegistry()
+
+
+@contextmanager
+def timed(name: str, registry: MetricsRegistry = REGISTRY, count_errors: bool = True, **labels):
+    """
+    Times the block into histogram `name`. Exceptions also bump `<name>_errors_total`
+    with outcome="timeout" (deadline or per-call cap) or outcome="error", unless the
+    caller counts its own failures (`count_errors=False`).
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    except BaseException as e:
+        if count_errors:
+            outcome = "timeout" if isinstance(e, (DeadlineExceeded, TimeoutError)) else "error"
+            registry.inc(name.replace("_seconds", "") + "_errors_total", outcome=outcome, **labels)
+        raise
+    finally:
+        registry.observe(name, time.perf_counter() - started, **labels)
+
+
+def timed_fn(name: str, fn: Callable, registry: MetricsRegistry = REGISTRY, **labels) -> Callable:
+    """Wraps `fn` so every call is timed into histogram `name`."""
+    @wraps(fn)
+    def wrapper(*args, **kwargs):
+        with timed(name, registry, **labels):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+# ==========================================
+# LOCAL /metrics ENDPOINT
+# ==========================================
+def start_metrics_server(port: int, host: str = "127.0.0.1",
+                         registry: MetricsRegistry = REGISTRY) -> ThreadingHTTPServer:
+    """Serves `registry` at http://host:port/metrics from a daemon thread."""
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] not in ("/metrics", "/"):
+                self.send_error(404)
+                return
+            body = registry.render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the bot's console
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    thread = threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True)
+    thread.start()
+    return server
@@ -1,141 +1,514 @@
-import sys
-import time
-import os
-import json
-from datetime import datetime
-
-# Disable Rich Tracebacks to prevent the recursion crash
-os.environ["RICH_TRACEBACK"] = "0"
-
-# Imports
-try:
-    from data_layer import fetch_market_context
-    from execution_layer.safe_integration import SafeExecutor
-    from frontend_layer.discord_bot import DiscordNotifier
-    from ai_brain.crew_manager import AIBrain
-    from shared_models import TradeProposal, MarketContext
-    AI_AVAILABLE = True
-except ImportError as e:
-    print(f"⚠️ Import Error: {e}")
-    AI_AVAILABLE = False
-
-# --- CONFIGURATION ---
-SLEEP_DELAY_SECONDS = 300  # 5 Minutes between cycles
-TICKER = "BTC/USDT"
-
-class Orchestrator:
-    def __init__(self):
-        self.executor = SafeExecutor()
-        self.notifier = DiscordNotifier()
-        self.brain = None
-        if AI_AVAILABLE:
-            try:
-                self.brain = AIBrain()
-                print("✅ AI Brain Connected (Groq)")
-            except Exception as e:
-                print(f"⚠️ AI Init Failed: {e}")
-
-    def mock_brain_decision(self, context):
-        print("\n[🤖 MOCK BRAIN] Fallback active...")
-        if context.rsi_14 and context.rsi_14 < 30:
-            return TradeProposal("mock", "Chad", "BUY", context.target_asset_symbol, 0.1, "RSI Oversold")
-        return TradeProposal("mock", "Warren", "HOLD_Existing", context.target_asset_symbol, 0.0, "Safety first")
-
-    def run_cycle(self, ticker="BTC/USDT"):
-        print(f"\n{'='*40}")
-        print(f"🚀 STARTING CYCLE: {ticker} at {datetime.now().strftime('%H:%M:%S')}")
-        print(f"{'='*40}")
-        
-        try:
-            # 1. SENSE
-            print("--- SENSING ---")
-            market_context = fetch_market_context(ticker)
-            print(f"Price: {market_context.current_price:.2f} | RSI: {market_context.rsi_14:.2f}")
-
-            # 2. THINK
-            print("--- THINKING ---")
-            proposal = None
-            
-            if self.brain:
-                try:
-                    proposal = self.brain.start_debate(market_context)
-                except Exception as e:
-                    print(f"❌ Brain Error: {e}")
-                    proposal = self.mock_brain_decision(market_context)
-            else:
-                proposal = self.mock_brain_decision(market_context)
-
-            print(f"👉 DECISION: {proposal.action} by {proposal.proposing_agent_name}")
-            print(f"👉 REASON: {proposal.reasoning_summary}")
-
-            # 3. ACT
-            print("--- EXECUTING ---")
-            tx_hash = "N/A"
-            if proposal.action != "HOLD_Existing":
-                success = self.executor.execute_vote(proposal, ["Chad", "Atlas"])
-                if success:
-                    print("✅ Transaction Signed & Broadcasted")
-                    # In a real app, we would capture the hash from the executor
-                    tx_hash = "0x..." 
-                else:
-                    print("❌ Transaction Failed")
-            else:
-                print("🛑 No Action Taken (HOLD)")
-            
-            # 4. NOTIFY
-            print("--- NOTIFYING ---")
-            self.notifier.post_trade_decision(
-                ticker, 
-                proposal.action, 
-                proposal.proposing_agent_name, 
-                proposal.reasoning_summary, 
-                True
-            )
-            print("💬 Discord Sent")
-
-            # --- 5. SAVE STATE FOR DASHBOARD (NEW!) ---
-            dashboard_data = {
-                "timestamp": datetime.now().strftime("%H:%M:%S"),
-                "ticker": ticker,
-                "price": market_context.current_price,
-                "rsi": market_context.rsi_14,
-                "sentiment": market_context.dominant_sentiment,
-                "decision": proposal.action,
-                "agent": proposal.proposing_agent_name,
-                "reason": proposal.reasoning_summary,
-                "tx_hash": tx_hash
-            }
-            
-            # Save to a JSON file that the website can read
-            with open("frontend_layer/dashboard_state.json", "w") as f:
-                json.dump(dashboard_data, f)
-            print("💾 Dashboard State Updated")
-            # -----------------------------------------------
-            
-        except Exception as e:
-            print(f"❌ CYCLE ERROR: {e}")
-
-    def start_autonomous_mode(self):
-        print(f"\n🤖 SYSTEM ONLINE: Autonomous Mode Activated")
-        print(f"⏱️  Interval: {SLEEP_DELAY_SECONDS} seconds")
-        print("---------------------------------------------------")
-        
-        while True:
-            try:
-                self.run_cycle(TICKER)
-                
-                print(f"\n💤 Cycle Complete. Sleeping for {SLEEP_DELAY_SECONDS} seconds...")
-                print("---------------------------------------------------")
-                time.sleep(SLEEP_DELAY_SECONDS)
-                
-            except KeyboardInterrupt:
-                print("\n🛑 MANUAL OVERRIDE: Stopping Bot.")
-                sys.exit(0)
-            except Exception as e:
-                print(f"❌ CRITICAL ERROR: {e}")
-                print("⚠️  Retrying in 60 seconds...")
-                time.sleep(60)
-
-if __name__ == "__main__":
-    bot = Orchestrator()
+import sys
+import time
+import os
+import json
+import argparse
+import threading
+from contextlib import nullcontext
+from datetime import datetime
+from typing import Optional
+
+# Disable Rich Tracebacks to prevent the recursion crash
+os.environ["RICH_TRACEBACK"] = "0"
+
+# Layers are imported lazily (see Orchestrator.__init__): web3, langchain, ccxt
+# and friends only load on first use, and a broken layer only disables itself.
+from shared_models import TradeProposal, MarketContext, CycleRecord, VoteResult
+from orchestration.scheduler import CycleScheduler, parse_ticker_universe
+from orchestration.pipeline import StagedPipeline, StageSpec
+from orchestration.triggers import build_default_engine
+from orchestration.lazy import LazyComponent
+from orchestration.journal import CycleJournal, DEFAULT_JOURNAL_PATH
+from orchestration.sharding import ShardedCoordinator
+from orchestration.profiling import CycleProfiler, DEFAULT_PROFILE_DIR
+from orchestration.checkpoint import Checkpointer, DEFAULT_CHECKPOINT_PATH
+import instrumentation
+from instrumentation import REGISTRY, timed, timed_fn
+from deadlines import Deadline, DeadlineExceeded, deadline_scope
+
+# --- CONFIGURATION ---
+SLEEP_DELAY_SECONDS = 300  # 5 Minutes between cycles (default per-ticker interval)
+# Ticker universe, e.g. "BTC/USDT,ETH/USDT:120" (":<seconds>" overrides the interval)
+TICKERS = os.getenv("TICKERS", "BTC/USDT")
+MAX_CONCURRENT_CYCLES = int(os.getenv("MAX_CONCURRENT_CYCLES", "4"))
+
+# Time budget per cycle, passed down to every HTTP / LLM / RPC call (0 = unbounded).
+# The watchdog flags cycles still running CYCLE_OVERRUN_GRACE_SECONDS past it.
+CYCLE_BUDGET_SECONDS = float(os.getenv("CYCLE_BUDGET_SECONDS", "120"))
+CYCLE_OVERRUN_GRACE_SECONDS = float(os.getenv("CYCLE_OVERRUN_GRACE_SECONDS", "30"))
+
+# Pipeline mode: SENSE -> THINK -> ACT -> NOTIFY -> SAVE as worker pools joined by bounded queues
+PIPELINE_MODE = os.getenv("PIPELINE_MODE", "0") == "1"
+PIPELINE_QUEUE_SIZE = int(os.getenv("PIPELINE_QUEUE_SIZE", "8"))
+# ACT stays single-threaded: one signer, one nonce sequence
+PIPELINE_WORKERS = {"SENSE": 4, "THINK": 4, "ACT": 1, "NOTIFY": 2, "SAVE": 1}
+
+# Sharded mode: SENSE + THINK run in N worker processes (tickers assigned by consistent
+# hashing); ACT/NOTIFY/SAVE stay in this process. 0 = off. Takes precedence over PIPELINE_MODE.
+SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", "0"))
+
+# Cycles that can be in ACT at once: one collector thread (sharded), the ACT pool (pipeline), else
+# every concurrent cycle. Multicall batching only waits for company when there can be some.
+ACT_CONCURRENCY = 1 if SHARD_WORKERS else (PIPELINE_WORKERS["ACT"] if PIPELINE_MODE else MAX_CONCURRENT_CYCLES)
+
+# Event-driven mode: sense every TRIGGER_POLL_SECONDS, but only THINK/ACT when a trigger fires
+TRIGGER_MODE = os.getenv("TRIGGER_MODE", "0") == "1"
+TRIGGER_POLL_SECONDS = float(os.getenv("TRIGGER_POLL_SECONDS", "15"))
+TRIGGER_PRICE_MOVE_PCT = float(os.getenv("TRIGGER_PRICE_MOVE_PCT", "0.01"))   # 1%
+TRIGGER_RSI_BAND = (30.0, 70.0)
+TRIGGER_HEARTBEAT_SECONDS = float(os.getenv("TRIGGER_HEARTBEAT_SECONDS", str(SLEEP_DELAY_SECONDS)))
+
+# Append-only SQLite (WAL) history of every cycle; the dashboard reads from it
+CYCLE_JOURNAL_PATH = os.getenv("CYCLE_JOURNAL_PATH", DEFAULT_JOURNAL_PATH)
+
+# Warm-state snapshot (trigger anchors, caches, schedule, last decisions) restored on startup.
+# Saved every CHECKPOINT_INTERVAL_SECONDS and on shutdown (0 = off).
+CHECKPOINT_PATH = os.getenv("CHECKPOINT_PATH", DEFAULT_CHECKPOINT_PATH)
+CHECKPOINT_INTERVAL_SECONDS = float(os.getenv("CHECKPOINT_INTERVAL_SECONDS", "60"))
+
+# Prometheus-format latency histograms at http://127.0.0.1:<port>/metrics (0 = off)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+class Orchestrator:
+    def __init__(self):
+        # Each layer loads on first use; a failure only takes out that layer
+        self._data = LazyComponent("Data Layer", "data_layer", "fetch_market_context", instantiate=False)
+        self._brain = LazyComponent("AI Brain (Groq)", "ai_brain.crew_manager", "AIBrain")
+        self._executor = LazyComponent("Execution Layer", "execution_layer.safe_integration", "SafeExecutor")
+        self._notifier = LazyComponent("Discord Notifier", "frontend_layer.discord_bot", "DiscordNotifier")
+
+        self._state_lock = threading.Lock()  # Cycles for different tickers run concurrently
+        self._in_flight = set()  # Tickers queued in the pipeline / shards
+        self._journal = None
+        self.profiler: Optional[CycleProfiler] = None  # Set by --profile
+        self.checkpointer: Optional[Checkpointer] = None
+        self.last_decisions = {}  # ticker -> latest journaled decision (checkpointed)
+        self.triggers = None
+        if TRIGGER_MODE:
+            self.triggers = build_default_engine(
+                TRIGGER_PRICE_MOVE_PCT, TRIGGER_RSI_BAND[0], TRIGGER_RSI_BAND[1], TRIGGER_HEARTBEAT_SECONDS
+            )
+
+    @property
+    def brain(self):
+        return self._brain.get()
+
+    @property
+    def executor(self):
+        return self._executor.get()
+
+    @property
+    def notifier(self):
+        return self._notifier.get()
+
+    @property
+    def journal(self) -> CycleJournal:
+        # Opened on first write, so shard worker processes never touch the database
+        with self._state_lock:
+            if self._journal is None:
+                self._journal = CycleJournal(CYCLE_JOURNAL_PATH)
+            return self._journal
+
+    def mock_brain_decision(self, context):
+        print("\n[🤖 MOCK BRAIN] Fallback active...")
+        if context.rsi_14 and context.rsi_14 < 30:
+            return TradeProposal("mock", "Chad", "BUY", context.target_asset_symbol, 0.1, "RSI Oversold")
+        return TradeProposal("mock", "Warren", "HOLD_Existing", context.target_asset_symbol, 0.0, "Safety first")
+
+    # ==========================================
+    # CYCLE STAGES
+    # Each stage takes the CycleRecord, fills in its part and returns it (or None
+    # to end the cycle early), so the same code runs sequentially (run_cycle)
+    # or as a pipeline (PIPELINE_MODE).
+    # ==========================================
+    def sense(self, record: CycleRecord) -> Optional[CycleRecord]:
+        print(f"--- SENSING [{record.ticker}] ---")
+        fetch_market_context = self._data.get()
+        if fetch_market_context is None:
+            raise RuntimeError(f"Data layer unavailable: {self._data.error}")
+        record.context = fetch_market_context(record.ticker)
+        print(f"Price: {record.context.current_price:.2f} | RSI: {record.context.rsi_14:.2f}")
+
+        if self.triggers:
+            record.trigger_reasons = self.triggers.evaluate(record.ticker, record.context)
+            if not record.trigger_reasons:
+                print(f"😴 No trigger fired for {record.ticker}, skipping THINK/ACT")
+                record.status = "IDLE"
+                return None
+            print(f"⚡ TRIGGERED: {'; '.join(record.trigger_reasons)}")
+        return record
+
+    def think(self, record: CycleRecord) -> CycleRecord:
+        print(f"--- THINKING [{record.ticker}] ---")
+        market_context = record.context
+
+        brain = self.brain
+        if brain:
+            try:
+                proposal = brain.start_debate(market_context)
+            except DeadlineExceeded:
+                raise
+            except Exception as e:
+                print(f"❌ Brain Error: {e}")
+                proposal = self.mock_brain_decision(market_context)
+        else:
+            proposal = self.mock_brain_decision(market_context)
+
+        print(f"👉 DECISION: {proposal.action} by {proposal.proposing_agent_name}")
+        print(f"👉 REASON: {proposal.reasoning_summary}")
+        if brain and brain.metrics.calls:
+            usage = brain.metrics.snapshot()["last_call"]
+            print(f"🧾 LLM: {usage['prompt_tokens']} prompt / {usage['completion_tokens']} completion tokens in {usage['latency_seconds']:.2f}s")
+
+        record.proposal = proposal
+        return record
+
+    def act(self, record: CycleRecord) -> CycleRecord:
+        print(f"--- EXECUTING [{record.ticker}] ---")
+        proposal = record.proposal
+        if proposal.action == "HOLD_Existing":
+            print("🛑 No Action Taken (HOLD)")
+            return record
+
+        executor = self.executor
+        if executor is None:
+            print("❌ Transaction Failed (execution layer unavailable)")
+            return record
+
+        # 2-of-3: the committee's YEA voters sign (EXECUTION_MODE=safe collects their signatures)
+        record.vote = VoteResult(proposal, passed=True, total_votes_yea=2, total_votes_nay=1,
+                                 yea_voter_names=["Chad", "Atlas"])
+        tx_hash = executor.execute_vote(proposal, record.vote.yea_voter_names, record.vote,
+                                        batch=ACT_CONCURRENCY > 1)
+        if tx_hash:
+            print("✅ Transaction Signed & Broadcasted")
+            record.tx_hash = tx_hash
+            # Mined / reverted / dropped is journaled when the tracker sees it, not awaited here
+            executor.tracker.add_callback(tx_hash, lambda outcome: self.journal.append_tx_event(record.ticker, outcome))
+        else:
+            print("❌ Transaction Failed")
+        return record
+
+    def notify(self, record: CycleRecord) -> CycleRecord:
+        print(f"--- NOTIFYING [{record.ticker}] ---")
+        proposal = record.proposal
+        notifier = self.notifier
+        if notifier is None:
+            print("🔕 Discord notifier unavailable, skipping")
+            return record
+        notifier.post_trade_decision(
+            record.ticker,
+            proposal.action,
+            proposal.proposing_agent_name,
+            proposal.reasoning_summary,
+            True
+        )
+        print("💬 Discord Sent")
+        return record
+
+    def save(self, record: CycleRecord) -> CycleRecord:
+        # --- SAVE TO THE CYCLE JOURNAL (the dashboard reads from it) ---
+        record.status = "OK"
+        self.journal.append(record)
+        with self._state_lock:
+            self.last_decisions[record.ticker] = {
+                "at": record.started_at.isoformat(),
+                "action": record.proposal.action if record.proposal else None,
+                "agent": record.proposal.proposing_agent_name if record.proposal else None,
+                "tx_hash": record.tx_hash,
+            }
+        print("💾 Cycle Journaled")
+        return record
+
+    def new_record(self, ticker: str) -> CycleRecord:
+        """A fresh CycleRecord whose deadline starts now (queueing time counts against it)."""
+        deadline_at = Deadline(CYCLE_BUDGET_SECONDS).expires_at if CYCLE_BUDGET_SECONDS else None
+        return CycleRecord(ticker=ticker, started_at=datetime.now(), deadline_at=deadline_at)
+
+    def _bounded(self, name: str, fn):
+        """Runs a stage under the record's deadline: checked on entry, visible to every I/O call inside."""
+        def stage(record: CycleRecord):
+            deadline = None
+            if record.deadline_at is not None:
+                deadline = Deadline(CYCLE_BUDGET_SECONDS, expires_at=record.deadline_at)
+                deadline.check(name)
+            with deadline_scope(deadline):
+                return fn(record)
+        return stage
+
+    def stage_specs(self):
+        """The cycle as ordered (name, stage, workers) specs, each deadline-bounded and timed into `stage_seconds`."""
+        stages = [
+            ("SENSE", self.sense), ("THINK", self.think), ("ACT", self.act),
+            ("NOTIFY", self.notify), ("SAVE", self.save),
+        ]
+        return [
+            StageSpec(name, timed_fn("stage_seconds", self._bounded(name, fn), stage=name.lower()), PIPELINE_WORKERS[name])
+            for name, fn in stages
+        ]
+
+    def run_cycle(self, ticker="BTC/USDT") -> CycleRecord:
+        print(f"\n{'='*40}")
+        print(f"🚀 STARTING CYCLE: {ticker} at {datetime.now().strftime('%H:%M:%S')}")
+        print(f"{'='*40}")
+
+        record = self.new_record(ticker)
+        profiling = self.profiler.cycle(ticker) if self.profiler else nullcontext()
+        try:
+            # Failures are counted once, by _on_cycle_error
+            with profiling, timed("cycle_seconds", count_errors=False):
+                for spec in self.stage_specs():
+                    # A stage returning None ends the cycle early (no trigger fired)
+                    if spec.fn(record) is None:
+                        break
+        except Exception as e:
+            self._on_cycle_error(record, "CYCLE", e)
+        return record
+
+    def _on_cycle_error(self, record: CycleRecord, stage: str, error: Exception):
+        record.error = f"{stage}: {error}"
+        if isinstance(error, DeadlineExceeded):
+            # Whatever the finished stages filled in (context, proposal) is kept on the record
+            record.status = "TIMEOUT"
+            print(f"⌛ CYCLE TIMEOUT [{record.ticker} @ {stage}]: {error}")
+        else:
+            record.status = "ERROR"
+            print(f"❌ CYCLE ERROR [{record.ticker} @ {stage}]: {error}")
+        self._count_failure(record, stage)
+        self.journal.append(record)  # Failed cycles are part of the audit trail too
+
+    @staticmethod
+    def _count_failure(record: CycleRecord, stage: str):
+        """The one place a failed cycle is counted: cycle_errors_total{stage, outcome="timeout"|"error"}."""
+        REGISTRY.inc("cycle_errors_total", stage=stage.lower(), outcome=record.status.lower())
+
+    # ==========================================
+    # PIPELINE MODE
+    # ==========================================
+    def start_pipeline(self) -> StagedPipeline:
+        self.pipeline = StagedPipeline(
+            self.stage_specs(),
+            queue_size=PIPELINE_QUEUE_SIZE,
+            on_complete=self._pipeline_done,
+            on_error=self._pipeline_error,
+        )
+        self.pipeline.start()
+        return self.pipeline
+
+    def _claim(self, ticker: str) -> bool:
+        """Marks a ticker in flight; False if its previous cycle has not finished yet."""
+        with self._state_lock:
+            if ticker in self._in_flight:
+                print(f"⏭️  {ticker} still in flight, skipping this slot")
+                return False
+            self._in_flight.add(ticker)
+            return True
+
+    def submit_cycle(self, ticker: str):
+        """Scheduler entry point in pipeline mode. Blocks while SENSE is backed up."""
+        if not self._claim(ticker):
+            return
+        print(f"🚀 QUEUED CYCLE: {ticker} at {datetime.now().strftime('%H:%M:%S')}")
+        self.pipeline.submit(self.new_record(ticker))
+
+    def _pipeline_done(self, record: CycleRecord):
+        with self._state_lock:
+            self._in_flight.discard(record.ticker)
+
+    def _pipeline_error(self, record: CycleRecord, stage: str, error: Exception):
+        try:
+            self._on_cycle_error(record, stage, error)
+        finally:
+            self._pipeline_done(record)  # Even if journaling the failure failed
+
+    # ==========================================
+    # SHARDED MODE
+    # ==========================================
+    def start_shards(self, tickers) -> ShardedCoordinator:
+        self.shards = ShardedCoordinator(SHARD_WORKERS, "main_orchestrator:Orchestrator", self._finish_sharded_cycle)
+        self.shards.start()
+        for shard_id, assigned in self.shards.assignments(tickers).items():
+            print(f"🧩 Shard #{shard_id}: {', '.join(assigned) or '-'}")
+        return self.shards
+
+    def submit_sharded(self, ticker: str):
+        """Scheduler entry point in sharded mode: route SENSE + THINK to the ticker's worker."""
+        if not self._claim(ticker):
+            return
+        shard_id = self.shards.submit(ticker, self.new_record(ticker).deadline_at)
+        print(f"🚀 QUEUED CYCLE: {ticker} -> shard #{shard_id} at {datetime.now().strftime('%H:%M:%S')}")
+
+    def _finish_sharded_cycle(self, record: CycleRecord, timings: dict):
+        """Runs in the coordinator's collector thread: the single ACT/NOTIFY/SAVE path."""
+        for stage, seconds in timings.items():
+            REGISTRY.observe("stage_seconds", seconds, stage=stage)
+        try:
+            if record.status in ("ERROR", "TIMEOUT"):
+                print(f"❌ CYCLE {record.status} [{record.ticker}]: {record.error}")
+                self._count_failure(record, "SHARD")
+                self.journal.append(record)
+            elif record.status != "IDLE":
+                stages = {spec.name: spec.fn for spec in self.stage_specs()}
+                for name in ("ACT", "NOTIFY", "SAVE"):
+                    stages[name](record)
+        except Exception as e:
+            self._on_cycle_error(record, "COORDINATOR", e)
+        finally:
+            self._pipeline_done(record)
+
+    # ==========================================
+    # CHECKPOINTING
+    # ==========================================
+    def _snapshot_decisions(self) -> dict:
+        with self._state_lock:
+            return dict(self.last_decisions)
+
+    def _restore_decisions(self, snapshot: dict):
+        with self._state_lock:
+            self.last_decisions.update(snapshot)
+
+    def start_checkpointing(self, scheduler: CycleScheduler):
+        """
+        Restores the last checkpoint (if fresh enough) and starts saving periodically.
+        Nonces are not checkpointed: the execution layer syncs them from the node on first use.
+        In sharded mode trigger state and caches live in the worker processes and start cold.
+        """
+        self.checkpointer = Checkpointer(CHECKPOINT_PATH, CHECKPOINT_INTERVAL_SECONDS)
+        self.checkpointer.register("scheduler", scheduler.snapshot, scheduler.restore)
+        self.checkpointer.register("decisions", self._snapshot_decisions, self._restore_decisions)
+        if not SHARD_WORKERS:
+            if self.triggers:
+                self.checkpointer.register("triggers", self.triggers.snapshot, self.triggers.restore)
+            if self._data.available:
+                import data_layer
+                self.checkpointer.register("market_data_cache", data_layer.snapshot_cache, data_layer.restore_cache)
+        self.checkpointer.restore()
+        self.checkpointer.start()
+
+    # ==========================================
+    # METRICS
+    # ==========================================
+    def start_metrics(self, scheduler: CycleScheduler):
+        """Registers scrape-time gauges and serves /metrics on METRICS_PORT."""
+        REGISTRY.describe("stage_seconds", "Wall time per run_cycle stage")
+        REGISTRY.describe("external_call_seconds", "Latency of calls to ccxt, alternative.me, Groq, RPC and Discord")
+        REGISTRY.register_gauge(
+            "schedule_lag_max_seconds", lambda: scheduler.lag_stats()["overall"]["max_seconds"],
+            "Worst observed schedule lag"
+        )
+        if getattr(self, "pipeline", None):
+            REGISTRY.register_gauge(
+                "pipeline_queue_depth",
+                lambda: [({"stage": s["stage"].lower()}, s["queue_depth"]) for s in self.pipeline.stats()],
+                "Items waiting in front of each pipeline stage"
+            )
+        REGISTRY.register_gauge(
+            "tx_pending", lambda: self.executor.tracker.pending_count() if self._executor.loaded and self.executor else 0,
+            "Broadcast transactions not yet mined, replaced or dropped"
+        )
+        REGISTRY.register_gauge(
+            "treasury_balance_wei",
+            lambda: ([({"account": label}, wei) for label, wei in self.executor.balances.snapshot().items()]
+                     if self._executor.loaded and self.executor else []),
+            "ETH balance of the relayer (and the Safe), refreshed every block"
+        )
+        if self.triggers:
+            REGISTRY.register_gauge(
+                "trigger_suppressed_observations", lambda: self.triggers.stats()["suppressed"],
+                "Sensing passes that did not trigger a cycle"
+            )
+
+        if METRICS_PORT:
+            try:
+                instrumentation.start_metrics_server(METRICS_PORT)
+                print(f"📊 Metrics: http://127.0.0.1:{METRICS_PORT}/metrics")
+            except OSError as e:
+                print(f"⚠️ Metrics endpoint disabled: {e}")
+
+    def print_report(self):
+        """Periodic console report: p50/p99 per stage (plus pipeline stats in pipeline mode)."""
+        for stage, s in REGISTRY.summary("stage_seconds").items():
+            print(f"⏱️  [Latency] {stage:<7} n={s['count']} p50={s['p50']:.2f}s p99={s['p99']:.2f}s")
+        if getattr(self, "pipeline", None):
+            self.pipeline.print_report()
+        if getattr(self, "shards", None):
+            self.shards.print_report()
+        rpc = self.executor.rpc_stats() if self._executor.loaded and self.executor else None
+        if rpc:
+            print(f"🔌 [RPC] {rpc['calls']} calls in {rpc['batches']} round trips (avg batch {rpc['avg_batch_size']:.1f})")
+            for name, ep in rpc.get("endpoints", {}).items():
+                state = "ok" if ep["healthy"] and ep["in_sync"] else ("lagging" if ep["healthy"] else "down")
+                latency = f"{ep['latency_ms']:.0f}ms" if ep["latency_ms"] is not None else "-"
+                print(f"🔌 [RPC]   {name:<28} {state:<7} block {ep['block']} {latency} calls={ep['calls']} errors={ep['errors']}")
+
+    def start_autonomous_mode(self):
+        universe = parse_ticker_universe(TICKERS, SLEEP_DELAY_SECONDS)
+        if TRIGGER_MODE:
+            # Sensing is cheap; poll often and let the triggers decide when to think
+            universe = {ticker: min(interval, TRIGGER_POLL_SECONDS) for ticker, interval in universe.items()}
+            print(f"⚡ Event-driven Mode: move {TRIGGER_PRICE_MOVE_PCT:.1%}, RSI band {TRIGGER_RSI_BAND}, "
+                  f"sentiment flips, heartbeat {TRIGGER_HEARTBEAT_SECONDS:.0f}s")
+        print(f"\n🤖 SYSTEM ONLINE: Autonomous Mode Activated")
+        print(f"📋 Universe: {len(universe)} tickers | Max concurrent cycles: {MAX_CONCURRENT_CYCLES}")
+        for ticker, interval in universe.items():
+            print(f"⏱️  {ticker}: every {interval:.0f} seconds")
+        print("---------------------------------------------------")
+
+        run_fn = self.run_cycle
+        if SHARD_WORKERS:
+            print(f"🧩 Sharded Mode: {SHARD_WORKERS} worker processes (SENSE + THINK)")
+            self.start_shards(list(universe))
+            run_fn = self.submit_sharded
+        elif PIPELINE_MODE:
+            print(f"🏭 Pipeline Mode: {PIPELINE_WORKERS} workers, queue size {PIPELINE_QUEUE_SIZE}")
+            self.start_pipeline()
+            run_fn = self.submit_cycle
+
+        if CYCLE_BUDGET_SECONDS:
+            print(f"⌛ Cycle budget: {CYCLE_BUDGET_SECONDS:.0f}s per cycle")
+        overrun = CYCLE_BUDGET_SECONDS + CYCLE_OVERRUN_GRACE_SECONDS if CYCLE_BUDGET_SECONDS else None
+        scheduler = CycleScheduler(run_fn, universe, max_concurrency=MAX_CONCURRENT_CYCLES,
+                                   on_report=self.print_report, overrun_seconds=overrun)
+        self.start_metrics(scheduler)
+        if CHECKPOINT_INTERVAL_SECONDS:
+            self.start_checkpointing(scheduler)
+        try:
+            scheduler.run_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 MANUAL OVERRIDE: Stopping Bot.")
+            scheduler.stop(wait=False)
+            scheduler.print_report()
+            if getattr(self, "shards", None):
+                self.shards.stop()
+            if getattr(self, "pipeline", None):
+                # Records already in ACT/NOTIFY/SAVE finish (each within its cycle budget) and get journaled
+                print("🏭 Draining the pipeline...")
+                self.pipeline.stop(timeout=CYCLE_BUDGET_SECONDS or None)
+            if self.checkpointer:
+                self.checkpointer.stop()
+            self.journal.close()
+            sys.exit(0)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Three-Body Portfolio orchestrator")
+    parser.add_argument("--profile", action="store_true",
+                        help="Capture cycle profiles (sequential mode only)")
+    parser.add_argument("--profile-every", type=int, default=10, metavar="N",
+                        help="cProfile every Nth cycle (.pstats); 0 = never")
+    parser.add_argument("--profile-slow", type=float, default=30.0, metavar="SECONDS",
+                        help="Keep sampled stacks (.collapsed) of cycles slower than this; 0 = never")
+    parser.add_argument("--profile-dir", default=DEFAULT_PROFILE_DIR)
+    parser.add_argument("--profile-max-files", type=int, default=50,
+                        help="Oldest profiles are deleted beyond this many")
+    return parser.parse_args(argv)
+
+if __name__ == "__main__":
+    args = parse_args()
+    bot = Orchestrator()
+    if args.profile:
+        if SHARD_WORKERS or PIPELINE_MODE:
+            print("⚠️ --profile only covers sequential cycles; stages in pipeline/sharded mode are not profiled")
+        bot.profiler = CycleProfiler(args.profile_every, args.profile_slow, args.profile_dir, args.profile_max_files)
+        print(f"🔬 Profiling: cProfile every {args.profile_every} cycles, stacks of cycles > {args.profile_slow:.0f}s "
+              f"-> {args.profile_dir} (max {args.profile_max_files} files)")
     bot.start_autonomous_mode()
\ No newline at end of file
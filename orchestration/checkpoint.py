@@ -0,0 +1,126 @@
+import json
+import os
+import threading
+import time
+import zlib
+from typing import Callable, Dict, List, Optional, Tuple
+
+CHECKPOINT_VERSION = 1
+DEFAULT_CHECKPOINT_PATH = os.path.join("state", "checkpoint.json.z")
+
+
+# time.monotonic() values mean nothing after a restart, so snapshots store wall-clock
+# time and restore() maps it back onto the new process's monotonic clock.
+def mono_to_wall(t: Optional[float]) -> Optional[float]:
+    return None if t is None else time.time() - (time.monotonic() - t)
+
+
+def wall_to_mono(t: Optional[float]) -> Optional[float]:
+    return None if t is None else time.monotonic() - (time.time() - t)
+
+
+class Checkpointer:
+    """
+    Periodically snapshots warm in-memory state (trigger anchors, caches, schedule
+    positions, last decisions) to one compact file, and restores it on startup.
+
+    Each component registers a `snapshot() -> JSON-able` and `restore(state)` pair.
+    The file is zlib-compressed JSON written to a temp file, fsynced and renamed over
+    the old one, so a crash mid-write leaves the previous checkpoint intact.
+    """
+
+    def __init__(self, path: str = DEFAULT_CHECKPOINT_PATH, interval_seconds: float = 60.0,
+                 max_age_seconds: float = 3600.0):
+        self.path = path
+        self.interval_seconds = interval_seconds
+        self.max_age_seconds = max_age_seconds  # Older checkpoints are ignored (too stale to be "warm")
+        self._components: Dict[str, Tuple[Callable[[], object], Callable[[object], None]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.saves = 0
+        self.last_size_bytes = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def register(self, name: str, snapshot: Callable[[], object], restore: Callable[[object], None]):
+        self._components[name] = (snapshot, restore)
+
+    # --- Saving ---
+    def save(self) -> int:
+        """Writes a checkpoint now; returns its size in bytes (0 if it failed)."""
+        components = {}
+        for name, (snapshot, _restore) in self._components.items():
+            try:
+                components[name] = snapshot()
+            except Exception as e:
+                print(f"⚠️ [Checkpoint] Skipping {name}: {e}")
+        payload = {"version": CHECKPOINT_VERSION, "saved_at": time.time(), "components": components}
+        blob = zlib.compress(json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8"), 6)
+
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"❌ [Checkpoint] Write failed: {e}")
+            return 0
+        self.saves += 1
+        self.last_size_bytes = len(blob)
+        return len(blob)
+
+    def start(self):
+        """Saves every `interval_seconds` from a daemon thread."""
+        self._thread = threading.Thread(target=self._loop, name="checkpointer", daemon=True)
+        self._thread.start()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval_seconds):
+            self.save()
+
+    def stop(self):
+        """Stops the periodic thread and writes a final checkpoint."""
+        self._stop.set()
+        self.save()
+
+    # --- Restoring ---
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        try:
+            with open(self.path, "rb") as f:
+                payload = json.loads(zlib.decompress(f.read()).decode("utf-8"))
+        except (OSError, ValueError, zlib.error) as e:
+            print(f"⚠️ [Checkpoint] Ignoring unreadable checkpoint {self.path}: {e}")
+            return None
+        if payload.get("version") != CHECKPOINT_VERSION:
+            print(f"⚠️ [Checkpoint] Ignoring checkpoint version {payload.get('version')}")
+            return None
+        return payload
+
+    def restore(self) -> List[str]:
+        """Restores every registered component found in the checkpoint; returns their names."""
+        started = time.perf_counter()
+        payload = self.load()
+        if payload is None:
+            print("🧊 [Checkpoint] No checkpoint found, starting cold")
+            return []
+
+        age = time.time() - payload["saved_at"]
+        if age > self.max_age_seconds:
+            print(f"🧊 [Checkpoint] Checkpoint is {age / 60:.0f} min old, starting cold")
+            return []
+
+        restored = []
+        for name, state in payload["components"].items():
+            if name not in self._components:
+                continue
+            try:
+                self._components[name][1](state)
+                restored.append(name)
+            except Exception as e:
+                print(f"⚠️ [Checkpoint] Could not restore {name}: {e}")
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        print(f"🔥 [Checkpoint] Restored {', '.join(restored) or 'nothing'} from {age:.0f}s ago ({elapsed_ms:.0f} ms)")
+        return restored
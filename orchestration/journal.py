@@ -0,0 +1,216 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from dataclasses import asdict
+from typing import List, Optional
+
+from shared_models import CycleRecord
+
+DEFAULT_JOURNAL_PATH = os.path.join("state", "cycle_journal.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id       INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts       REAL NOT NULL,      -- cycle start, unix seconds
+    ticker   TEXT NOT NULL,
+    status   TEXT NOT NULL,      -- OK / IDLE / ERROR / TIMEOUT
+    decision TEXT,
+    tx_hash  TEXT,
+    record   TEXT NOT NULL       -- full CycleRecord (context, proposal, vote, tx) as JSON
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_ticker_ts ON cycles (ticker, ts);
+CREATE INDEX IF NOT EXISTS idx_cycles_ts ON cycles (ts);
+CREATE TABLE IF NOT EXISTS tx_events (
+    id           INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts           REAL NOT NULL,  -- when the outcome was observed, unix seconds
+    tx_hash      TEXT NOT NULL,
+    ticker       TEXT,
+    status       TEXT NOT NULL,  -- CONFIRMED / REVERTED / REPLACED / DROPPED
+    block_number INTEGER,
+    gas_used     INTEGER,
+    latency      REAL            -- broadcast -> outcome, seconds
+);
+CREATE INDEX IF NOT EXISTS idx_tx_events_hash ON tx_events (tx_hash);
+"""
+
+INSERT_CYCLE = "INSERT INTO cycles (ts, ticker, status, decision, tx_hash, record) VALUES (?, ?, ?, ?, ?, ?)"
+INSERT_TX_EVENT = (
+    "INSERT INTO tx_events (ts, tx_hash, ticker, status, block_number, gas_used, latency) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?)"
+)
+
+_STOP = object()
+
+
+def record_to_row(record: CycleRecord) -> tuple:
+    payload = json.dumps(asdict(record), default=str, separators=(",", ":"))
+    decision = record.proposal.action if record.proposal else None
+    return (record.started_at.timestamp(), record.ticker, record.status, decision, record.tx_hash, payload)
+
+
+class CycleJournal:
+    """
+    Append-only cycle history in SQLite (WAL mode).
+
+    Appends are queued and written by one background thread that groups up to
+    `batch_size` rows (or whatever arrived within `flush_interval_seconds`) into a
+    single transaction, so there is one fsync per batch instead of one per cycle.
+    WAL lets the dashboard, backtests and audits read while the bot writes, and a
+    reader never sees a half-written row. A batch that fails to commit is kept and
+    retried with backoff rather than dropped.
+    """
+
+    def __init__(self, path: str = DEFAULT_JOURNAL_PATH, batch_size: int = 32,
+                 flush_interval_seconds: float = 1.0, retry_backoff_seconds: float = 0.5,
+                 max_retry_backoff_seconds: float = 30.0):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval_seconds = flush_interval_seconds
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.max_retry_backoff_seconds = max_retry_backoff_seconds
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+        self._queue = queue.Queue()
+        self._local = threading.local()
+        self.rows_written = 0
+        self.batches_written = 0
+
+        # Create the schema up front so readers never race the writer thread
+        conn = self._connect()
+        conn.executescript(SCHEMA)
+        conn.commit()
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_loop, name="journal-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=FULL")  # fsync per commit, and we commit per batch
+        return conn
+
+    # --- Writing ---
+    def append(self, record: CycleRecord):
+        """Queues a finished cycle. Never blocks the caller on disk I/O."""
+        self._queue.put((INSERT_CYCLE, record_to_row(record)))
+
+    def append_tx_event(self, ticker: Optional[str], outcome):
+        """Queues a transaction outcome (execution_layer.confirmation_tracker.TxOutcome)."""
+        self._queue.put((INSERT_TX_EVENT, (
+            time.time(), outcome.tx_hash, ticker, outcome.status,
+            outcome.block_number, outcome.gas_used, outcome.latency_seconds,
+        )))
+
+    def _write_loop(self):
+        conn = None
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.flush_interval_seconds
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    running = False
+                    break
+                batch.append(item)
+            conn = self._write_batch(conn, batch)
+        if conn is not None:
+            conn.close()
+
+    def _write_batch(self, conn: Optional[sqlite3.Connection], batch: list) -> Optional[sqlite3.Connection]:
+        """
+        Commits a batch, retrying with backoff until it lands (a locked or full disk
+        delays the journal, it does not lose cycles). Rows SQLite rejects outright are
+        written one by one so a single bad row cannot hold up the rest.
+        Returns the connection to keep using (None after a failure, to reconnect).
+        """
+        backoff = self.retry_backoff_seconds
+        while True:
+            try:
+                if conn is None:
+                    conn = self._connect()
+                try:
+                    self._commit(conn, batch)
+                except (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError) as e:
+                    print(f"⚠️ [Journal] Batch of {len(batch)} rejected ({e}), writing rows one by one")
+                    for entry in batch:
+                        try:
+                            self._commit(conn, [entry])
+                        except (sqlite3.IntegrityError, sqlite3.InterfaceError, sqlite3.ProgrammingError) as row_error:
+                            print(f"❌ [Journal] Dropping unwritable row {entry[1][:2]}: {row_error}")
+                return conn
+            except Exception as e:
+                print(f"❌ [Journal] Failed to write {len(batch)} rows ({e}), retrying in {backoff:.1f}s")
+                if conn is not None:
+                    try:
+                        conn.close()
+                    except Exception:
+                        pass
+                    conn = None
+                time.sleep(backoff)
+                backoff = min(backoff * 2, self.max_retry_backoff_seconds)
+
+    def _commit(self, conn: sqlite3.Connection, batch: list):
+        by_statement = {}
+        for sql, row in batch:
+            by_statement.setdefault(sql, []).append(row)
+        with conn:
+            for sql, rows in by_statement.items():
+                conn.executemany(sql, rows)
+        self.rows_written += len(batch)
+        self.batches_written += 1
+
+    def close(self, timeout: float = 5.0):
+        """Flushes everything queued so far and stops the writer."""
+        self._queue.put(_STOP)
+        self._writer.join(timeout=timeout)
+
+    # --- Reading ---
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._connect()
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+        return conn
+
+    def latest(self, ticker: Optional[str] = None) -> Optional[dict]:
+        """Most recent cycle (optionally for one ticker) as a dict."""
+        rows = self.history(ticker=ticker, limit=1)
+        return rows[0] if rows else None
+
+    def history(self, ticker: Optional[str] = None, since: Optional[float] = None,
+                until: Optional[float] = None, limit: int = 100) -> List[dict]:
+        """Cycles newest-first, filtered by ticker and unix-time range (uses the indexes)."""
+        clauses, params = [], []
+        if ticker:
+            clauses.append("ticker = ?")
+            params.append(ticker)
+        if since is not None:
+            clauses.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("ts < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = self._reader().execute(
+            f"SELECT record FROM cycles {where} ORDER BY ts DESC, id DESC LIMIT ?", (*params, limit)
+        ).fetchall()
+        return [json.loads(row["record"]) for row in rows]
+
+    def tx_event(self, tx_hash: str) -> Optional[dict]:
+        """Latest recorded outcome of a transaction, or None while it is still pending."""
+        row = self._reader().execute(
+            "SELECT * FROM tx_events WHERE tx_hash = ? ORDER BY id DESC LIMIT 1", (tx_hash,)
+        ).fetchone()
+        return dict(row) if row else None
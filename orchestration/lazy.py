@@ -0,0 +1,64 @@
+import importlib
+import threading
+import time
+from typing import Any, Optional
+
+
+class LazyComponent:
+    """
+    Imports `module_path` and resolves `attr` from it the first time `get()` is
+    called. If `instantiate` is set, the attribute is called to build the object.
+
+    A failure (missing package, bad .env, ...) is remembered and only disables this
+    one component, instead of switching off everything that shares an import block.
+    """
+
+    def __init__(self, label: str, module_path: str, attr: str, instantiate: bool = True):
+        self.label = label
+        self.module_path = module_path
+        self.attr = attr
+        self.instantiate = instantiate
+
+        self._lock = threading.Lock()
+        self._value = None
+        self._loaded = False
+        self.error: Optional[Exception] = None
+        self.load_seconds = 0.0
+
+    @classmethod
+    def of(cls, label: str, value: Any) -> "LazyComponent":
+        """An already-loaded component wrapping `value` (e.g. a stub in benchmarks)."""
+        component = cls(label, "", "", instantiate=False)
+        component._value = value
+        component._loaded = True
+        return component
+
+    @property
+    def loaded(self) -> bool:
+        """Whether a load was attempted already (does not trigger one)."""
+        return self._loaded
+
+    @property
+    def available(self) -> bool:
+        return self.get() is not None
+
+    def get(self) -> Optional[Any]:
+        if self._loaded:
+            return self._value
+
+        with self._lock:
+            if self._loaded:  # Another thread won the race
+                return self._value
+
+            started = time.perf_counter()
+            try:
+                module = importlib.import_module(self.module_path)
+                value = getattr(module, self.attr)
+                self._value = value() if self.instantiate else value
+                self.load_seconds = time.perf_counter() - started
+                print(f"✅ {self.label} loaded ({self.load_seconds * 1000:.0f} ms)")
+            except Exception as e:
+                self.error = e
+                print(f"⚠️ {self.label} unavailable: {e}")
+            self._loaded = True
+            return self._value
@@ -0,0 +1,151 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, List, Optional
+
+_STOP = object()  # Poison pill that shuts a worker down
+
+
+@dataclass
+class StageSpec:
+    """Describes one pipeline stage: a function applied by `workers` threads."""
+    name: str
+    fn: Callable[[Any], Any]
+    workers: int = 1
+
+
+class _Stage:
+    def __init__(self, spec: StageSpec, queue_size: int):
+        self.name = spec.name
+        self.fn = spec.fn
+        self.workers = spec.workers
+        self.inbox = queue.Queue(maxsize=queue_size)
+        self.threads: List[threading.Thread] = []
+
+        self._lock = threading.Lock()
+        self.processed = 0
+        self.errors = 0
+        self.busy_seconds = 0.0
+        self.blocked_seconds = 0.0  # Time spent waiting on a full downstream queue
+
+    def record(self, elapsed: float, failed: bool):
+        with self._lock:
+            if failed:
+                self.errors += 1
+            else:
+                self.processed += 1
+            self.busy_seconds += elapsed
+
+
+class StagedPipeline:
+    """
+    A chain of worker pools connected by bounded queues.
+
+    Each stage pulls an item from its inbox, applies its function and hands the
+    result to the next stage's inbox (a stage returning None ends the item early).
+    When a downstream queue is full the upstream workers block (backpressure), so
+    a slow ACT stage throttles SENSE instead of letting work pile up in memory.
+
+    A failing `on_complete` / `on_error` callback is logged and never takes its
+    worker down (ACT has a single worker; losing it would stall the pipeline).
+
+    While one ticker waits on its transaction receipt, others can be sensed and
+    thought about in parallel.
+    """
+
+    def __init__(self, stages: List[StageSpec], queue_size: int = 8,
+                 on_complete: Optional[Callable[[Any], None]] = None,
+                 on_error: Optional[Callable[[Any, str, Exception], None]] = None):
+        self.stages = [_Stage(spec, queue_size) for spec in stages]
+        self.on_complete = on_complete
+        self.on_error = on_error
+        self.started_at = None
+
+    def start(self):
+        self.started_at = time.monotonic()
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._worker, args=(index,), name=f"{stage.name.lower()}-{n}", daemon=True
+                )
+                thread.start()
+                stage.threads.append(thread)
+
+    def submit(self, item, timeout: Optional[float] = None):
+        """Feeds an item into the first stage. Blocks while that stage's queue is full."""
+        self.stages[0].inbox.put(item, timeout=timeout)
+
+    def _worker(self, index: int):
+        stage = self.stages[index]
+        next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+
+        while True:
+            item = stage.inbox.get()
+            if item is _STOP:
+                break
+
+            started = time.perf_counter()
+            try:
+                result = stage.fn(item)
+            except Exception as e:
+                stage.record(time.perf_counter() - started, failed=True)
+                self._callback(self.on_error, item, stage.name, e)
+                continue
+            stage.record(time.perf_counter() - started, failed=False)
+
+            if result is None:
+                # The stage decided this item is finished early (e.g. no trigger fired)
+                self._callback(self.on_complete, item)
+            elif next_stage is not None:
+                blocked_from = time.perf_counter()
+                next_stage.inbox.put(result)
+                with stage._lock:
+                    stage.blocked_seconds += time.perf_counter() - blocked_from
+            else:
+                self._callback(self.on_complete, result)
+
+    @staticmethod
+    def _callback(fn: Optional[Callable], *args):
+        if fn is None:
+            return
+        try:
+            fn(*args)
+        except Exception as e:
+            print(f"❌ [Pipeline] {getattr(fn, '__name__', fn)} failed: {e}")
+
+    def stop(self, timeout: Optional[float] = 5.0):
+        """Drains the pipeline stage by stage, then stops all workers."""
+        for stage in self.stages:
+            for _ in stage.threads:
+                stage.inbox.put(_STOP)
+            for thread in stage.threads:
+                thread.join(timeout=timeout)
+
+    def stats(self) -> List[dict]:
+        elapsed = max(time.monotonic() - (self.started_at or time.monotonic()), 1e-9)
+        report = []
+        for stage in self.stages:
+            with stage._lock:
+                done = stage.processed + stage.errors
+                report.append({
+                    "stage": stage.name,
+                    "workers": stage.workers,
+                    "queue_depth": stage.inbox.qsize(),
+                    "queue_capacity": stage.inbox.maxsize,
+                    "processed": stage.processed,
+                    "errors": stage.errors,
+                    "throughput_per_min": stage.processed / elapsed * 60,
+                    "avg_seconds": stage.busy_seconds / done if done else 0.0,
+                    "utilization": stage.busy_seconds / (elapsed * stage.workers),
+                    "blocked_seconds": stage.blocked_seconds,
+                })
+        return report
+
+    def print_report(self):
+        for s in self.stats():
+            print(
+                f"🏭 [Pipeline] {s['stage']:<7} q={s['queue_depth']}/{s['queue_capacity']} "
+                f"done={s['processed']} err={s['errors']} "
+                f"{s['throughput_per_min']:.1f}/min avg={s['avg_seconds']:.2f}s util={s['utilization']:.0%}"
+            )
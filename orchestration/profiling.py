@@ -0,0 +1,155 @@
+import cProfile
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+DEFAULT_PROFILE_DIR = os.path.join("state", "profiles")
+
+
+def collapse_stack(frame) -> str:
+    """'module:function;module:function;...' root first, the collapsed-stack format flamegraph.pl reads."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        module = os.path.splitext(os.path.basename(code.co_filename))[0]
+        names.append(f"{module}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    One background thread that samples the stacks of the threads currently
+    registered (one per cycle being profiled) every `interval_seconds`.
+    It only runs while something is registered.
+    """
+
+    def __init__(self, interval_seconds: float = 0.005):
+        self.interval_seconds = interval_seconds
+        self._lock = threading.Lock()
+        self._targets: Dict[int, Counter] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def register(self, thread_id: int) -> Counter:
+        samples = Counter()
+        with self._lock:
+            self._targets[thread_id] = samples
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+                self._thread.start()
+        return samples
+
+    def unregister(self, thread_id: int):
+        with self._lock:
+            self._targets.pop(thread_id, None)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._targets:
+                    self._thread = None
+                    return
+                targets = dict(self._targets)
+            frames = sys._current_frames()
+            for thread_id, samples in targets.items():
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    samples[collapse_stack(frame)] += 1
+            time.sleep(self.interval_seconds)
+
+
+class CycleProfiler:
+    """
+    Captures profiles of selected cycles into `out_dir`:
+
+    - every `every_n`-th cycle: a deterministic cProfile dump (.pstats, open with
+      `python -m pstats` or snakeviz)
+    - any other cycle slower than `slow_seconds`: sampled stacks in collapsed
+      format (.collapsed, feed to flamegraph.pl / speedscope)
+
+    Only the newest `max_files` profiles are kept. The orchestrator does not create
+    a profiler at all unless --profile is given, so the disabled cost is a None check.
+    """
+
+    def __init__(self, every_n: int = 10, slow_seconds: float = 30.0,
+                 out_dir: str = DEFAULT_PROFILE_DIR, max_files: int = 50,
+                 sample_interval_seconds: float = 0.005):
+        self.every_n = every_n
+        self.slow_seconds = slow_seconds
+        self.out_dir = out_dir
+        self.max_files = max_files
+        self.sampler = StackSampler(sample_interval_seconds)
+
+        self._lock = threading.Lock()
+        self.cycles = 0
+        self.written = 0
+        os.makedirs(out_dir, exist_ok=True)
+
+    @contextmanager
+    def cycle(self, ticker: str):
+        """Wraps one cycle; must be entered on the thread that runs the cycle."""
+        with self._lock:
+            self.cycles += 1
+            deterministic = self.every_n > 0 and self.cycles % self.every_n == 0
+
+        started = time.perf_counter()
+        if deterministic:
+            profile = cProfile.Profile()
+            profile.enable()
+            try:
+                yield
+            finally:
+                profile.disable()
+                self._write(ticker, "pstats", time.perf_counter() - started, profile.dump_stats)
+            return
+
+        thread_id = threading.get_ident()
+        samples = self.sampler.register(thread_id) if self.slow_seconds > 0 else None
+        try:
+            yield
+        finally:
+            if samples is not None:
+                self.sampler.unregister(thread_id)
+                elapsed = time.perf_counter() - started
+                if elapsed >= self.slow_seconds and samples:
+                    self._write(ticker, "collapsed", elapsed, lambda path: self._dump_collapsed(samples, path))
+
+    @staticmethod
+    def _dump_collapsed(samples: Counter, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def _write(self, ticker: str, kind: str, elapsed: float, dump):
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        name = f"{stamp}_{ticker.replace('/', '-')}_{elapsed * 1000:.0f}ms.{kind}"
+        path = os.path.join(self.out_dir, name)
+        try:
+            dump(path)
+        except OSError as e:
+            print(f"⚠️ [Profiler] Could not write {path}: {e}")
+            return
+        with self._lock:
+            self.written += 1
+            self._prune()
+        print(f"🔬 [Profiler] {ticker} cycle ({elapsed:.2f}s) -> {path}")
+
+    def _prune(self):
+        """Deletes the oldest profiles beyond `max_files`."""
+        files = [
+            os.path.join(self.out_dir, f) for f in os.listdir(self.out_dir)
+            if f.endswith((".pstats", ".collapsed"))
+        ]
+        if len(files) <= self.max_files:
+            return
+        files.sort(key=os.path.getmtime)
+        for path in files[:len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
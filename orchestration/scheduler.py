@@ -0,0 +1,269 @@
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+from instrumentation import REGISTRY
+from orchestration.checkpoint import mono_to_wall, wall_to_mono
+
+
+def parse_ticker_universe(spec: str, default_interval: float) -> Dict[str, float]:
+    """
+    Parses a ticker universe like "BTC/USDT,ETH/USDT:120,PEPE/USDT:60".
+    A ":<seconds>" suffix overrides the default interval for that ticker.
+    """
+    universe = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        ticker, _, interval = item.partition(":")
+        universe[ticker.strip()] = float(interval) if interval else float(default_interval)
+    return universe
+
+
+@dataclass
+class TickerSchedule:
+    ticker: str
+    interval_seconds: float
+    next_run: float          # time.monotonic() deadline for the next cycle
+    running: bool = False
+    runs: int = 0
+    skipped: int = 0         # Slots missed because the previous cycle was still running
+    started_at: float = 0.0  # time.monotonic() when the current run began
+    overruns: int = 0        # Runs the watchdog caught going past `overrun_seconds`
+    overrun_flagged: bool = False
+
+
+class LagStats:
+    """
+    Schedule lag = how late a cycle actually started vs. when it was due.
+    Growing lag means the concurrency cap is too low for the universe.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def record(self, lag: float):
+        self.count += 1
+        self.total += lag
+        self.max = max(self.max, lag)
+        self.last = lag
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "avg_seconds": self.total / self.count if self.count else 0.0,
+            "max_seconds": self.max,
+            "last_seconds": self.last,
+        }
+
+
+class CycleScheduler:
+    """
+    Runs `run_fn(ticker)` for a universe of tickers, each on its own interval.
+
+    - At most `max_concurrency` cycles run at once (global cap).
+    - First runs are jittered over `jitter_fraction` of each interval so that
+      dozens of pairs do not all hit the exchange and the LLM at the same second.
+    - A ticker whose previous cycle is still running skips that slot instead of
+      piling up work.
+    - If `overrun_seconds` is set, a watchdog thread reports cycles that are still
+      running past it (i.e. stuck in a call that ignored its deadline).
+    """
+
+    def __init__(self, run_fn: Callable[[str], None], universe: Dict[str, float],
+                 max_concurrency: int = 4, jitter_fraction: float = 0.5,
+                 report_every_seconds: float = 60.0, on_report: Optional[Callable[[], None]] = None,
+                 overrun_seconds: Optional[float] = None):
+        self.run_fn = run_fn
+        self.overrun_seconds = overrun_seconds
+        self.on_report = on_report  # Extra periodic report (e.g. pipeline stage stats)
+        self.max_concurrency = max_concurrency
+        self.jitter_fraction = jitter_fraction
+        self.report_every_seconds = report_every_seconds
+
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix="cycle")
+        self._slots = threading.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+
+        self._schedules: Dict[str, TickerSchedule] = {}
+        self._heap = []  # (next_run, seq, ticker)
+        self._seq = 0
+
+        self.lag = LagStats()
+        self.lag_by_ticker: Dict[str, LagStats] = {}
+
+        for ticker, interval in universe.items():
+            self.add_ticker(ticker, interval)
+
+    # --- Universe management ---
+    def add_ticker(self, ticker: str, interval_seconds: float):
+        jitter = random.uniform(0, interval_seconds * self.jitter_fraction)
+        with self._lock:
+            schedule = TickerSchedule(ticker, interval_seconds, time.monotonic() + jitter)
+            self._schedules[ticker] = schedule
+            self.lag_by_ticker.setdefault(ticker, LagStats())
+            self._push(schedule)
+        self._wakeup.set()
+
+    def remove_ticker(self, ticker: str):
+        with self._lock:
+            self._schedules.pop(ticker, None)  # Stale heap entries are dropped when popped
+
+    def _push(self, schedule: TickerSchedule):
+        self._seq += 1
+        heapq.heappush(self._heap, (schedule.next_run, self._seq, schedule.ticker))
+
+    # --- Main loop ---
+    def run_forever(self):
+        if self.overrun_seconds:
+            threading.Thread(target=self._watchdog, name="cycle-watchdog", daemon=True).start()
+        last_report = time.monotonic()
+        while not self._stop.is_set():
+            due = self._next_due()
+            if due is None:
+                continue
+
+            # Wait for a free slot; time spent here shows up as schedule lag
+            self._slots.acquire()
+            if self._stop.is_set():
+                self._slots.release()
+                break
+            self._pool.submit(self._run_one, due[0], due[1])
+
+            if time.monotonic() - last_report >= self.report_every_seconds:
+                self.print_report()
+                last_report = time.monotonic()
+
+    def _next_due(self) -> Optional[tuple]:
+        """Blocks until the earliest ticker is due; returns (schedule, due_time)."""
+        with self._lock:
+            if not self._heap:
+                wait = 1.0
+            else:
+                next_run, _, ticker = self._heap[0]
+                schedule = self._schedules.get(ticker)
+                if schedule is None or schedule.next_run != next_run:
+                    heapq.heappop(self._heap)  # Removed or rescheduled ticker
+                    return None
+
+                wait = next_run - time.monotonic()
+                if wait <= 0:
+                    heapq.heappop(self._heap)
+                    # Fixed-rate: the next slot is based on the due time, not the finish time
+                    schedule.next_run = next_run + schedule.interval_seconds
+                    if schedule.next_run < time.monotonic():
+                        schedule.next_run = time.monotonic() + schedule.interval_seconds
+                    self._push(schedule)
+
+                    if schedule.running:
+                        schedule.skipped += 1
+                        return None
+                    schedule.running = True
+                    schedule.started_at = time.monotonic()
+                    schedule.overrun_flagged = False
+                    return schedule, next_run
+
+        self._wakeup.wait(timeout=min(wait, 1.0))
+        self._wakeup.clear()
+        return None
+
+    def _run_one(self, schedule: TickerSchedule, due_time: float):
+        lag = max(0.0, time.monotonic() - due_time)
+        with self._lock:
+            self.lag.record(lag)
+            self.lag_by_ticker[schedule.ticker].record(lag)
+        REGISTRY.observe("schedule_lag_seconds", lag)
+        try:
+            self.run_fn(schedule.ticker)
+        except Exception as e:
+            print(f"❌ [Scheduler] Cycle for {schedule.ticker} crashed: {e}")
+        finally:
+            with self._lock:
+                schedule.running = False
+                schedule.runs += 1
+            self._slots.release()
+
+    def _watchdog(self):
+        """
+        Threads cannot be killed, so this only makes a stuck cycle visible (console +
+        `cycle_overruns_total`); the deadline inside the cycle is what ends it.
+        """
+        interval = min(5.0, self.overrun_seconds / 4)
+        while not self._stop.wait(interval):
+            now = time.monotonic()
+            with self._lock:
+                overrunning = [
+                    s for s in self._schedules.values()
+                    if s.running and not s.overrun_flagged and now - s.started_at > self.overrun_seconds
+                ]
+                for s in overrunning:
+                    s.overrun_flagged = True
+                    s.overruns += 1
+            for s in overrunning:
+                REGISTRY.inc("cycle_overruns_total", ticker=s.ticker)
+                print(f"🐕 [Watchdog] {s.ticker} cycle running for {now - s.started_at:.0f}s "
+                      f"(limit {self.overrun_seconds:.0f}s), still holding a slot")
+
+    def stop(self, wait: bool = True):
+        self._stop.set()
+        self._wakeup.set()
+        self._pool.shutdown(wait=wait)
+
+    # --- Checkpointing ---
+    def snapshot(self) -> dict:
+        """Per-ticker position in the schedule, so a restart resumes the cadence instead of re-jittering."""
+        with self._lock:
+            return {
+                ticker: {"next_run": mono_to_wall(s.next_run), "runs": s.runs, "skipped": s.skipped}
+                for ticker, s in self._schedules.items()
+            }
+
+    def restore(self, snapshot: dict):
+        with self._lock:
+            for ticker, saved in snapshot.items():
+                schedule = self._schedules.get(ticker)
+                if schedule is None:  # Ticker left the universe since the checkpoint
+                    continue
+                # Never schedule further out than one interval from now
+                next_run = min(wall_to_mono(saved["next_run"]), time.monotonic() + schedule.interval_seconds)
+                schedule.next_run = max(next_run, time.monotonic())
+                schedule.runs = saved["runs"]
+                schedule.skipped = saved["skipped"]
+                self._push(schedule)
+        self._wakeup.set()
+
+    # --- Metrics ---
+    def lag_stats(self) -> dict:
+        with self._lock:
+            return {
+                "overall": self.lag.as_dict(),
+                "tickers": {
+                    ticker: {
+                        **self.lag_by_ticker[ticker].as_dict(),
+                        "runs": s.runs,
+                        "skipped": s.skipped,
+                        "overruns": s.overruns,
+                        "interval_seconds": s.interval_seconds,
+                    }
+                    for ticker, s in self._schedules.items()
+                },
+            }
+
+    def print_report(self):
+        overall = self.lag_stats()["overall"]
+        print(
+            f"📈 [Scheduler] {len(self._schedules)} tickers | cycles: {overall['count']} | "
+            f"lag avg {overall['avg_seconds']:.2f}s, max {overall['max_seconds']:.2f}s"
+        )
+        if self.on_report:
+            self.on_report()
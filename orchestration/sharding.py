@@ -0,0 +1,232 @@
+import bisect
+import hashlib
+import importlib
+import multiprocessing as mp
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from deadlines import DeadlineExceeded
+from shared_models import CycleRecord
+
+_STOP = None  # Sentinel on a worker's task queue
+
+
+class ConsistentHashRing:
+    """
+    Maps tickers to shard ids with consistent hashing (`replicas` virtual nodes per
+    shard), so a ticker always lands on the same worker and its warm caches, and
+    resizing the pool only moves ~1/N of the universe.
+    """
+
+    def __init__(self, shard_ids: List[int], replicas: int = 64):
+        self.replicas = replicas
+        self._ring = []  # Sorted (hash, shard_id)
+        for shard_id in shard_ids:
+            self.add(shard_id)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.md5(key.encode("utf-8")).digest()[:8], "big")
+
+    def add(self, shard_id: int):
+        for replica in range(self.replicas):
+            bisect.insort(self._ring, (self._hash(f"shard-{shard_id}#{replica}"), shard_id))
+
+    def remove(self, shard_id: int):
+        self._ring = [node for node in self._ring if node[1] != shard_id]
+
+    def shard_for(self, key: str) -> int:
+        if not self._ring:
+            raise ValueError("Hash ring is empty")
+        index = bisect.bisect(self._ring, (self._hash(key), -1)) % len(self._ring)
+        return self._ring[index][1]
+
+
+def _load_factory(path: str) -> Callable:
+    module_name, _, attr = path.partition(":")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def _worker_main(shard_id: int, factory_path: str, tasks, results):
+    """
+    Worker process: builds its own orchestrator (its own data layer, AI brain,
+    trigger state and caches, all warm across cycles) and runs SENSE + THINK for
+    the tickers routed to it. ACT and everything after stays in the coordinator.
+    """
+    orchestrator = _load_factory(factory_path)()
+    # The orchestrator's own stage callables, so deadlines are enforced the same way
+    stages = {spec.name: spec.fn for spec in orchestrator.stage_specs()}
+    while True:
+        task = tasks.get()
+        if task is _STOP:
+            break
+        ticker, deadline_at = task
+
+        # The deadline was set at submit time, so time queued for this shard counts too
+        record = CycleRecord(ticker=ticker, started_at=datetime.now(), deadline_at=deadline_at)
+        timings = {}
+        try:
+            for stage in ("SENSE", "THINK"):
+                started = time.perf_counter()
+                result = stages[stage](record)
+                timings[stage.lower()] = time.perf_counter() - started
+                if result is None:  # No trigger fired: record.status is IDLE
+                    break
+        except DeadlineExceeded as e:
+            record.status = "TIMEOUT"
+            record.error = f"shard {shard_id}: {e}"
+        except Exception as e:
+            record.status = "ERROR"
+            record.error = f"shard {shard_id}: {e}"
+        results.put((shard_id, record, timings))
+
+
+class ShardedCoordinator:
+    """
+    Partitions the ticker universe over `num_workers` processes, so CPU-heavy
+    sensing (indicators, sentiment scoring, JSON parsing) and LLM response handling
+    are not serialized by the GIL.
+
+    The coordinator only routes tickers and collects results; `on_result(record,
+    timings)` runs in a single collector thread, which makes it the one execution
+    path for anything that must not run in parallel (signing, nonces).
+
+    The collector also checks on the workers every `check_interval_seconds`, busy
+    or not: when one dies, the tickers it still held come back as ERROR records
+    (so their cycles finish and can be scheduled again) and the worker is respawned.
+    """
+
+    def __init__(self, num_workers: int, factory_path: str,
+                 on_result: Callable[[CycleRecord, Dict[str, float]], None],
+                 check_interval_seconds: float = 5.0):
+        self.num_workers = num_workers
+        self.factory_path = factory_path
+        self.on_result = on_result
+        self.check_interval_seconds = check_interval_seconds
+
+        # "spawn" keeps workers clean of the coordinator's threads and sockets
+        self._ctx = mp.get_context("spawn")
+        self._results = self._ctx.Queue()
+        self._tasks: Dict[int, object] = {}
+        self._procs: Dict[int, mp.Process] = {}
+        self._pending: Dict[int, List[str]] = {i: [] for i in range(num_workers)}  # Tickers a worker holds
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+        self.ring = ConsistentHashRing(list(range(num_workers)))
+        self.submitted: Dict[int, int] = {i: 0 for i in range(num_workers)}
+        self.completed: Dict[int, int] = {i: 0 for i in range(num_workers)}
+        self.restarts = 0
+
+    def start(self):
+        for shard_id in range(self.num_workers):
+            self._spawn(shard_id)
+        self._collector = threading.Thread(target=self._collect, name="shard-collector", daemon=True)
+        self._collector.start()
+
+    def _spawn(self, shard_id: int):
+        tasks = self._ctx.Queue()
+        proc = self._ctx.Process(
+            target=_worker_main, args=(shard_id, self.factory_path, tasks, self._results),
+            name=f"shard-{shard_id}", daemon=True,
+        )
+        proc.start()
+        self._tasks[shard_id] = tasks
+        self._procs[shard_id] = proc
+
+    def submit(self, ticker: str, deadline_at: Optional[float] = None) -> int:
+        """Routes a ticker to its shard. A dead worker is respawned by the collector, which fails its tickers."""
+        shard_id = self.ring.shard_for(ticker)
+        with self._lock:
+            self.submitted[shard_id] += 1
+            self._pending[shard_id].append(ticker)
+            tasks = self._tasks[shard_id]
+        tasks.put((ticker, deadline_at))
+        return shard_id
+
+    def _collect(self):
+        next_check = time.monotonic() + self.check_interval_seconds
+        while not self._stopping.is_set():
+            try:
+                self._handle(*self._results.get(timeout=1.0))
+            except queue.Empty:
+                pass
+            # On a timer, not only when idle: under steady load the queue is never empty
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + self.check_interval_seconds
+
+    def _handle(self, shard_id: int, record: CycleRecord, timings: Dict[str, float]):
+        with self._lock:
+            if record.ticker not in self._pending[shard_id]:
+                # Already failed when the worker was found dead
+                print(f"⚠️ [Shards] Dropping late result for {record.ticker} from shard {shard_id}")
+                return
+            self._pending[shard_id].remove(record.ticker)
+        self._deliver(shard_id, record, timings)
+
+    def _deliver(self, shard_id: int, record: CycleRecord, timings: Dict[str, float]):
+        self.completed[shard_id] += 1
+        try:
+            self.on_result(record, timings)
+        except Exception as e:
+            print(f"❌ [Shards] Result handler failed for {record.ticker}: {e}")
+
+    def _check_workers(self):
+        """Respawns dead workers and fails the tickers they held through the normal result path."""
+        if self._stopping.is_set() or all(proc.is_alive() for proc in self._procs.values()):
+            return
+        # Deliver whatever the dead worker got into the pipe before it died, so only the
+        # tickers it really lost are failed
+        while True:
+            try:
+                self._handle(*self._results.get_nowait())
+            except queue.Empty:
+                break
+        for shard_id in range(self.num_workers):
+            with self._lock:
+                proc = self._procs[shard_id]
+                if proc.is_alive() or self._stopping.is_set():
+                    continue
+                print(f"⚠️ [Shards] Worker {shard_id} died (exit {proc.exitcode}), respawning")
+                self.restarts += 1
+                lost, self._pending[shard_id] = self._pending[shard_id], []
+                self._spawn(shard_id)
+            for ticker in lost:
+                record = CycleRecord(ticker=ticker, started_at=datetime.now(), status="ERROR",
+                                     error=f"shard {shard_id}: worker died (exit {proc.exitcode})")
+                self._deliver(shard_id, record, {})
+
+    def assignments(self, tickers: List[str]) -> Dict[int, List[str]]:
+        table = {shard_id: [] for shard_id in range(self.num_workers)}
+        for ticker in tickers:
+            table[self.ring.shard_for(ticker)].append(ticker)
+        return table
+
+    def stats(self) -> List[dict]:
+        return [
+            {
+                "shard": shard_id,
+                "alive": self._procs[shard_id].is_alive(),
+                "submitted": self.submitted[shard_id],
+                "completed": self.completed[shard_id],
+                "backlog": self.submitted[shard_id] - self.completed[shard_id],
+            }
+            for shard_id in range(self.num_workers)
+        ]
+
+    def print_report(self):
+        for s in self.stats():
+            print(f"🧩 [Shards] #{s['shard']} alive={s['alive']} done={s['completed']} backlog={s['backlog']}")
+
+    def stop(self, timeout: float = 5.0):
+        self._stopping.set()
+        for tasks in self._tasks.values():
+            tasks.put(_STOP)
+        for proc in self._procs.values():
+            proc.join(timeout=timeout)
+            if proc.is_alive():
+                proc.terminate()
@@ -0,0 +1,164 @@
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional
+
+from shared_models import MarketContext
+from orchestration.checkpoint import mono_to_wall, wall_to_mono
+
+
+@dataclass
+class TriggerState:
+    """What the market looked like the last time a full cycle fired for a ticker."""
+    last_fired_at: Optional[float] = None   # time.monotonic()
+    anchor_price: Optional[float] = None    # Price at the last fire
+    last_rsi: Optional[float] = None        # Most recent observation (for band crossings)
+    last_sentiment: Optional[str] = None    # Most recent observation (for flips)
+
+
+class Trigger:
+    """
+    A cheap condition evaluated on every observation.
+    Returns a short reason string when it wants a cycle, otherwise None.
+    """
+    name = "trigger"
+
+    def check(self, context: MarketContext, state: TriggerState, now: float) -> Optional[str]:
+        raise NotImplementedError
+
+
+class PriceMoveTrigger(Trigger):
+    """Fires when price moved more than `pct` (e.g. 0.01 = 1%) since the last cycle."""
+    name = "price_move"
+
+    def __init__(self, pct: float):
+        self.pct = pct
+
+    def check(self, context, state, now):
+        if not state.anchor_price:
+            return None
+        move = (context.current_price - state.anchor_price) / state.anchor_price
+        if abs(move) >= self.pct:
+            return f"price moved {move:+.2%}"
+        return None
+
+
+class RsiBandTrigger(Trigger):
+    """Fires when RSI crosses into (or out of) the oversold/overbought bands."""
+    name = "rsi_band"
+
+    def __init__(self, lower: float = 30.0, upper: float = 70.0):
+        self.lower = lower
+        self.upper = upper
+
+    def _zone(self, rsi: float) -> int:
+        if rsi < self.lower:
+            return -1
+        if rsi > self.upper:
+            return 1
+        return 0
+
+    def check(self, context, state, now):
+        if context.rsi_14 is None or state.last_rsi is None:
+            return None
+        before, after = self._zone(state.last_rsi), self._zone(context.rsi_14)
+        if before != after:
+            return f"RSI crossed band ({state.last_rsi:.1f} -> {context.rsi_14:.1f})"
+        return None
+
+
+class SentimentFlipTrigger(Trigger):
+    """Fires when the dominant sentiment changes (e.g. NEUTRAL -> BULLISH)."""
+    name = "sentiment_flip"
+
+    def check(self, context, state, now):
+        if state.last_sentiment and context.dominant_sentiment != state.last_sentiment:
+            return f"sentiment {state.last_sentiment} -> {context.dominant_sentiment}"
+        return None
+
+
+class HeartbeatTrigger(Trigger):
+    """Fires if no cycle has run for `max_interval_seconds`, even in a dead-quiet market."""
+    name = "heartbeat"
+
+    def __init__(self, max_interval_seconds: float):
+        self.max_interval_seconds = max_interval_seconds
+
+    def check(self, context, state, now):
+        if state.last_fired_at is None:
+            return "first observation"
+        if now - state.last_fired_at >= self.max_interval_seconds:
+            return f"heartbeat ({self.max_interval_seconds:.0f}s)"
+        return None
+
+
+class TriggerEngine:
+    """
+    Decides, per ticker, whether a freshly sensed MarketContext is worth a full
+    THINK/ACT cycle. Evaluation is a handful of float comparisons, so it can run
+    on every tick while the expensive LLM call only happens when something moved.
+    """
+
+    def __init__(self, triggers: List[Trigger]):
+        self.triggers = triggers
+        self._states: Dict[str, TriggerState] = {}
+        self._lock = threading.Lock()
+        self.fired: Dict[str, int] = {t.name: 0 for t in triggers}
+        self.suppressed = 0  # Observations that did not lead to a cycle
+
+    def evaluate(self, ticker: str, context: MarketContext) -> List[str]:
+        """
+        Returns the reasons a cycle should run (empty list = stay idle).
+        Updates the per-ticker state either way.
+        """
+        now = time.monotonic()
+        with self._lock:
+            state = self._states.setdefault(ticker, TriggerState())
+            reasons = []
+            for trigger in self.triggers:
+                reason = trigger.check(context, state, now)
+                if reason:
+                    reasons.append(reason)
+                    self.fired[trigger.name] += 1
+
+            if reasons:
+                state.last_fired_at = now
+                state.anchor_price = context.current_price
+            else:
+                self.suppressed += 1
+            state.last_rsi = context.rsi_14
+            state.last_sentiment = context.dominant_sentiment
+            return reasons
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"fired": dict(self.fired), "suppressed": self.suppressed}
+
+    # --- Checkpointing ---
+    def snapshot(self) -> dict:
+        with self._lock:
+            states = {
+                ticker: {**asdict(state), "last_fired_at": mono_to_wall(state.last_fired_at)}
+                for ticker, state in self._states.items()
+            }
+            return {"states": states, "fired": dict(self.fired), "suppressed": self.suppressed}
+
+    def restore(self, snapshot: dict):
+        with self._lock:
+            for ticker, state in snapshot["states"].items():
+                state["last_fired_at"] = wall_to_mono(state["last_fired_at"])
+                self._states[ticker] = TriggerState(**state)
+            for name, count in snapshot["fired"].items():
+                if name in self.fired:
+                    self.fired[name] = count
+            self.suppressed = snapshot["suppressed"]
+
+
+def build_default_engine(price_move_pct: float, rsi_lower: float, rsi_upper: float,
+                         heartbeat_seconds: float) -> TriggerEngine:
+    return TriggerEngine([
+        PriceMoveTrigger(price_move_pct),
+        RsiBandTrigger(rsi_lower, rsi_upper),
+        SentimentFlipTrigger(),
+        HeartbeatTrigger(heartbeat_seconds),
+    ])
@@ -0,0 +1,136 @@
+"""
+BlockStream / BalanceWatcher / ConfirmationTracker against a local anvil chain
+(execution_layer.simulator.AnvilFork). Skipped when Foundry or web3 is missing.
+
+    python -m pytest tests/test_block_stream.py
+"""
+import time
+
+import pytest
+
+web3 = pytest.importorskip("web3")
+
+from execution_layer.block_stream import BalanceWatcher, BlockStream
+from execution_layer.confirmation_tracker import ConfirmationTracker
+from execution_layer.simulator import AnvilFork
+
+PROBE = "0x000000000000000000000000000000000000bEEF"
+ANVIL_ACCOUNT = "0xf39Fd6e51aad88F6F4ce6aB8827279cffFb92266"  # anvil's first dev account (unlocked)
+ONE_ETH = 10 ** 18
+
+
+def _wait_for(predicate, timeout: float = 10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return
+        time.sleep(0.05)
+    raise AssertionError("condition not met in time")
+
+
+@pytest.fixture(scope="module")
+def anvil():
+    fork = AnvilFork(None)
+    try:
+        fork.start()
+    except FileNotFoundError as e:
+        pytest.skip(str(e))
+    yield fork
+    fork.stop()
+
+
+@pytest.fixture
+def w3(anvil):
+    anvil.reset()
+    return web3.Web3(web3.Web3.HTTPProvider(anvil.url))
+
+
+@pytest.fixture
+def stream(w3):
+    """A polling stream feeding a BalanceWatcher, plus the list of blocks it delivered."""
+    blocks = []
+    watcher = BalanceWatcher(w3, {"probe": PROBE})
+    stream = BlockStream(None, w3, poll_seconds=0.05)
+    stream.on_block(blocks.append)
+    stream.on_block(watcher.refresh)
+    stream.start()
+    _wait_for(lambda: blocks)
+    yield stream, watcher, blocks
+    _pause(stream)
+
+
+def _pause(stream: BlockStream):
+    stream.stop()
+    stream._thread.join(timeout=5)
+
+
+def _mine(anvil: AnvilFork, count: int) -> int:
+    anvil.rpc("anvil_mine", [hex(count)])
+    return int(anvil.rpc("eth_blockNumber"), 16)
+
+
+def test_reorg_delivers_each_height_once(anvil, stream):
+    stream, watcher, blocks = stream
+    start = blocks[0]
+
+    snapshot = anvil.rpc("evm_snapshot")
+    _mine(anvil, 3)
+    _wait_for(lambda: stream.head == start + 3)
+
+    # Reorg back to `start`, then a longer chain on which the probe is funded
+    anvil.rpc("evm_revert", [snapshot])
+    anvil.rpc("anvil_setBalance", [PROBE, hex(ONE_ETH)])
+    head = _mine(anvil, 5)
+    _wait_for(lambda: watcher.block == head)
+
+    assert blocks == list(range(start, head + 1))  # Heights already delivered are not repeated
+    assert watcher.snapshot()["probe"] == ONE_ETH  # Balances read from the new chain
+
+
+def test_gap_is_backfilled_in_order(anvil, stream):
+    stream, watcher, blocks = stream
+    start = stream.head
+
+    _pause(stream)  # A dropped connection: the stream misses these blocks
+    head = _mine(anvil, 10)
+    stream.start()
+    _wait_for(lambda: watcher.block == head)
+
+    assert blocks[-11:] == list(range(start, head + 1))
+    assert stream.stats["backfilled_blocks"] == 9
+
+
+def test_backfill_is_capped(anvil, stream):
+    stream, watcher, blocks = stream
+    refreshes = []
+    stream.on_block(refreshes.append)
+
+    _pause(stream)
+    head = _mine(anvil, stream.max_backfill_blocks + 100)
+    stream.start()
+    _wait_for(lambda: watcher.block == head, timeout=30)
+
+    # Only the last `max_backfill_blocks` skipped blocks (and the head) reach subscribers,
+    # so BalanceWatcher.refresh runs at most 257 times after a long outage
+    assert refreshes == list(range(head - stream.max_backfill_blocks, head + 1))
+    assert stream.stats["backfilled_blocks"] == stream.max_backfill_blocks
+
+
+def test_tracker_polls_when_pushed_head_goes_stale(anvil, w3):
+    anvil.rpc("evm_setAutomine", [False])
+    try:
+        tx_hash = anvil.rpc("eth_sendTransaction", [{"from": ANVIL_ACCOUNT, "to": PROBE, "value": hex(1)}])
+        tracker = ConfirmationTracker(w3, poll_interval_seconds=0.1, push_trust_seconds=1.0)
+        tracker.notify_new_block(w3.eth.block_number)  # The stream's last head, then it goes quiet
+        future = tracker.track(tx_hash, ANVIL_ACCOUNT, 0)
+        time.sleep(0.3)
+
+        _mine(anvil, 1)
+        time.sleep(0.3)
+        assert not future.done()  # Still trusting the pushed head
+        outcome = future.result(timeout=10)  # Polls eth_blockNumber once the push is stale
+        tracker.stop()
+    finally:
+        anvil.rpc("evm_setAutomine", [True])
+
+    assert outcome.status == "CONFIRMED"
@@ -0,0 +1,160 @@
+"""
+ConfirmationTracker.poll_once against a fake JSON-RPC provider (no chain, no
+background thread): receipts, replacement, drops and the pushed-head fallback.
+
+    python -m pytest tests/test_confirmation_tracker.py
+"""
+import time
+
+import pytest
+
+from execution_layer.confirmation_tracker import ConfirmationTracker
+
+SENDER = "0x000000000000000000000000000000000000aAaA"
+TX_A, TX_B = "0x" + "aa" * 32, "0x" + "bb" * 32
+
+
+class FakeProvider:
+    def __init__(self, batching: bool = True):
+        self.receipts = {}
+        self.known = {TX_A, TX_B}
+        self.mined_nonce = {SENDER: 0}
+        self.requests = []  # One entry per round trip
+        if not batching:
+            self.make_batch_request = None
+
+    def _result(self, method, params):
+        if method == "eth_getTransactionReceipt":
+            return self.receipts.get(params[0])
+        if method == "eth_getTransactionCount":
+            return hex(self.mined_nonce[params[0]])
+        if method == "eth_getTransactionByHash":
+            return {"hash": params[0]} if params[0] in self.known else None
+        raise AssertionError(f"unexpected {method}")
+
+    def make_request(self, method, params):
+        self.requests.append([method])
+        return {"result": self._result(method, params)}
+
+    def make_batch_request(self, calls):
+        self.requests.append([method for method, _ in calls])
+        return [{"result": self._result(method, params)} for method, params in calls]
+
+
+class FakeEth:
+    block_number = 10
+
+
+class FakeW3:
+    def __init__(self, provider):
+        self.provider = provider
+        self.eth = FakeEth()
+
+
+def _tracker(provider, **kwargs) -> ConfirmationTracker:
+    tracker = ConfirmationTracker(FakeW3(provider), **kwargs)
+    tracker.start = lambda: None  # Tests drive poll_once() themselves
+    return tracker
+
+
+def test_receipts_are_fetched_in_one_batch():
+    provider = FakeProvider()
+    provider.receipts = {TX_A: {"status": "0x1", "blockNumber": "0xa", "gasUsed": "0x5208"},
+                         TX_B: {"status": "0x0", "blockNumber": "0xa", "gasUsed": "0x7530"}}
+    tracker = _tracker(provider)
+    a, b = tracker.track(TX_A, SENDER, 0), tracker.track(TX_B, SENDER, 1)
+    tracker.poll_once()
+
+    assert provider.requests == [["eth_getTransactionReceipt"] * 2]
+    assert (a.result(0).status, a.result(0).gas_used, a.result(0).block_number) == ("CONFIRMED", 21_000, 10)
+    assert b.result(0).status == "REVERTED"
+    assert tracker.pending_count() == 0
+
+
+def test_single_requests_without_batch_support():
+    provider = FakeProvider(batching=False)
+    provider.receipts = {TX_A: {"status": 1}, TX_B: {"status": 1}}
+    tracker = _tracker(provider)
+    tracker.track(TX_A, SENDER, 0)
+    tracker.track(TX_B, SENDER, 1)
+    tracker.poll_once()
+    assert provider.requests == [["eth_getTransactionReceipt"]] * 2
+
+
+def test_nothing_is_fetched_until_the_head_moves():
+    provider = FakeProvider()
+    tracker = _tracker(provider)
+    tracker.track(TX_A, SENDER, 0)
+    tracker.poll_once()
+    calls = len(provider.requests)
+    tracker.poll_once()
+    assert len(provider.requests) == calls
+
+
+def test_used_nonce_without_receipt_is_replaced():
+    provider = FakeProvider()
+    provider.mined_nonce[SENDER] = 1
+    tracker = _tracker(provider)
+    future = tracker.track(TX_A, SENDER, 0)
+    tracker.poll_once()
+
+    assert future.result(0).status == "REPLACED"
+    # The replacement is confirmed with the nonce and the receipt from one node, in one batch
+    assert provider.requests[-1] == ["eth_getTransactionCount", "eth_getTransactionReceipt"]
+
+
+def test_receipt_in_the_confirming_batch_wins_over_replacement():
+    provider = FakeProvider()
+    provider.mined_nonce[SENDER] = 1
+    tracker = _tracker(provider)
+    future = tracker.track(TX_A, SENDER, 0)
+
+    real_batch = provider.make_batch_request
+
+    def batch(calls):
+        if len(calls) == 2 and calls[0][0] == "eth_getTransactionCount":
+            provider.receipts[TX_A] = {"status": "0x1"}  # Mined between the two lookups
+        return real_batch(calls)
+
+    provider.make_batch_request = batch
+    tracker.poll_once()
+    assert future.result(0).status == "CONFIRMED"
+
+
+def test_stale_unknown_transaction_is_dropped():
+    provider = FakeProvider()
+    provider.known = set()
+    tracker = _tracker(provider, drop_after_seconds=0.0)
+    future = tracker.track(TX_A, SENDER, 0)
+    tracker.poll_once()
+    assert future.result(0).status == "DROPPED"
+
+
+def test_callbacks_run_even_if_one_fails_and_late_callbacks_get_the_outcome():
+    provider = FakeProvider()
+    provider.receipts = {TX_A: {"status": "0x1"}}
+    seen = []
+    tracker = _tracker(provider, on_resolved=lambda outcome: 1 / 0)
+    future = tracker.track(TX_A, SENDER, 0)
+    tracker.add_callback(TX_A, lambda outcome: seen.append(outcome.status))
+    tracker.poll_once()
+    tracker.add_callback(TX_A, lambda outcome: seen.append("late " + outcome.status))
+
+    assert future.result(0).status == "CONFIRMED"
+    assert seen == ["CONFIRMED", "late CONFIRMED"]
+
+
+def test_pushed_head_is_trusted_only_while_fresh():
+    tracker = _tracker(FakeProvider(), push_trust_seconds=0.05)
+    tracker.notify_new_block(7)
+    assert tracker._head() == 7  # Not polled: FakeEth says 10
+    time.sleep(0.06)
+    assert tracker._head() == 10  # The stream went quiet: poll
+
+
+@pytest.mark.parametrize("pushed", [None, 12])
+def test_polled_head_never_goes_backwards(pushed):
+    tracker = _tracker(FakeProvider(), push_trust_seconds=0.0)
+    if pushed is not None:
+        tracker.notify_new_block(pushed)
+    assert tracker._head() == (10 if pushed is None else 12)
@@ -0,0 +1,79 @@
+"""
+deadlines: io_timeout / timeout_error / wait_for / call_with_deadline.
+
+    python -m pytest tests/test_deadlines.py
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+import pytest
+
+from deadlines import (Deadline, DeadlineExceeded, call_with_deadline, current_deadline, deadline_scope,
+                       io_timeout, timeout_error, wait_for)
+
+
+def test_io_timeout_outside_a_cycle_is_the_default():
+    assert current_deadline() is None
+    assert io_timeout(10) == 10
+
+
+def test_io_timeout_is_capped_by_the_budget():
+    with deadline_scope(Deadline(60)):
+        assert io_timeout(10) == 10
+    with deadline_scope(Deadline(2)):
+        assert 0 < io_timeout(10) <= 2
+
+
+def test_io_timeout_raises_once_the_budget_is_spent():
+    with deadline_scope(Deadline(0.01)):
+        time.sleep(0.02)
+        with pytest.raises(DeadlineExceeded):
+            io_timeout(10)
+
+
+def test_timeout_error_blames_the_budget_only_when_it_bound_the_wait():
+    assert type(timeout_error("rpc", 3.0, 10.0)) is DeadlineExceeded
+    assert type(timeout_error("rpc", 10.0, 10.0)) is TimeoutError
+    assert not isinstance(timeout_error("rpc", 10.0, 10.0), DeadlineExceeded)
+
+
+def test_wait_for_cap_gives_a_plain_timeout():
+    with deadline_scope(Deadline(60)):
+        with pytest.raises(TimeoutError) as raised:
+            wait_for(Future(), 0.05, "probe")
+    assert not isinstance(raised.value, DeadlineExceeded)
+
+
+def test_wait_for_budget_gives_deadline_exceeded():
+    with deadline_scope(Deadline(0.05)):
+        with pytest.raises(DeadlineExceeded):
+            wait_for(Future(), 10, "probe")
+
+
+def test_wait_for_returns_the_result():
+    future = Future()
+    future.set_result(42)
+    assert wait_for(future, 1, "probe") == 42
+
+
+def test_call_with_deadline_sees_the_callers_deadline_and_gives_up_on_hangs():
+    deadline = Deadline(60)
+    with deadline_scope(deadline):
+        assert call_with_deadline(current_deadline) is deadline
+
+    release = threading.Event()
+    try:
+        with deadline_scope(Deadline(0.1)):
+            with pytest.raises(DeadlineExceeded):
+                call_with_deadline(release.wait, default_timeout=10)
+    finally:
+        release.set()
+
+
+def test_call_with_deadline_reraises_the_calls_error():
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        call_with_deadline(fail, default_timeout=1)
@@ -0,0 +1,103 @@
+"""
+FeeOracle against a fake provider that counts RPC calls.
+
+    python -m pytest tests/test_fee_oracle.py
+"""
+import pytest
+
+from deadlines import DeadlineExceeded
+from execution_layer.fee_oracle import GWEI, FeeOracle
+
+TREASURY = "0x0000000000000000000000000000000000007e5a"
+SAFE = "0x0000000000000000000000000000000000005afe"
+
+
+class FakeEth:
+    def __init__(self):
+        self.block_number = 100
+        self.gas_price = 7 * GWEI
+        self.gas = 50_000
+        self.history = {
+            "baseFeePerGas": [hex(10 * GWEI), hex(12 * GWEI)],
+            "reward": [[hex(1 * GWEI)], [hex(3 * GWEI)], [hex(2 * GWEI)]],
+        }
+        self.error = None
+        self.calls = {"fee_history": 0, "estimate_gas": 0}
+
+    def fee_history(self, blocks, newest, percentiles):
+        self.calls["fee_history"] += 1
+        if self.error is not None:
+            raise self.error
+        return self.history
+
+    def estimate_gas(self, call):
+        self.calls["estimate_gas"] += 1
+        return self.gas
+
+
+class FakeW3:
+    def __init__(self):
+        self.eth = FakeEth()
+
+
+@pytest.fixture
+def w3():
+    return FakeW3()
+
+
+def test_eip1559_fees_from_fee_history(w3):
+    fees = FeeOracle(w3).fees()
+    assert fees == {"maxPriorityFeePerGas": 2 * GWEI, "maxFeePerGas": 2 * 12 * GWEI + 2 * GWEI}
+
+
+def test_fees_are_fetched_once_per_block(w3):
+    oracle = FeeOracle(w3)
+    oracle.notify_new_block(100)
+    oracle.fees()
+    oracle.fees()
+    assert w3.eth.calls["fee_history"] == 1
+    oracle.notify_new_block(101)
+    oracle.fees()
+    assert w3.eth.calls["fee_history"] == 2
+
+
+def test_legacy_gas_price_without_fee_history(w3):
+    w3.eth.error = ValueError("method not found")
+    assert FeeOracle(w3).fees() == {"gasPrice": 7 * GWEI}
+    w3.eth.error = None
+    w3.eth.history = {"baseFeePerGas": ["0x0"], "reward": []}
+    assert FeeOracle(w3).fees() == {"gasPrice": 7 * GWEI}
+
+
+def test_deadline_is_not_mistaken_for_a_legacy_chain(w3):
+    w3.eth.error = DeadlineExceeded("cycle budget of 1s exhausted")
+    with pytest.raises(DeadlineExceeded):
+        FeeOracle(w3).fees()
+
+
+def test_replacement_fees_beat_the_previous_ones_by_ten_percent():
+    previous = {"maxFeePerGas": 100, "maxPriorityFeePerGas": 10}
+    assert FeeOracle.replacement_fees({"maxFeePerGas": 90, "maxPriorityFeePerGas": 50}, previous) == \
+        {"maxFeePerGas": 113, "maxPriorityFeePerGas": 50}
+    assert FeeOracle.replacement_fees({"gasPrice": 5}, {"gasPrice": 100}) == {"gasPrice": 113}
+
+
+def test_gas_is_estimated_once_per_shape(w3):
+    oracle = FeeOracle(w3, gas_limit_margin=1.2)
+    tx = {"to": TREASURY, "data": "0xa9059cbb" + "00" * 64}
+    assert oracle.estimate_gas(tx) == 60_000
+    assert oracle.estimate_gas(dict(tx, data="0xa9059cbb" + "11" * 64)) == 60_000  # Same selector and length
+    assert w3.eth.calls["estimate_gas"] == 1
+
+    oracle.estimate_gas(dict(tx, data="0xa9059cbb" + "00" * 96))
+    assert w3.eth.calls["estimate_gas"] == 2
+
+
+def test_skipped_targets_are_estimated_every_time(w3):
+    oracle = FeeOracle(w3)
+    oracle.skip_gas_cache("0x0000000000000000000000000000000000005AFE", None)  # Any case; None is ignored
+    tx = {"to": SAFE, "data": "0x6a761202"}
+    oracle.estimate_gas(tx)
+    w3.eth.gas = 80_000
+    assert oracle.estimate_gas(tx) == 96_000
+    assert w3.eth.calls["estimate_gas"] == 2
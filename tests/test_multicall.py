@@ -0,0 +1,118 @@
+"""
+MulticallBatcher: windows, batch limits and deadlines, with a fake flush_fn in
+place of the BatchExecutor transaction.
+
+    python -m pytest tests/test_multicall.py
+"""
+import threading
+import time
+
+import pytest
+
+from deadlines import Deadline, DeadlineExceeded, current_deadline, deadline_scope
+from execution_layer.multicall import EXECUTE, Call, MulticallBatcher, encode_execute
+
+TARGET = "0x000000000000000000000000000000000000bEEF"
+
+
+class FakeFlush:
+    def __init__(self, result="0xbatch", delay: float = 0.0):
+        self.result = result
+        self.delay = delay
+        self.batches = []  # (group, calls, contexts, seconds left on the flush's deadline)
+
+    def __call__(self, group, calls, contexts):
+        deadline = current_deadline()
+        self.batches.append((group, calls, contexts, deadline.remaining() if deadline else None))
+        time.sleep(self.delay)
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def _submit_all(batcher, budgets, group=()):
+    """One thread per budget (None = no cycle deadline); returns each caller's result or exception type."""
+    results = [None] * len(budgets)
+
+    def caller(i, budget):
+        with deadline_scope(Deadline(budget) if budget is not None else None):
+            try:
+                results[i] = batcher.submit(Call(TARGET, bytes([i])), group, context=i)
+            except Exception as e:
+                results[i] = type(e)
+
+    threads = [threading.Thread(target=caller, args=item) for item in enumerate(budgets)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_calls_share_one_batch():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=0.2)
+    assert _submit_all(batcher, [None, None, None]) == ["0xbatch"] * 3
+    assert len(flush.batches) == 1
+    assert sorted(flush.batches[0][2]) == [0, 1, 2]
+    assert batcher.stats == {"batches": 1, "calls": 3}
+
+
+def test_groups_are_batched_separately():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=0.1)
+    futures = [batcher.enqueue(Call(TARGET, b""), group) for group in ("a", "b", "a")]
+    assert [f.result(timeout=2) for f in futures] == ["0xbatch"] * 3
+    assert sorted((group, len(calls)) for group, calls, _, _ in flush.batches) == [("a", 2), ("b", 1)]
+
+
+def test_full_batch_goes_before_the_window_ends():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=30, max_calls=2)
+    started = time.monotonic()
+    assert _submit_all(batcher, [None, None]) == ["0xbatch"] * 2
+    assert time.monotonic() - started < 5
+
+
+def test_flush_runs_under_the_earliest_callers_deadline():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=0.2, wait_timeout_seconds=60)
+    assert _submit_all(batcher, [10, 5]) == ["0xbatch"] * 2
+    assert 4 < flush.batches[0][3] <= 5
+
+
+def test_without_a_cycle_the_flush_is_capped_by_the_batcher():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=0.1, wait_timeout_seconds=1)
+    batcher.submit(Call(TARGET, b""))
+    assert 0.5 < flush.batches[0][3] <= 1.1
+
+
+def test_callers_out_of_time_are_left_out():
+    flush = FakeFlush()
+    batcher = MulticallBatcher(flush, window_seconds=0.2)
+    assert _submit_all(batcher, [10, 0.05]) == ["0xbatch", DeadlineExceeded]
+    assert flush.batches[0][2] == [0]
+
+
+def test_batcher_cap_is_a_plain_timeout_for_a_cycle_with_time_left():
+    flush = FakeFlush(delay=0.5)
+    batcher = MulticallBatcher(flush, window_seconds=0.05, wait_timeout_seconds=0.1, grace_seconds=0.0)
+    assert _submit_all(batcher, [30]) == [TimeoutError]
+
+
+def test_flush_errors_reach_every_caller():
+    flush = FakeFlush(result=ValueError("execution reverted"))
+    batcher = MulticallBatcher(flush, window_seconds=0.1)
+    assert _submit_all(batcher, [None, None]) == [ValueError, ValueError]
+    assert batcher.stats["batches"] == 0
+
+
+def test_encode_execute_matches_the_abi():
+    pytest.importorskip("eth_abi")
+    from eth_abi import encode
+    from eth_utils import keccak
+
+    calls = [Call(TARGET, b"\x01\x02", 3), Call(TARGET, b"")]
+    expected = keccak(text=EXECUTE)[:4] + encode(["(address,uint256,bytes)[]"], [[(TARGET, 3, b"\x01\x02"), (TARGET, 0, b"")]])
+    assert encode_execute(calls) == "0x" + expected.hex()
@@ -0,0 +1,122 @@
+"""
+Safe EIP-712 hashing and signature packing (execution_layer.multisig), checked
+against eth_account's own EIP-712 encoder. No chain needed.
+
+    python -m pytest tests/test_multisig.py
+"""
+import pytest
+
+pytest.importorskip("eth_account")
+
+from eth_account import Account
+from eth_account.messages import encode_typed_data
+from eth_utils import keccak
+
+from execution_layer.multisig import (EXEC_TRANSACTION, ZERO_ADDRESS, MultisigSigner, SafeTx, domain_separator,
+                                      pack_signatures, safe_tx_hash, sign_digest)
+
+CHAIN_ID = 8453
+SAFE = "0x1234567890AbcdEF1234567890aBcdef12345678"
+TARGET = "0x000000000000000000000000000000000000bEEF"
+OWNERS = [Account.from_key(bytes([i]) * 32) for i in (1, 2, 3)]
+
+
+def _eip712_digest(tx: SafeTx) -> bytes:
+    """What a Safe owner's wallet would sign, built from the typed data."""
+    signable = encode_typed_data(full_message={
+        "types": {
+            "EIP712Domain": [
+                {"name": "chainId", "type": "uint256"},
+                {"name": "verifyingContract", "type": "address"},
+            ],
+            "SafeTx": [
+                {"name": "to", "type": "address"},
+                {"name": "value", "type": "uint256"},
+                {"name": "data", "type": "bytes"},
+                {"name": "operation", "type": "uint8"},
+                {"name": "safeTxGas", "type": "uint256"},
+                {"name": "baseGas", "type": "uint256"},
+                {"name": "gasPrice", "type": "uint256"},
+                {"name": "gasToken", "type": "address"},
+                {"name": "refundReceiver", "type": "address"},
+                {"name": "nonce", "type": "uint256"},
+            ],
+        },
+        "primaryType": "SafeTx",
+        "domain": {"chainId": CHAIN_ID, "verifyingContract": SAFE},
+        "message": {
+            "to": tx.to, "value": tx.value, "data": tx.data, "operation": tx.operation,
+            "safeTxGas": tx.safe_tx_gas, "baseGas": tx.base_gas, "gasPrice": tx.gas_price,
+            "gasToken": tx.gas_token, "refundReceiver": tx.refund_receiver, "nonce": tx.nonce,
+        },
+    })
+    return keccak(b"\x19" + signable.version + signable.header + signable.body)
+
+
+@pytest.mark.parametrize("tx", [
+    SafeTx(to=TARGET),
+    SafeTx(to=TARGET, data=bytes.fromhex("a9059cbb") + b"\x01" * 64, value=5, nonce=7),
+    SafeTx(to=TARGET, data=b"\xff", operation=1, safe_tx_gas=100_000, base_gas=21_000, gas_price=3,
+           gas_token=TARGET, refund_receiver=SAFE, nonce=2 ** 64),
+])
+def test_safe_tx_hash_matches_eip712(tx):
+    assert safe_tx_hash(tx, CHAIN_ID, SAFE) == _eip712_digest(tx)
+
+
+def test_safe_tx_hash_is_bound_to_chain_safe_and_nonce():
+    tx = SafeTx(to=TARGET, nonce=1)
+    digest = safe_tx_hash(tx, CHAIN_ID, SAFE)
+    assert safe_tx_hash(tx, 1, SAFE) != digest
+    assert safe_tx_hash(tx, CHAIN_ID, TARGET) != digest
+    assert safe_tx_hash(SafeTx(to=TARGET, nonce=2), CHAIN_ID, SAFE) != digest
+    assert domain_separator(CHAIN_ID, SAFE) is domain_separator(CHAIN_ID, SAFE)  # Cached
+
+
+def test_sign_digest_is_a_raw_signature_of_the_digest():
+    digest = safe_tx_hash(SafeTx(to=TARGET), CHAIN_ID, SAFE)
+    signature = sign_digest(OWNERS[0], digest)
+    assert len(signature) == 65
+    assert signature[-1] in (27, 28)  # No eth_sign prefix (Safe treats v > 30 as one)
+    assert Account._recover_hash(digest, signature=signature) == OWNERS[0].address
+
+
+def test_pack_signatures_orders_by_owner_address():
+    digest = safe_tx_hash(SafeTx(to=TARGET), CHAIN_ID, SAFE)
+    signatures = {owner.address: sign_digest(owner, digest) for owner in reversed(OWNERS)}
+    packed = pack_signatures(signatures)
+
+    ordered = sorted(signatures, key=lambda a: int(a, 16))
+    assert len(packed) == 65 * len(OWNERS)
+    for i, owner in enumerate(ordered):
+        chunk = packed[65 * i:65 * (i + 1)]
+        assert chunk == signatures[owner]
+        assert Account._recover_hash(digest, signature=chunk) == owner
+
+
+def test_pack_signatures_ignores_address_case():
+    a, b = "0x00000000000000000000000000000000000000aA", "0x00000000000000000000000000000000000000AB"
+    assert pack_signatures({b: b"\x02", a: b"\x01"}) == b"\x01\x02"
+
+
+class _Vault:
+    def __init__(self, accounts):
+        self.accounts = accounts
+
+    def get_agent_account(self, name):
+        return self.accounts.get(name)
+
+
+def test_collect_signs_with_every_voter_that_has_a_key():
+    signer = MultisigSigner(_Vault({"macro": OWNERS[0], "quant": OWNERS[1]}))
+    digest = safe_tx_hash(SafeTx(to=TARGET), CHAIN_ID, SAFE)
+    collected = signer.collect(digest, ["macro", "quant", "sentiment"])
+
+    assert set(collected) == {"macro", "quant"}
+    for name, (address, signature) in collected.items():
+        assert Account._recover_hash(digest, signature=signature) == address
+
+
+def test_exec_transaction_calldata_selector():
+    calldata = MultisigSigner.exec_transaction_calldata(SafeTx(to=TARGET.lower()), b"\x00" * 65)
+    assert calldata.startswith("0x" + keccak(text=EXEC_TRANSACTION)[:4].hex())
+    assert ZERO_ADDRESS[2:] in calldata
@@ -0,0 +1,119 @@
+"""
+NonceManager against a fake provider that only knows the "pending" nonce.
+
+    python -m pytest tests/test_nonce_manager.py
+"""
+import threading
+
+from execution_layer.nonce_manager import NonceManager, is_nonce_error
+
+SIGNER = "0x000000000000000000000000000000000000aAaA"
+OTHER = "0x000000000000000000000000000000000000bBbB"
+
+
+class FakeEth:
+    def __init__(self, nonces):
+        self.nonces = dict(nonces)
+        self.calls = 0
+
+    def get_transaction_count(self, address, block):
+        assert block == "pending"
+        self.calls += 1
+        return self.nonces.get(address, 0)
+
+
+class FakeW3:
+    def __init__(self, **nonces):
+        self.eth = FakeEth({SIGNER: nonces.get("signer", 0), OTHER: nonces.get("other", 0)})
+
+
+def test_allocates_from_memory_after_one_sync():
+    w3 = FakeW3(signer=5)
+    nonces = NonceManager(w3)
+    assert [nonces.allocate(SIGNER) for _ in range(3)] == [5, 6, 7]
+    assert w3.eth.calls == 1
+    assert nonces.in_flight(SIGNER) == 3
+
+
+def test_signers_have_separate_sequences():
+    nonces = NonceManager(FakeW3(signer=5, other=100))
+    assert nonces.allocate(SIGNER) == 5
+    assert nonces.allocate(OTHER) == 100
+    assert nonces.allocate(SIGNER) == 6
+
+
+def test_concurrent_allocations_never_repeat():
+    nonces = NonceManager(FakeW3())
+    allocated, lock = [], threading.Lock()
+
+    def worker():
+        for _ in range(50):
+            nonce = nonces.allocate(SIGNER)
+            with lock:
+                allocated.append(nonce)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(allocated) == list(range(400))
+
+
+def test_releasing_the_newest_nonce_reuses_it():
+    w3 = FakeW3(signer=3)
+    nonces = NonceManager(w3)
+    nonce = nonces.allocate(SIGNER)
+    nonces.release(SIGNER, nonce)
+    assert nonces.allocate(SIGNER) == 3
+    assert w3.eth.calls == 1
+
+
+def test_releasing_below_in_flight_nonces_resyncs():
+    w3 = FakeW3(signer=3)
+    nonces = NonceManager(w3)
+    first, second = nonces.allocate(SIGNER), nonces.allocate(SIGNER)
+    nonces.release(SIGNER, first)  # A hole below `second`: only the node knows what to do next
+    w3.eth.nonces[SIGNER] = 3
+    assert nonces.allocate(SIGNER) == 3
+    assert w3.eth.calls == 2
+    assert second == 4
+
+
+def test_nonce_errors_force_a_resync():
+    w3 = FakeW3(signer=0)
+    nonces = NonceManager(w3)
+    nonce = nonces.allocate(SIGNER)
+    w3.eth.nonces[SIGNER] = 9  # Another process used the account meanwhile
+    nonces.release(SIGNER, nonce, ValueError("{'code': -32000, 'message': 'nonce too low'}"))
+    assert nonces.allocate(SIGNER) == 9
+
+
+def test_confirm_and_invalidate():
+    w3 = FakeW3(signer=0)
+    nonces = NonceManager(w3)
+    first, second = nonces.allocate(SIGNER), nonces.allocate(SIGNER)
+    nonces.confirm(SIGNER, first)
+    assert nonces.in_flight(SIGNER) == 1
+    assert nonces.allocate(SIGNER) == 2  # Confirming does not touch the sequence
+
+    w3.eth.nonces[SIGNER] = 1
+    nonces.invalidate(SIGNER, second)  # Dropped: its slot is free again
+    assert nonces.allocate(SIGNER) == 1
+
+
+def test_resync_drops_nonces_the_chain_has_passed():
+    w3 = FakeW3(signer=0)
+    nonces = NonceManager(w3)
+    for _ in range(3):
+        nonces.allocate(SIGNER)
+    w3.eth.nonces[SIGNER] = 2
+    nonces.resync(SIGNER)
+    assert nonces.in_flight(SIGNER) == 1
+    assert nonces.allocate(SIGNER) == 2
+
+
+def test_is_nonce_error():
+    assert is_nonce_error(ValueError("Nonce too high"))
+    assert is_nonce_error(RuntimeError("replacement transaction underpriced"))
+    assert not is_nonce_error(ValueError("insufficient funds for gas * price + value"))